@@ -21,21 +21,142 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    # Provider layer: "live" calls You.com, OpenAI and Composio; "fake" serves all
+    # three from the in-process stand-ins in `app.fakes` (no keys needed); "fake-http"
+    # sends the same requests to those stand-ins running at FAKE_PROVIDERS_URL.
+    PROVIDER_MODE: str = "live"
+    FAKE_PROVIDERS_URL: str = "http://127.0.0.1:8765"
+    # Fake behaviour (seeded, reproducible): lognormal latency from "p50,p95" in ms
+    # per provider, plus the share of requests failing with a 500 / a 429 (which
+    # carries `Retry-After: FAKE_RETRY_AFTER_SECONDS`).
+    FAKE_SEED: int = 0
+    FAKE_YOUCOM_LATENCY_MS: str = "80,300"
+    FAKE_OPENAI_LATENCY_MS: str = "1500,6000"
+    FAKE_COMPOSIO_LATENCY_MS: str = "150,600"
+    FAKE_ERROR_RATE: float = 0.0
+    FAKE_RATE_LIMIT_RATE: float = 0.0
+    FAKE_RETRY_AFTER_SECONDS: float = 1.0
+    # Events on the fake Google Calendar (spread over the coming week).
+    FAKE_CALENDAR_EVENTS: int = 25
+
     # External integrations
     OPENAI_API_KEY: str | None = None
+    # Override the OpenAI API base URL (e.g. a local stand-in from `app.fakes`).
+    OPENAI_BASE_URL: str | None = None
     COMPOSIO_API_KEY: str | None = None
     COMPOSIO_USER_ID: str | None = None
     YOUCOM_API_KEY: str | None = None
     NOTION_DATABASE_ID: str | None = None
 
+    # You.com HTTP client (one pooled client shared by every search)
+    YOUCOM_HTTP_MAX_CONNECTIONS: int = 20
+    YOUCOM_HTTP_MAX_KEEPALIVE: int = 10
+    YOUCOM_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    YOUCOM_HTTP_TIMEOUT: float = 15.0
+    YOUCOM_HTTP2: bool = False
+    # Process-wide token bucket in front of every You.com request.
+    YOUCOM_RATE_LIMIT_PER_SEC: float = 5.0
+    YOUCOM_RATE_LIMIT_BURST: int = 10
+    # 429 / 5xx retries: jittered exponential backoff, `Retry-After` honoured.
+    YOUCOM_MAX_RETRIES: int = 3
+    YOUCOM_BACKOFF_BASE_SECONDS: float = 0.5
+    YOUCOM_BACKOFF_MAX_SECONDS: float = 8.0
+    # Upper bound on the time one meeting spends in enrichment (all searches + retries).
+    ENRICHMENT_DEADLINE_SECONDS: float = 45.0
+    # Results per meeting, split across the three searches by steering weight;
+    # a search whose weight share is below ENRICHMENT_MIN_QUERY_WEIGHT is skipped.
+    ENRICHMENT_TOTAL_RESULTS: int = 15
+    ENRICHMENT_MIN_QUERY_WEIGHT: float = 0.1
+    # Post-processing of a meeting's hits: near-duplicates (shingle Jaccard at or
+    # above the threshold) collapse across all three searches, and at most
+    # ENRICHMENT_HIT_BUDGET hits, ranked by steering weight x recency, survive.
+    ENRICHMENT_HIT_BUDGET: int = 12
+    ENRICHMENT_DUPLICATE_SIMILARITY: float = 0.5
+    ENRICHMENT_RECENCY_HALF_LIFE_DAYS: float = 30.0
+    # Company store: an account's enrichment bundle is reused by later meetings
+    # at the same domain until it is this old.
+    COMPANY_FRESHNESS_HOURS: float = 24.0
+
+    # Calendar polling: days of upcoming events to track, and events per list page
+    # (pages are followed to the end; Google allows up to 2500).
+    CALENDAR_DAYS_AHEAD: int = 7
+    CALENDAR_PAGE_SIZE: int = 250
+    # Calendar sync: a full sync lists the polled window plus CALENDAR_FULL_SYNC_HOURS
+    # and stores the calendar's sync token; later polls fetch only changed events.
+    # A rejected token (410) or a window that no longer covers the poll forces a
+    # full resync, so one runs at least every CALENDAR_FULL_SYNC_HOURS.
+    CALENDAR_FULL_SYNC_HOURS: float = 24.0
+    # Push triggering: with CALENDAR_WEBHOOK_URL set (the public URL of
+    # `POST /calendar/webhook`), each poll keeps a watch channel open per calendar,
+    # renewed CALENDAR_CHANNEL_RENEW_BEFORE_SECONDS before it expires. Notifications
+    # arriving within CALENDAR_WEBHOOK_DEBOUNCE_SECONDS collapse into one sync.
+    CALENDAR_WEBHOOK_URL: str | None = None
+    CALENDAR_CHANNEL_TTL_SECONDS: int = 7 * 24 * 3600
+    CALENDAR_CHANNEL_RENEW_BEFORE_SECONDS: int = 24 * 3600
+    CALENDAR_WEBHOOK_DEBOUNCE_SECONDS: float = 5.0
+
+    # You.com search cache: in-memory LRU in front of a SQLite table. Entries are
+    # fresh for a TTL derived from `freshness`, then served stale (while a
+    # background refresh runs) until SEARCH_CACHE_STALE_FACTOR x TTL; older rows are
+    # deleted from the table on the next write.
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_MEMORY_ENTRIES: int = 512
+    SEARCH_CACHE_STALE_FACTOR: float = 4.0
+
+    # Synthesis: upper bound on the per-meeting payload (estimated at ~4 chars per
+    # token). Over budget, snippets are shortened and the lowest-ranked hits dropped.
+    SYNTHESIS_PAYLOAD_TOKEN_BUDGET: int = 3000
+    # Content-addressed cache of synthesis outputs (SQLite), evicted least-recently-used
+    # first once the stored results exceed SYNTHESIS_CACHE_MAX_BYTES.
+    SYNTHESIS_CACHE_ENABLED: bool = True
+    SYNTHESIS_CACHE_MAX_BYTES: int = 50_000_000
+    # Batch mode: meetings starting more than SYNTHESIS_BATCH_URGENT_HOURS away are
+    # synthesized through the OpenAI Batch API instead of a live call.
+    SYNTHESIS_BATCH_ENABLED: bool = False
+    SYNTHESIS_BATCH_URGENT_HOURS: float = 24.0
+    # Model ladder, cheapest first (comma-separated). A result failing the quality
+    # checks escalates to the next model; the last model's answer is always kept.
+    SYNTHESIS_MODEL_LADDER: str = "gpt-4o-mini,gpt-4o"
+    # LLM calls: at most SYNTHESIS_MAX_CONCURRENCY in flight per process, each cut off
+    # after SYNTHESIS_CALL_TIMEOUT_SECONDS. Timeouts, connection errors, 429s and 5xx
+    # are retried up to SYNTHESIS_MAX_RETRIES times with jittered exponential backoff.
+    SYNTHESIS_MAX_CONCURRENCY: int = 4
+    SYNTHESIS_CALL_TIMEOUT_SECONDS: float = 90.0
+    SYNTHESIS_MAX_RETRIES: int = 2
+    SYNTHESIS_BACKOFF_BASE_SECONDS: float = 1.0
+    SYNTHESIS_BACKOFF_MAX_SECONDS: float = 16.0
+    # Overall cap on one meeting's synthesis (every model, retry and backoff); a retry
+    # that would not finish its backoff in time is not started.
+    SYNTHESIS_DEADLINE_SECONDS: float = 240.0
+    # Hedging: a call still unanswered after this many seconds (set near the observed
+    # p95 latency) is raced by an identical second call; the loser is cancelled. 0 = off.
+    SYNTHESIS_HEDGE_AFTER_SECONDS: float = 0.0
+
     # App / infra
     DATABASE_URL: str = "sqlite+aiosqlite:///./app.db"
     CORS_ORIGINS: str = Field(default="http://localhost:3000,http://127.0.0.1:3000")
 
+    # Pipeline
+    # Max meetings claimed at once per process, across all stages.
+    PIPELINE_CONCURRENCY: int = 8
+    # Stage graph: enrich → synthesize → sync, each with its own worker pool.
+    PIPELINE_ENRICH_WORKERS: int = 4
+    PIPELINE_SYNTHESIZE_WORKERS: int = 2
+    PIPELINE_SYNC_WORKERS: int = 2
+    PIPELINE_STAGE_QUEUE_SIZE: int = 8
+    # Job queue: a claimed job is owned for JOB_LEASE_SECONDS and kept alive by heartbeats.
+    JOB_LEASE_SECONDS: int = 300
+    JOB_MAX_ATTEMPTS: int = 3
+
     @property
     def cors_origins_list(self) -> List[str]:
         return [o.strip() for o in self.CORS_ORIGINS.split(",") if o.strip()]
 
+    @property
+    def synthesis_model_ladder_list(self) -> List[str]:
+        models = [m.strip() for m in self.SYNTHESIS_MODEL_LADDER.split(",") if m.strip()]
+        return models or ["gpt-4o"]
+
 
 def get_settings() -> Settings:
     # Small helper so routers/services can `from app.config import get_settings`
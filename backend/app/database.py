@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import logging
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
 
@@ -19,9 +24,38 @@ engine = _build_engine()
 SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
 
 
+def _add_missing_columns(conn: Connection) -> None:
+    """`create_all` skips existing tables; add the nullable columns they lack.
+
+    Other schema changes (new NOT NULL columns, new keys) still need the
+    database to be recreated.
+    """
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                logger.warning(
+                    "%s.%s is missing and NOT NULL; recreate the database",
+                    table.name,
+                    column.name,
+                )
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(
+                text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+            )
+            logger.info("added column %s.%s", table.name, column.name)
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
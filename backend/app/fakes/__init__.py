@@ -0,0 +1,9 @@
+"""
+Local stand-ins for external providers, for tests and offline development.
+
+Each module exposes a small ASGI app speaking just enough of the provider's
+HTTP API for our code paths, with seeded latency and fault injection
+(`faults`). `providers` mounts them all in one app: `PROVIDER_MODE=fake` routes
+every integration to it in-process, `PROVIDER_MODE=fake-http` to a running
+copy (`uvicorn app.fakes.providers:app --port 8765`).
+"""
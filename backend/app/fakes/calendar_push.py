@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from app.fakes.composio import FakeCalendar
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+class FakePushSender:
+    """Delivers Google-style push notifications for a `FakeCalendar`'s open channels.
+
+    Like Google, each notification is a body-less POST to the channel's address
+    carrying `X-Goog-Channel-ID`, `X-Goog-Channel-Token`, `X-Goog-Resource-ID`,
+    `X-Goog-Resource-State` and an increasing `X-Goog-Message-Number`. Pass a
+    `transport` (e.g. an ASGI transport onto the backend) to deliver in-process.
+    """
+
+    def __init__(
+        self, calendar: FakeCalendar, *, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        self.calendar = calendar
+        self._transport = transport
+        self._message_numbers: Counter[str] = Counter()
+
+    async def notify(self, *, state: str = "exists", repeat: int = 1) -> list[int]:
+        """Send `repeat` notifications on every unexpired channel; returns the HTTP statuses."""
+        now_ms = time.time() * 1000
+        statuses: list[int] = []
+        async with httpx.AsyncClient(transport=self._transport, timeout=10.0) as client:
+            for channel in list(self.calendar.channels.values()):
+                if int(channel["expiration"]) <= now_ms:
+                    continue
+                for _ in range(repeat):
+                    self._message_numbers[channel["id"]] += 1
+                    resp = await client.post(
+                        channel["address"],
+                        headers={
+                            "X-Goog-Channel-ID": channel["id"],
+                            "X-Goog-Channel-Token": channel.get("token") or "",
+                            "X-Goog-Channel-Expiration": channel["expiration"],
+                            "X-Goog-Resource-ID": channel["resourceId"],
+                            "X-Goog-Resource-State": state,
+                            "X-Goog-Message-Number": str(self._message_numbers[channel["id"]]),
+                        },
+                    )
+                    statuses.append(resp.status_code)
+        return statuses
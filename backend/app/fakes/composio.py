@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import hashlib
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.fakes.calendar_push import FakePushSender
+from app.fakes.faults import FaultInjector
+
+_DOMAINS = ("acme.com", "globex.com", "initech.com", "umbrella.io", "hooli.com", "gmail.com")
+_ROLES = ("CTO", "VP Engineering", "Head of Data", "COO")
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _parse_time(value: str | None, default: datetime) -> datetime:
+    if not value:
+        return default
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _format_time(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def _calendar_gone() -> dict[str, Any]:
+    """Google's answer to an expired or unknown sync token, as Composio relays it."""
+    message = "Sync token is no longer valid, a full sync is required."
+    return {
+        "successful": False,
+        "data": {"error": {"code": 410, "message": message, "errors": [{"reason": "fullSyncRequired"}]}},
+        "error": f"410 Gone: {message}",
+    }
+
+
+def _execute(action: str, params: dict[str, Any], calendar: FakeCalendar) -> dict[str, Any]:
+    if action == "GOOGLECALENDAR_EVENTS_LIST":
+        return calendar.list_events(params)
+    if action == "GOOGLECALENDAR_EVENTS_WATCH":
+        return calendar.watch(params)
+    if action == "GOOGLECALENDAR_CHANNELS_STOP":
+        return calendar.stop_channel(params)
+    if action == "NOTION_INSERT_ROW_DATABASE":
+        data: dict[str, Any] = {"id": f"page-{uuid.uuid4().hex[:12]}"}
+    elif action == "NOTION_UPDATE_ROW_DATABASE":
+        data = {"id": params.get("page_id")}
+    elif action == "GMAIL_CREATE_EMAIL_DRAFT":
+        digest = hashlib.sha256(repr(sorted(params.items())).encode()).hexdigest()[:12]
+        data = {"id": f"draft-{digest}"}
+    else:
+        return {"successful": False, "data": None, "error": f"Unsupported action {action}"}
+    return {"successful": True, "data": data, "error": None}
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+class FakeCalendar:
+    """A stateful Google Calendar: seeded events, a change log and sync tokens.
+
+    Every change bumps `version`. A sync token names the version it was issued
+    at, and a list with `syncToken` returns only the events changed since
+    (cancellations included). `invalidate_sync_tokens` makes every earlier
+    token answer 410, as Google does when a token expires.
+    """
+
+    def __init__(self, *, seed: int = 0, size: int = 25) -> None:
+        self.seed = seed
+        self.size = size
+        self.events: dict[str, dict[str, Any]] = {}
+        self.changed_at: dict[str, int] = {}
+        self.version = 0
+        self.generation = 0
+        self.seeded = False
+        # Open push channels by id (see `app.fakes.calendar_push`).
+        self.channels: dict[str, dict[str, Any]] = {}
+
+    def _touch(self, event: dict[str, Any]) -> dict[str, Any]:
+        self.version += 1
+        event["updated"] = _format_time(datetime.now(tz=timezone.utc))
+        event["etag"] = f'"{self.generation}-{self.version}"'
+        self.events[event["id"]] = event
+        self.changed_at[event["id"]] = self.version
+        return event
+
+    def _seed(self) -> None:
+        """Deterministic events spread over the coming week, a few per company."""
+        self.seeded = True
+        start = datetime.now(tz=timezone.utc)
+        step = timedelta(days=7) / (self.size + 1)
+        for i in range(self.size):
+            domain = _DOMAINS[i % len(_DOMAINS)]
+            self.add_event(
+                event_id=f"fake-evt-{self.seed}-{i}",
+                start=start + step * (i + 1),
+                summary=f"{_ROLES[i % len(_ROLES)]} intro with {domain.split('.')[0].title()}",
+                attendee=(f"person{i}@{domain}", f"Person {i}"),
+            )
+
+    def add_event(
+        self,
+        *,
+        event_id: str | None = None,
+        start: datetime,
+        summary: str = "Intro call",
+        attendee: tuple[str, str] = ("someone@acme.com", "Someone"),
+    ) -> dict[str, Any]:
+        event_id = event_id or f"fake-evt-{self.seed}-{uuid.uuid4().hex[:8]}"
+        start = start.replace(microsecond=0)
+        email, name = attendee
+        return self._touch(
+            {
+                "id": event_id,
+                "status": "confirmed",
+                "summary": summary,
+                "htmlLink": f"https://calendar.example.com/event/{event_id}",
+                "start": {"dateTime": _format_time(start)},
+                "end": {"dateTime": _format_time(start + timedelta(minutes=30))},
+                "organizer": {"email": "founder@ourstartup.com"},
+                "attendees": [
+                    {"email": "founder@ourstartup.com", "responseStatus": "accepted"},
+                    {"email": email, "displayName": name, "responseStatus": "needsAction"},
+                ],
+            }
+        )
+
+    def update_event(self, event_id: str, **changes: Any) -> dict[str, Any]:
+        return self._touch({**self.events[event_id], **changes})
+
+    def cancel_event(self, event_id: str) -> dict[str, Any]:
+        return self.update_event(event_id, status="cancelled")
+
+    def invalidate_sync_tokens(self) -> None:
+        self.generation += 1
+
+    def watch(self, params: dict[str, Any]) -> dict[str, Any]:
+        """`GOOGLECALENDAR_EVENTS_WATCH`: open a push channel to `params["address"]`."""
+        ttl = int((params.get("params") or {}).get("ttl") or 7 * 24 * 3600)
+        channel = {
+            "id": params["id"],
+            "token": params.get("token"),
+            "address": params["address"],
+            "resourceId": f"fake-resource-{self.seed}",
+            "expiration": str(int((time.time() + ttl) * 1000)),
+        }
+        self.channels[channel["id"]] = channel
+        data = {"kind": "api#channel", **{k: channel[k] for k in ("id", "resourceId", "expiration")}}
+        return {"successful": True, "data": data, "error": None}
+
+    def stop_channel(self, params: dict[str, Any]) -> dict[str, Any]:
+        self.channels.pop(params.get("id"), None)
+        return {"successful": True, "data": {}, "error": None}
+
+    def _changed_since(self, sync_token: str) -> list[dict[str, Any]] | None:
+        generation, _, version = sync_token.partition(":")
+        if generation != str(self.generation) or not version.isdigit():
+            return None
+        since = int(version)
+        return [e for eid, e in self.events.items() if self.changed_at[eid] > since]
+
+    def _in_window(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        now = datetime.now(tz=timezone.utc)
+        time_min = _parse_time(params.get("timeMin"), now)
+        time_max = _parse_time(params.get("timeMax"), datetime.max.replace(tzinfo=timezone.utc))
+        items = [
+            e
+            for e in self.events.values()
+            if e["status"] != "cancelled"
+            and _parse_time(e["end"]["dateTime"], now) > time_min
+            and _parse_time(e["start"]["dateTime"], now) < time_max
+        ]
+        return sorted(items, key=lambda e: e["start"]["dateTime"])
+
+    def list_events(self, params: dict[str, Any]) -> dict[str, Any]:
+        """`GOOGLECALENDAR_EVENTS_LIST`: a full window, or the changes since `syncToken`."""
+        if not self.seeded:
+            self._seed()
+        sync_token = params.get("syncToken")
+        if sync_token:
+            items = self._changed_since(sync_token)
+            if items is None:
+                return _calendar_gone()
+        else:
+            items = self._in_window(params)
+
+        page_size = int(params.get("maxResults") or 250)
+        offset = int(params.get("pageToken") or 0)
+        page = items[offset : offset + page_size]
+        data: dict[str, Any] = {"items": page}
+        if offset + page_size < len(items):
+            data["nextPageToken"] = str(offset + page_size)
+        else:
+            data["nextSyncToken"] = f"{self.generation}:{self.version}"
+        return {"successful": True, "data": data, "error": None}
+
+
+def create_app(*, faults: FaultInjector | None = None, calendar_events: int = 25) -> FastAPI:
+    """A stand-in for the Composio actions we use (Calendar list, Notion rows, Gmail drafts).
+
+    `POST /actions/{action}/execute` with `{"params": {...}}` answers in the
+    SDK's `{"successful", "data", "error"}` shape. `app.state.calls` records
+    every (action, params) executed; `app.state.calendar` is the `FakeCalendar`
+    holding `calendar_events` seeded events.
+
+    `POST /calendar/notify` with `{"state", "repeat", "new_booking"}` makes the
+    fake push notifications to every open watch channel (adding an event first
+    when `new_booking` is set), to exercise the backend's webhook offline.
+    """
+    app = FastAPI(title="fake composio")
+    app.state.faults = faults or FaultInjector()
+    app.state.calendar = FakeCalendar(seed=app.state.faults.seed, size=calendar_events)
+    app.state.calls = []
+    app.state.push = FakePushSender(app.state.calendar)
+
+    @app.post("/actions/{action}/execute", response_model=None)
+    async def execute(action: str, request: Request) -> dict[str, Any] | JSONResponse:
+        params = (await request.json()).get("params") or {}
+        key = f"{action}:{sorted(params.items())!r}"
+        failure = await app.state.faults.apply(key)
+        if failure is not None:
+            return failure
+        app.state.calls.append((action, params))
+        return _execute(action, params, app.state.calendar)
+
+    @app.post("/calendar/notify")
+    async def notify(request: Request) -> dict[str, Any]:
+        body = await request.json() if await request.body() else {}
+        if body.get("new_booking"):
+            app.state.calendar.add_event(start=datetime.now(tz=timezone.utc) + timedelta(days=1))
+        statuses = await app.state.push.notify(
+            state=body.get("state") or "exists", repeat=int(body.get("repeat") or 1)
+        )
+        return {"sent": len(statuses), "statuses": statuses}
+
+    return app
+
+
+# `uvicorn app.fakes.composio:app --port 8790`
+app = create_app()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass
+
+from fastapi.responses import JSONResponse
+
+from app.config import get_settings
+
+# z-score of the 95th percentile of a standard normal.
+_Z95 = 1.6449
+
+# ---------------------------------------------------------------------------
+# Return types
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class FakeProfile:
+    """Latency and failure model for one fake provider.
+
+    Latency is lognormal, fitted so its median and 95th percentile match
+    `latency_p50_ms` / `latency_p95_ms`. Each request independently fails with
+    a 500 (`error_rate`) or a 429 carrying `Retry-After` (`rate_limit_rate`).
+    """
+
+    latency_p50_ms: float = 50.0
+    latency_p95_ms: float = 200.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """One latency draw, in seconds."""
+        if self.latency_p50_ms <= 0:
+            return 0.0
+        p95 = max(self.latency_p95_ms, self.latency_p50_ms)
+        sigma = math.log(p95 / self.latency_p50_ms) / _Z95
+        return rng.lognormvariate(math.log(self.latency_p50_ms), sigma) / 1000
+
+    def sample_fault(self, rng: random.Random) -> int | None:
+        """429, 500 or None (success) for one request."""
+        draw = rng.random()
+        if draw < self.rate_limit_rate:
+            return 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Fault injection
+# ---------------------------------------------------------------------------
+
+
+class FaultInjector:
+    """Seeded latency + fault decisions for one fake provider.
+
+    Each decision is drawn from an RNG seeded with (seed, request key, how many
+    times that key has been seen), so a run is reproducible however concurrent
+    requests interleave, and a retried request gets a fresh draw.
+    """
+
+    def __init__(self, profile: FakeProfile | None = None, *, seed: int = 0) -> None:
+        self.profile = profile or FakeProfile(latency_p50_ms=0.0)
+        self.seed = seed
+        self._seen: Counter[str] = Counter()
+        self.faults: Counter[int] = Counter()
+        self.requests = 0
+
+    def rng(self, key: str) -> random.Random:
+        occurrence = self._seen[key]
+        self._seen[key] += 1
+        digest = hashlib.sha256(f"{self.seed}:{key}:{occurrence}".encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def decide(self, key: str) -> tuple[float, JSONResponse | None]:
+        """Draw one request's latency (seconds) and the error response to send instead, if any."""
+        self.requests += 1
+        rng = self.rng(key)
+        latency = self.profile.sample_latency(rng)
+        fault = self.profile.sample_fault(rng)
+        if fault is None:
+            return latency, None
+        self.faults[fault] += 1
+        if fault == 429:
+            return latency, JSONResponse(
+                {"error": {"message": "Rate limit exceeded (injected)"}},
+                status_code=429,
+                headers={"Retry-After": f"{self.profile.retry_after_seconds:g}"},
+            )
+        return latency, JSONResponse(
+            {"error": {"message": "Internal error (injected)"}}, status_code=500
+        )
+
+    async def apply(self, key: str) -> JSONResponse | None:
+        """Sleep for the sampled latency; return an error response to send instead, if any."""
+        latency, failure = self.decide(key)
+        if latency:
+            await asyncio.sleep(latency)
+        return failure
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def profile_from_settings(provider: str) -> FakeProfile:
+    """`FAKE_<PROVIDER>_LATENCY_MS` ("p50,p95") plus the shared fault settings."""
+    settings = get_settings()
+    raw = getattr(settings, f"FAKE_{provider.upper()}_LATENCY_MS")
+    p50, _, p95 = raw.partition(",")
+    return FakeProfile(
+        latency_p50_ms=float(p50),
+        latency_p95_ms=float(p95 or p50),
+        error_rate=settings.FAKE_ERROR_RATE,
+        rate_limit_rate=settings.FAKE_RATE_LIMIT_RATE,
+        retry_after_seconds=settings.FAKE_RETRY_AFTER_SECONDS,
+    )
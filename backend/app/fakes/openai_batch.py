@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import Response
+
+# Maps one batch request body to a (status_code, response body) pair.
+Responder = Callable[[dict[str, Any]], tuple[int, dict[str, Any]]]
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _default_responder(body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+    """A valid meeting-prep structured output, so the apply path can be exercised."""
+    content = {
+        "insights": [{"text": "Batch insight", "why": "Offline synthesis", "priority": 1}],
+        "hooks": [{"hook": "Recent funding", "source": "https://example.com/news"}],
+        "competitors": [],
+        "pre_meeting_draft": {"subject": "Ahead of our meeting", "body": "Batch draft"},
+        "follow_up_draft": {"subject": "Thanks for your time", "body": "Batch follow-up"},
+        "error": None,
+    }
+    return 200, {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "model": body.get("model", "gpt-4o"),
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(content)},
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 1200,
+            "completion_tokens": 300,
+            "total_tokens": 1500,
+            "prompt_tokens_details": {"cached_tokens": 1024},
+        },
+    }
+
+
+def _file_object(file_id: str, data: bytes, filename: str, purpose: str) -> dict[str, Any]:
+    return {
+        "id": file_id,
+        "object": "file",
+        "bytes": len(data),
+        "created_at": int(time.time()),
+        "filename": filename,
+        "purpose": purpose,
+        "status": "processed",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def create_app(
+    *, responder: Responder | None = None, polls_until_complete: int = 1
+) -> FastAPI:
+    """A stand-in for the OpenAI Files + Batches endpoints.
+
+    A batch reports `in_progress` until it has been retrieved
+    `polls_until_complete` times, then runs `responder` over every request
+    line and completes with an output file. `app.state.batches` and
+    `app.state.files` expose the stored objects to tests.
+    """
+    app = FastAPI(title="fake openai batch")
+    app.state.files = {}
+    app.state.batches = {}
+    respond = responder or _default_responder
+
+    def _complete(batch: dict[str, Any]) -> None:
+        lines = app.state.files[batch["input_file_id"]]["data"].decode().splitlines()
+        output = []
+        for line in filter(None, lines):
+            request = json.loads(line)
+            status, body = respond(request["body"])
+            output.append(
+                json.dumps(
+                    {
+                        "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": status, "body": body},
+                        "error": None,
+                    }
+                )
+            )
+        data = ("\n".join(output) + "\n").encode()
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        app.state.files[file_id] = {
+            "data": data,
+            "object": _file_object(file_id, data, "output.jsonl", "batch_output"),
+        }
+        batch.update(
+            status="completed",
+            output_file_id=file_id,
+            completed_at=int(time.time()),
+            request_counts={"total": len(output), "completed": len(output), "failed": 0},
+        )
+
+    @app.post("/v1/files")
+    async def upload_file(file: UploadFile = File(...), purpose: str = Form(...)) -> dict:
+        data = await file.read()
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        obj = _file_object(file_id, data, file.filename or "upload.jsonl", purpose)
+        app.state.files[file_id] = {"data": data, "object": obj}
+        return obj
+
+    @app.get("/v1/files/{file_id}/content")
+    async def file_content(file_id: str) -> Response:
+        stored = app.state.files.get(file_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="No such file")
+        return Response(stored["data"], media_type="application/octet-stream")
+
+    @app.post("/v1/batches")
+    async def create_batch(request: Request) -> dict:
+        payload = await request.json()
+        if payload.get("input_file_id") not in app.state.files:
+            raise HTTPException(status_code=400, detail="Unknown input_file_id")
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:12]}",
+            "object": "batch",
+            "endpoint": payload["endpoint"],
+            "input_file_id": payload["input_file_id"],
+            "completion_window": payload.get("completion_window", "24h"),
+            "status": "validating",
+            "created_at": int(time.time()),
+            "metadata": payload.get("metadata"),
+            "output_file_id": None,
+            "error_file_id": None,
+            "polls": 0,
+        }
+        app.state.batches[batch["id"]] = batch
+        return batch
+
+    @app.get("/v1/batches/{batch_id}")
+    async def retrieve_batch(batch_id: str) -> dict:
+        batch = app.state.batches.get(batch_id)
+        if batch is None:
+            raise HTTPException(status_code=404, detail="No such batch")
+        batch["polls"] += 1
+        if batch["status"] not in {"completed", "failed", "expired", "cancelled"}:
+            if batch["polls"] >= polls_until_complete:
+                _complete(batch)
+            else:
+                batch["status"] = "in_progress"
+        return batch
+
+    @app.post("/v1/batches/{batch_id}/cancel")
+    async def cancel_batch(batch_id: str) -> dict:
+        batch = app.state.batches.get(batch_id)
+        if batch is None:
+            raise HTTPException(status_code=404, detail="No such batch")
+        if batch["status"] not in {"completed", "failed", "expired", "cancelled"}:
+            batch["status"] = "cancelled"
+        return batch
+
+    return app
+
+
+# `uvicorn app.fakes.openai_batch:app --port 8787`, then OPENAI_BASE_URL=http://127.0.0.1:8787/v1
+app = create_app()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.fakes.faults import FaultInjector
+from app.fakes.openai_batch import Responder
+
+_URL = re.compile(r"https?://[^\s\"'\\,)]+")
+_STREAM_CHUNK_CHARS = 40
+# Share of a streamed response's latency spent before the first token.
+_FIRST_TOKEN_SHARE = 0.3
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _prompt_text(body: dict[str, Any]) -> str:
+    return "\n".join(str(m.get("content") or "") for m in body.get("messages") or [])
+
+
+def _draft_body(company: str, seed: str) -> str:
+    """About 100 words, inside the pre-meeting draft's 80–150 word rule."""
+    sentence = (
+        f"Looking forward to our conversation about how {company} is approaching "
+        "its next stage of growth and where our product could help the team move faster."
+    )
+    words = f"{sentence} Reference {seed}.".split()
+    return " ".join((words * (100 // len(words) + 1))[:100])
+
+
+def meeting_prep_content(body: dict[str, Any]) -> dict[str, Any]:
+    """A deterministic, checks-passing meeting-prep output grounded on the prompt's URLs."""
+    prompt = _prompt_text(body)
+    seed = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+    urls = list(dict.fromkeys(_URL.findall(prompt)))[:3]
+    company = re.search(r'"company":"([^"]*)"', prompt)
+    name = company.group(1) if company else "your company"
+    insights = [
+        {"text": f"Recent coverage of {name} ({i + 1})", "why": f"See {url}", "priority": i + 1}
+        for i, url in enumerate(urls)
+    ]
+    hooks = [{"hook": f"Mention the story at {url}", "source": url} for url in urls]
+    return {
+        "insights": insights,
+        "hooks": hooks,
+        "competitors": [],
+        "pre_meeting_draft": {
+            "subject": f"Ahead of our meeting with {name}",
+            "body": _draft_body(name, seed),
+        },
+        "follow_up_draft": {
+            "subject": "Thanks for your time",
+            "body": "Hi [Name], thanks for the conversation about [topic]. Next steps: [steps].",
+        },
+        "error": None,
+    }
+
+
+def chat_responder(body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+    """Chat Completions response carrying `meeting_prep_content` (usable as a batch responder)."""
+    content = json.dumps(meeting_prep_content(body))
+    prompt_tokens = len(_prompt_text(body)) // 4
+    completion_tokens = len(content) // 4
+    return 200, {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        },
+    }
+
+
+async def _stream(response: dict[str, Any], duration: float) -> AsyncIterator[str]:
+    """Replay a finished completion as `chat.completion.chunk` server-sent events."""
+    content = response["choices"][0]["message"]["content"]
+    pieces = [
+        content[i : i + _STREAM_CHUNK_CHARS] for i in range(0, len(content), _STREAM_CHUNK_CHARS)
+    ]
+    base = {
+        "id": response["id"],
+        "object": "chat.completion.chunk",
+        "created": response["created"],
+        "model": response["model"],
+    }
+
+    def _event(choices: list[dict[str, Any]], **extra: Any) -> str:
+        return f"data: {json.dumps({**base, 'choices': choices, **extra})}\n\n"
+
+    def _delta(delta: dict[str, Any], finish_reason: str | None = None) -> list[dict[str, Any]]:
+        return [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+
+    await asyncio.sleep(duration * _FIRST_TOKEN_SHARE)
+    gap = duration * (1 - _FIRST_TOKEN_SHARE) / max(len(pieces), 1)
+    yield _event(_delta({"role": "assistant", "content": ""}))
+    for piece in pieces:
+        yield _event(_delta({"content": piece}))
+        if gap:
+            await asyncio.sleep(gap)
+    yield _event(_delta({}, "stop"))
+    yield _event([], usage=response["usage"])
+    yield "data: [DONE]\n\n"
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def add_chat_completions(
+    app: FastAPI, *, faults: FaultInjector | None = None, responder: Responder | None = None
+) -> FastAPI:
+    """Serve `POST /v1/chat/completions` (plain and `stream=true`) on `app`."""
+    injector = faults or FaultInjector()
+    respond = responder or chat_responder
+
+    @app.post("/v1/chat/completions", response_model=None)
+    async def chat_completions(request: Request) -> Any:
+        body = await request.json()
+        if not body.get("stream"):
+            failure = await injector.apply(f"chat:{_prompt_text(body)}")
+            if failure is not None:
+                return failure
+            status, response = respond(body)
+            return JSONResponse(response, status_code=status)
+
+        # Streamed: the sampled latency is spread over the stream instead.
+        duration, failure = injector.decide(f"chat:{_prompt_text(body)}")
+        if failure is not None:
+            await asyncio.sleep(duration * _FIRST_TOKEN_SHARE)
+            return failure
+        status, response = respond(body)
+        if status != 200:
+            return JSONResponse(response, status_code=status)
+        return StreamingResponse(_stream(response, duration), media_type="text/event-stream")
+
+    app.state.chat_faults = injector
+    return app
+
+
+def create_app(
+    *, faults: FaultInjector | None = None, responder: Responder | None = None
+) -> FastAPI:
+    """A stand-in for the OpenAI Chat Completions endpoint."""
+    app = FastAPI(title="fake openai chat")
+    return add_chat_completions(app, faults=faults, responder=responder)
+
+
+# `uvicorn app.fakes.openai_chat:app --port 8789`, then OPENAI_BASE_URL=http://127.0.0.1:8789/v1
+app = create_app()
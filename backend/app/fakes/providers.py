@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+
+from app.config import get_settings
+from app.fakes.composio import create_app as create_composio
+from app.fakes.faults import FakeProfile, FaultInjector, profile_from_settings
+from app.fakes.openai_batch import create_app as create_openai_batch
+from app.fakes.openai_chat import add_chat_completions, chat_responder
+from app.fakes.youcom import create_app as create_youcom
+
+PROVIDERS = ("youcom", "openai", "composio")
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def create_app(
+    *, seed: int | None = None, profiles: dict[str, FakeProfile] | None = None
+) -> FastAPI:
+    """Every fake behind one server: `/youcom`, `/openai` (chat + batch) and `/composio`.
+
+    `seed` and `profiles` default to `FAKE_SEED` and the `FAKE_*` latency and
+    fault settings. The mounted apps are in `app.state.fakes` by provider name.
+    """
+    settings = get_settings()
+    seed = settings.FAKE_SEED if seed is None else seed
+    profiles = {name: profile_from_settings(name) for name in PROVIDERS} | (profiles or {})
+
+    youcom = create_youcom(faults=FaultInjector(profiles["youcom"], seed=seed))
+    openai = create_openai_batch(responder=chat_responder)
+    add_chat_completions(
+        openai, faults=FaultInjector(profiles["openai"], seed=seed), responder=chat_responder
+    )
+    composio = create_composio(
+        faults=FaultInjector(profiles["composio"], seed=seed),
+        calendar_events=settings.FAKE_CALENDAR_EVENTS,
+    )
+
+    app = FastAPI(title="fake providers")
+    app.mount("/youcom", youcom)
+    app.mount("/openai", openai)
+    app.mount("/composio", composio)
+    app.state.fakes = {"youcom": youcom, "openai": openai, "composio": composio}
+    return app
+
+
+# `uvicorn app.fakes.providers:app --port 8765`, then PROVIDER_MODE=fake-http
+app = create_app()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import FastAPI, Header, Query
+from fastapi.responses import JSONResponse
+
+from app.fakes.faults import FaultInjector
+
+_TOPICS = (
+    "raises a new funding round",
+    "announces a platform migration",
+    "hires a new VP of Engineering",
+    "reports growing cloud costs",
+    "launches a self-serve tier",
+    "expands into the European market",
+    "consolidates its vendor stack",
+    "struggles with onboarding time",
+)
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _hits(query: str, count: int) -> dict[str, list[dict[str, Any]]]:
+    """Deterministic web + news hits for `query` (same query, same hits)."""
+    rng = random.Random(hashlib.sha256(query.encode()).digest())
+    slug = hashlib.sha256(query.encode()).hexdigest()[:8]
+    now = datetime.now(tz=timezone.utc).replace(microsecond=0)
+    web: list[dict[str, Any]] = []
+    news: list[dict[str, Any]] = []
+    for i in range(count):
+        topic = rng.choice(_TOPICS)
+        hit = {
+            "title": f"{query.split()[0] if query.split() else 'Company'} {topic}",
+            "url": f"https://news.example.com/{slug}/{i}",
+            "description": (
+                f"Coverage of how the company {topic}, with details relevant to "
+                f"'{query}'. Item {i} of {count}."
+            ),
+            "page_age": (now - timedelta(days=rng.randint(0, 90))).isoformat(),
+        }
+        (news if i % 3 == 2 else web).append(hit)
+    return {"web": web, "news": news}
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def create_app(*, faults: FaultInjector | None = None) -> FastAPI:
+    """A stand-in for the You.com search endpoint (`GET /v1/search`)."""
+    app = FastAPI(title="fake you.com")
+    app.state.faults = faults or FaultInjector()
+
+    @app.get("/v1/search", response_model=None)
+    async def search(
+        query: str = Query(...),
+        count: int = Query(10),
+        freshness: str = Query("year"),
+        x_api_key: str | None = Header(default=None),
+    ) -> dict[str, Any] | JSONResponse:
+        if not x_api_key:
+            return JSONResponse({"error": "Missing X-API-Key"}, status_code=401)
+        failure = await app.state.faults.apply(f"search:{query}:{count}:{freshness}")
+        if failure is not None:
+            return failure
+        return {"results": _hits(query, count)}
+
+    return app
+
+
+# `uvicorn app.fakes.youcom:app --port 8788`
+app = create_app()
@@ -7,16 +7,25 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.database import init_db
+from app.routers.calendar import router as calendar_router
 from app.routers.health import router as health_router
 from app.routers.meetings import router as meetings_router
+from app.routers.pipeline import router as pipeline_router
 from app.routers.steering import router as steering_router
 from app.routers.trigger import router as trigger_router
+from app.services.calendar_push import reset_sync_debouncer
+from app.services.http_clients import close_http_clients, open_http_clients
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     await init_db()
-    yield
+    await open_http_clients()
+    try:
+        yield
+    finally:
+        reset_sync_debouncer()
+        await close_http_clients()
 
 
 def create_app() -> FastAPI:
@@ -36,8 +45,10 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    app.include_router(calendar_router)
     app.include_router(health_router)
     app.include_router(meetings_router)
+    app.include_router(pipeline_router)
     app.include_router(steering_router)
     app.include_router(trigger_router)
 
@@ -4,7 +4,17 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-from sqlalchemy import DateTime, Enum as SqlEnum, Float, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Enum as SqlEnum,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.sqlite import JSON
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -18,6 +28,7 @@ class MeetingStatus(str, Enum):
     Drafted = "Drafted"
     FeedbackGiven = "FeedbackGiven"
     Error = "Error"
+    Cancelled = "Cancelled"
 
 
 class Meeting(Base):
@@ -40,12 +51,44 @@ class Meeting(Base):
     feedback_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     steering_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Change detection: the event's etag and `updated` as last seen, and a hash of
+    # the fields the pipeline depends on (time, attendees, title, status).
+    calendar_etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    calendar_updated: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    material_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
 
+class CalendarSyncState(Base):
+    """Incremental sync position for one calendar: Google's sync token and the window it covers."""
+
+    __tablename__ = "calendar_sync_states"
+
+    calendar_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    sync_token: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # End of the last full sync's time window; events beyond it were never listed.
+    window_end: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    full_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class CalendarChannel(Base):
+    """A push-notification (watch) channel open on a calendar."""
+
+    __tablename__ = "calendar_channels"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    calendar_id: Mapped[str] = mapped_column(String(255), index=True)
+    # Echoed back in `X-Goog-Channel-Token`: proves a notification is for us.
+    token: Mapped[str] = mapped_column(String(128))
+    resource_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+
 class SteeringProfile(Base):
     __tablename__ = "steering_profiles"
 
@@ -61,3 +104,133 @@ class SteeringProfile(Base):
     specificity_rules: Mapped[list[str]] = mapped_column(JSON, default=list)
     version: Mapped[int] = mapped_column(Integer, default=1)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+class JobStatus(str, Enum):
+    Queued = "Queued"
+    Running = "Running"
+    Done = "Done"
+    Failed = "Failed"
+
+
+class PipelineJob(Base):
+    """One durable unit of pipeline work per meeting, claimed under a lease."""
+
+    __tablename__ = "pipeline_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    meeting_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("meetings.id"), unique=True, index=True
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        SqlEnum(JobStatus), default=JobStatus.Queued, index=True
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    # Recompute from scratch: ignore checkpoints and result caches for this run.
+    force: Mapped[bool] = mapped_column(Boolean, default=False)
+    lease_owner: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class PipelineStage(str, Enum):
+    Enrich = "enrich"
+    Synthesize = "synthesize"
+    Notion = "notion"
+    Gmail = "gmail"
+
+
+class PipelineCheckpoint(Base):
+    """Persisted output of one pipeline stage, valid only for the same input hash."""
+
+    __tablename__ = "pipeline_checkpoints"
+    __table_args__ = (UniqueConstraint("meeting_id", "stage"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    meeting_id: Mapped[int] = mapped_column(Integer, ForeignKey("meetings.id"), index=True)
+    stage: Mapped[PipelineStage] = mapped_column(SqlEnum(PipelineStage))
+    input_hash: Mapped[str] = mapped_column(String(64))
+    output: Mapped[Any] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+class SearchCacheEntry(Base):
+    """Persistent tier of the You.com search cache, keyed on (query, count, freshness)."""
+
+    __tablename__ = "search_cache_entries"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    query: Mapped[str] = mapped_column(Text, default="")
+    count: Mapped[int] = mapped_column(Integer, default=5)
+    freshness: Mapped[str] = mapped_column(String(32), default="month")
+    results: Mapped[list[dict[str, Any]]] = mapped_column(JSON, default=list)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+class Company(Base):
+    """Latest news and competitor searches for an account, shared by every meeting at its domain."""
+
+    __tablename__ = "companies"
+
+    domain: Mapped[str] = mapped_column(String(255), primary_key=True)
+    query_hash: Mapped[str] = mapped_column(String(64))
+    bundle: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    content_hash: Mapped[str] = mapped_column(String(64))
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+class SynthesisCacheEntry(Base):
+    """Stored synthesis output, keyed on a hash of everything the model call reads."""
+
+    __tablename__ = "synthesis_cache_entries"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(64), default="")
+    result: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, index=True
+    )
+
+
+class SynthesisBatch(Base):
+    """An offline OpenAI batch holding the synthesis requests of many meetings."""
+
+    __tablename__ = "synthesis_batches"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), default="validating", index=True)
+    input_file_id: Mapped[str] = mapped_column(String(64))
+    output_file_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    error_file_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    request_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class SynthesisBatchItem(Base):
+    """One meeting's request inside a synthesis batch."""
+
+    __tablename__ = "synthesis_batch_items"
+
+    # custom_id is only unique within its batch: a rerun can queue the same
+    # meeting and inputs again once the earlier batch has failed.
+    batch_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("synthesis_batches.id"), primary_key=True
+    )
+    custom_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    meeting_id: Mapped[int] = mapped_column(Integer, ForeignKey("meetings.id"), index=True)
+    # Synthesis checkpoint hash the result is saved under, and its result-cache key.
+    input_hash: Mapped[str] = mapped_column(String(64))
+    cache_key: Mapped[str] = mapped_column(String(64))
+    status: Mapped[str] = mapped_column(String(32), default="pending")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas import CalendarWebhookResponse
+from app.services.calendar_push import get_sync_debouncer, verify_notification
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+
+@router.post("/webhook", response_model=CalendarWebhookResponse)
+async def calendar_webhook(
+    x_goog_channel_id: str = Header(...),
+    x_goog_channel_token: str | None = Header(None),
+    x_goog_resource_state: str = Header(""),
+    x_goog_message_number: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+) -> CalendarWebhookResponse:
+    """Google Calendar push notifications: verify the channel, then schedule a sync.
+
+    Answers immediately; the sync runs after the debounce window, so a burst of
+    notifications costs one incremental sync.
+    """
+    channel = await verify_notification(db, x_goog_channel_id, x_goog_channel_token)
+    if channel is None:
+        raise HTTPException(status_code=403, detail="Unknown channel or invalid token")
+
+    # "sync" only confirms that a new channel is open; nothing changed yet.
+    if x_goog_resource_state == "sync":
+        return CalendarWebhookResponse()
+
+    logger.info(
+        "calendar notification (channel=%s state=%s message=%s)",
+        channel.id,
+        x_goog_resource_state,
+        x_goog_message_number,
+    )
+    return CalendarWebhookResponse(scheduled=get_sync_debouncer().trigger(channel.calendar_id))
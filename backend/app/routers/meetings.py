@@ -1,20 +1,38 @@
 from __future__ import annotations
 
+import asyncio
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime
-from typing import List
+from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.models import Meeting, MeetingStatus
 from app.schemas import FeedbackRequest, MeetingDetail, MeetingListItem
+from app.services.events import get_event_broker
 from app.services.pipeline import run_pipeline_for_new_meetings
 from app.steering import apply_feedback
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
+# The event stream ends once the meeting reaches one of these.
+_FINAL_STATUSES = {
+    MeetingStatus.Drafted.value,
+    MeetingStatus.FeedbackGiven.value,
+    MeetingStatus.Error.value,
+    MeetingStatus.Cancelled.value,
+}
+_SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
 
 def _meeting_to_list_item(meeting: Meeting) -> MeetingListItem:
     return MeetingListItem(
@@ -65,10 +83,54 @@ async def get_meeting(
     return _meeting_to_detail(meeting)
 
 
+@router.get("/{meeting_id}/events")
+async def meeting_events(meeting_id: int, request: Request) -> StreamingResponse:
+    """Server-Sent Events for one meeting's pipeline progress.
+
+    Starts with a `snapshot` of what is persisted, then relays `status`,
+    `partial` (insights/hooks so far, while synthesis streams) and `synthesis`
+    events until the meeting is Drafted (or past it) or in Error.
+    """
+    broker = get_event_broker()
+    # Subscribe before reading the snapshot so nothing published in between is lost.
+    queue = broker.subscribe(meeting_id)
+    # A short-lived session: an open SQLite read transaction would block pipeline writes.
+    async with SessionLocal() as session:
+        meeting = await session.get(Meeting, meeting_id)
+    if not meeting:
+        broker.unsubscribe(meeting_id, queue)
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    snapshot = _meeting_to_detail(meeting).model_dump(mode="json")
+
+    async def _stream() -> AsyncIterator[str]:
+        try:
+            yield _sse("snapshot", snapshot)
+            if snapshot["status"] in _FINAL_STATUSES:
+                return
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), _SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(message.event, message.data)
+                if message.event == "status" and message.data.get("status") in _FINAL_STATUSES:
+                    return
+        finally:
+            broker.unsubscribe(meeting_id, queue)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/{meeting_id}/run", response_model=MeetingDetail)
 async def run_pipeline(
-    meeting_id: int, db: AsyncSession = Depends(get_db)
+    meeting_id: int, force: bool = False, db: AsyncSession = Depends(get_db)
 ) -> MeetingDetail:
+    """Rerun one meeting. `?force=true` ignores checkpoints and cached results."""
     meeting = await db.get(Meeting, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
@@ -76,7 +138,9 @@ async def run_pipeline(
     meeting.status = MeetingStatus.New
     await db.commit()
 
-    await run_pipeline_for_new_meetings(db, poll=False)
+    await run_pipeline_for_new_meetings(
+        db, poll=False, force_ids={meeting_id} if force else None
+    )
     await db.refresh(meeting)
     return _meeting_to_detail(meeting)
 
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app.schemas import PipelineStatsResponse
+from app.services.enrichment import get_youcom_flights
+from app.services.pipeline import get_pipeline_stats
+from app.services.search_cache import get_search_cache_stats
+from app.services.synthesis import get_synthesis_stats, get_synthesis_tier_stats
+
+router = APIRouter(prefix="/pipeline", tags=["pipeline"])
+
+
+@router.get("/stats", response_model=PipelineStatsResponse)
+async def pipeline_stats() -> PipelineStatsResponse:
+    return PipelineStatsResponse(
+        **get_pipeline_stats(),
+        search_cache=get_search_cache_stats(),
+        search_single_flight=get_youcom_flights().snapshot(),
+        synthesis=get_synthesis_stats(),
+        synthesis_tiers=get_synthesis_tier_stats(),
+    )
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas import TriggerPollResponse
 from app.services.calendar_poller import poll_and_upsert
+from app.services.calendar_push import ensure_channel
 from app.services.pipeline import run_pipeline_for_new_meetings
 
 logger = logging.getLogger(__name__)
@@ -18,9 +19,16 @@ router = APIRouter(tags=["trigger"])
 @router.post("/trigger-poll", response_model=TriggerPollResponse)
 async def trigger_poll(db: AsyncSession = Depends(get_db)) -> TriggerPollResponse:
     logger.info("hitting trigger-poll endpoint")
-    # Render Cron hits this endpoint; the pipeline performs calendar polling.
-    new_meetings = await poll_and_upsert(db, days_ahead=7, calendar_id="primary")
+    # Render Cron hits this endpoint. With push notifications on, it is the fallback
+    # (and renews the watch channel before it expires).
+    new_meetings = await poll_and_upsert(db, calendar_id="primary")
     processed_meetings = await run_pipeline_for_new_meetings(db, poll=False)
+    try:
+        await ensure_channel(db, calendar_id="primary")
+    except Exception as exc:
+        # Push is an optimization; polling keeps working without a channel.
+        logger.exception("watch channel renewal failed: %s", exc)
+        await db.rollback()
     logger.info(
         "trigger-poll: new_meetings=%s processed=%s",
         new_meetings,
@@ -14,6 +14,7 @@ class MeetingStatus(str, Enum):
     Drafted = "Drafted"
     FeedbackGiven = "FeedbackGiven"
     Error = "Error"
+    Cancelled = "Cancelled"
 
 
 class HealthResponse(BaseModel):
@@ -79,3 +80,28 @@ class TriggerPollResponse(BaseModel):
     new_meetings: int = 0
     processed_meetings: int = 0
 
+
+class CalendarWebhookResponse(BaseModel):
+    # False when the notification joined a sync that was already scheduled.
+    scheduled: bool = False
+
+
+class PipelineStageStats(BaseModel):
+    name: str
+    workers: int = 0
+    queue_depth: int = 0
+    queue_capacity: int = 0
+    in_flight: int = 0
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    throughput_per_sec: float = 0.0
+
+
+class PipelineStatsResponse(BaseModel):
+    running: bool = False
+    stages: List[PipelineStageStats] = Field(default_factory=list)
+    search_cache: Dict[str, int] = Field(default_factory=dict)
+    search_single_flight: Dict[str, int] = Field(default_factory=dict)
+    synthesis: Dict[str, int] = Field(default_factory=dict)
+    synthesis_tiers: Dict[str, Dict[str, float]] = Field(default_factory=dict)
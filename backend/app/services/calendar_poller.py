@@ -2,17 +2,308 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.models import Meeting, MeetingStatus
+from app.models import CalendarSyncState, Meeting, MeetingStatus, PipelineStage
+from app.services.checkpoints import clear_checkpoints, stable_hash
+from app.services.company_store import company_domain
+from app.services.job_queue import cancel_queued_jobs
+from app.services.providers import composio_ready, execute_composio
 
 logger = logging.getLogger(__name__)
 
+# A change to the event sends meetings in these states back through the pipeline.
+_RERUN_FROM = (MeetingStatus.Drafted, MeetingStatus.FeedbackGiven, MeetingStatus.Error)
+# The stages that read the title and attendee list (payload, Notion row, Gmail
+# recipient); the enrichment only depends on the attendees' company domains.
+_REDRAFT_STAGES = [PipelineStage.Synthesize, PipelineStage.Notion, PipelineStage.Gmail]
+
+# ---------------------------------------------------------------------------
+# Return types
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CalendarListing:
+    """Outcome of one paged events list, filled in as its pages are consumed."""
+
+    events: int = 0
+    # Set once the last page has been read; Google only issues the token there.
+    finished: bool = False
+    next_sync_token: str | None = None
+    # The sync token was rejected (HTTP 410 Gone): only a full sync can continue.
+    token_expired: bool = False
+    failed: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _format_time(value: datetime) -> str:
+    """RFC 3339 for a naive UTC datetime."""
+    return value.replace(microsecond=0).isoformat() + "Z"
+
+
+def _is_sync_token_expired(raw: dict[str, Any]) -> bool:
+    """Whether a failed list is Google's 410 "fullSyncRequired", however Composio wraps it."""
+    data = raw.get("data")
+    if isinstance(data, dict) and isinstance(data.get("error"), dict):
+        if data["error"].get("code") == 410:
+            return True
+    error = str(raw.get("error") or "")
+    return "410" in error or "fullSyncRequired" in error
+
+
+async def _fetch_page(params: dict[str, Any], page_token: str | None) -> dict[str, Any]:
+    page_params = {**params, "pageToken": page_token} if page_token else params
+    return await execute_composio("GOOGLECALENDAR_EVENTS_LIST", page_params)
+
+
+async def _iter_pages(
+    params: dict[str, Any], listing: CalendarListing
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield each page of a listing as parsed events, following `nextPageToken`.
+
+    The next page is requested before the current one is yielded, so whatever
+    the caller does with a page overlaps the fetch of the next. How the listing
+    ended (token, 410, failure) is recorded on `listing`.
+    """
+    pending: asyncio.Task[dict[str, Any]] | None = asyncio.create_task(_fetch_page(params, None))
+    try:
+        while pending is not None:
+            raw = await pending
+            pending = None
+            if not raw.get("successful"):
+                if params.get("syncToken") and _is_sync_token_expired(raw):
+                    listing.token_expired = True
+                else:
+                    logger.warning("calendar list failed: %s", raw.get("error") or raw)
+                    listing.failed = True
+                return
+
+            data = raw.get("data") or {}
+            items = data.get("items") or []
+            if not isinstance(items, list):
+                logger.warning("unexpected calendar list response shape: %s", type(items))
+                listing.failed = True
+                return
+
+            page_token = data.get("nextPageToken")
+            if page_token:
+                pending = asyncio.create_task(_fetch_page(params, page_token))
+            else:
+                listing.finished = True
+                listing.next_sync_token = data.get("nextSyncToken")
+            listing.events += len(items)
+            yield [parse_event(item) for item in items if isinstance(item, dict)]
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def _material_hash(parsed: dict[str, Any]) -> str:
+    """Hash of what the pipeline depends on; RSVP changes and cosmetic edits leave it alone."""
+    return stable_hash(
+        {
+            "start_time": parsed.get("start_time"),
+            "attendees": sorted(str(a.get("email") or "") for a in parsed.get("attendees") or []),
+            "title": parsed.get("title") or "",
+            "status": parsed.get("status"),
+        }
+    )
+
+
+def _attendee_emails(attendees: list[dict[str, Any]] | None) -> list[str]:
+    return sorted(str(a.get("email") or "") for a in attendees or [])
+
+
+def _attendee_domains(attendees: list[dict[str, Any]] | None) -> set[str]:
+    domains = (company_domain(str(a.get("email") or "")) for a in attendees or [])
+    return {d for d in domains if d}
+
+
+def _meeting_row(parsed: dict[str, Any], now: datetime) -> dict[str, Any]:
+    attendees = parsed.get("attendees") or []
+    return {
+        "calendar_event_id": parsed["calendar_event_id"],
+        "title": parsed.get("title") or "",
+        "datetime_utc": _parse_datetime(parsed.get("start_time")),
+        "attendees": attendees,
+        "company": _infer_company_from_attendees(attendees),
+        "role": "Unknown",
+        "status": MeetingStatus.New,
+        "calendar_etag": parsed.get("etag"),
+        "calendar_updated": parsed.get("updated"),
+        "material_hash": _material_hash(parsed),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+@dataclass
+class _Changes:
+    """Known meetings whose event changed, by the pipeline work the change calls for."""
+
+    cancelled: list[int] = field(default_factory=list)
+    reenrich: list[int] = field(default_factory=list)
+    redraft: list[int] = field(default_factory=list)
+    reinstated: list[int] = field(default_factory=list)
+    cosmetic: int = 0
+
+
+def _classify(row: Any, parsed: dict[str, Any], new_row: dict[str, Any], changes: _Changes) -> None:
+    if parsed.get("status") == "cancelled":
+        if row.status != MeetingStatus.Cancelled:
+            changes.cancelled.append(row.id)
+    elif row.status == MeetingStatus.Cancelled:
+        changes.reinstated.append(row.id)
+    elif new_row["material_hash"] == row.material_hash:
+        changes.cosmetic += 1
+    elif _attendee_domains(new_row["attendees"]) != _attendee_domains(row.attendees):
+        changes.reenrich.append(row.id)
+    elif new_row["title"] != row.title or _attendee_emails(
+        new_row["attendees"]
+    ) != _attendee_emails(row.attendees):
+        changes.redraft.append(row.id)
+    else:
+        # Start time only: no stage reads it, so the row is refreshed and
+        # nothing reruns (a redraft would only add duplicate Gmail drafts).
+        changes.cosmetic += 1
+
+
+async def _apply_changes(db: AsyncSession, changes: _Changes) -> None:
+    """Invalidate only the stages each change affects and requeue finished meetings."""
+    if changes.cancelled:
+        await db.execute(
+            update(Meeting)
+            .where(Meeting.id.in_(changes.cancelled))
+            .values(status=MeetingStatus.Cancelled)
+        )
+        await cancel_queued_jobs(db, changes.cancelled, "Meeting cancelled on the calendar")
+    if changes.reenrich:
+        await clear_checkpoints(db, changes.reenrich)
+    if changes.redraft:
+        await clear_checkpoints(db, changes.redraft, _REDRAFT_STAGES)
+    rerun = changes.reenrich + changes.redraft
+    if rerun:
+        # Meetings still in flight pick up the change from their checkpoints;
+        # finished ones go back to New, which requeues their job.
+        await db.execute(
+            update(Meeting)
+            .where(Meeting.id.in_(rerun), Meeting.status.in_(_RERUN_FROM))
+            .values(status=MeetingStatus.New, error_message=None)
+        )
+    if changes.reinstated:
+        await db.execute(
+            update(Meeting)
+            .where(Meeting.id.in_(changes.reinstated))
+            .values(status=MeetingStatus.New, error_message=None)
+        )
+
+
+async def _upsert_meetings(db: AsyncSession, events: list[dict[str, Any]]) -> int:
+    """Write one page of events with set-based statements; returns how many were new.
+
+    One `IN (...)` query loads what is stored for the page's events. Events
+    whose etag is unchanged are skipped; the rest go through a single
+    `INSERT ... ON CONFLICT (calendar_event_id) DO UPDATE`, executed over every
+    row, which adds new meetings and refreshes the calendar fields of known
+    ones. A change to a known event then invalidates only what depends on it:
+
+    - cancelled: the meeting is marked Cancelled and its queued job dropped;
+    - a different set of attendee company domains: every stage reruns (re-enrich);
+    - a new title or different attendees at the same companies: the meeting
+      reruns from synthesis, reusing its enrichment (redraft);
+    - anything else (start time, RSVPs): the row is updated, no stage reruns.
+      Neither the synthesis nor the drafts depend on the start time, so
+      redrafting a rescheduled meeting would only add duplicate Gmail drafts.
+
+    Does not commit.
+    """
+    now = datetime.utcnow()
+    by_id = {p["calendar_event_id"]: p for p in events if p.get("calendar_event_id")}
+    if not by_id:
+        return 0
+
+    result = await db.execute(
+        select(
+            Meeting.id,
+            Meeting.calendar_event_id,
+            Meeting.calendar_etag,
+            Meeting.material_hash,
+            Meeting.title,
+            Meeting.attendees,
+            Meeting.status,
+        ).where(Meeting.calendar_event_id.in_(list(by_id)))
+    )
+    known = {row.calendar_event_id: row for row in result}
+
+    rows: list[dict[str, Any]] = []
+    changes = _Changes()
+    new_meetings = 0
+    for event_id, parsed in by_id.items():
+        row = known.get(event_id)
+        cancelled = parsed.get("status") == "cancelled"
+        if row is None:
+            # Incremental syncs also report deletions of events we never stored.
+            if not cancelled:
+                rows.append(_meeting_row(parsed, now))
+                new_meetings += 1
+            continue
+        if parsed.get("etag") and parsed["etag"] == row.calendar_etag:
+            continue
+        new_row = _meeting_row(parsed, now)
+        _classify(row, parsed, new_row, changes)
+        # A cancellation stub carries no event details worth keeping.
+        if not cancelled:
+            rows.append(new_row)
+
+    if rows:
+        stmt = sqlite_insert(Meeting)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Meeting.calendar_event_id],
+            set_={
+                "title": excluded.title,
+                "datetime_utc": excluded.datetime_utc,
+                "attendees": excluded.attendees,
+                "company": excluded.company,
+                "calendar_etag": excluded.calendar_etag,
+                "calendar_updated": excluded.calendar_updated,
+                "material_hash": excluded.material_hash,
+                "updated_at": excluded.updated_at,
+            },
+            where=or_(
+                Meeting.calendar_etag.is_distinct_from(excluded.calendar_etag),
+                Meeting.material_hash.is_distinct_from(excluded.material_hash),
+            ),
+        )
+        # One statement for the whole page, compiled once and run over every row.
+        await db.execute(stmt, rows)
+    await _apply_changes(db, changes)
+
+    if changes.cancelled or changes.reenrich or changes.redraft or changes.reinstated:
+        logger.info(
+            "calendar changes: cancelled=%s reenrich=%s redraft=%s reinstated=%s cosmetic=%s",
+            len(changes.cancelled),
+            len(changes.reenrich),
+            len(changes.redraft),
+            len(changes.reinstated),
+            changes.cosmetic,
+        )
+    return new_meetings
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -20,34 +311,23 @@ logger = logging.getLogger(__name__)
 
 async def fetch_upcoming_events(
     *,
-    days_ahead: int = 7,
+    days_ahead: int | None = None,
     calendar_id: str = "primary",
-    max_results: int = 25,
-) -> list[dict[str, Any]]:
-    """Fetch upcoming Google Calendar events using Composio.
+    page_size: int | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Upcoming Google Calendar events via Composio, parsed, one page at a time.
 
-    This is the Option B "foundation": fetch + parse + log. It does not persist
-    results yet (no DB), so it cannot reliably detect "new" events across runs.
+    Follows `nextPageToken` to the end of the window, so there is no cap on the
+    number of events. `days_ahead` and `page_size` default to CALENDAR_DAYS_AHEAD
+    and CALENDAR_PAGE_SIZE.
     """
-    settings = get_settings()
-    if not settings.COMPOSIO_API_KEY:
-        logger.warning("COMPOSIO_API_KEY not configured")
-        return []
-    if not settings.COMPOSIO_USER_ID:
-        logger.warning("COMPOSIO_USER_ID not configured")
-        return []
-
-    try:
-        from composio import Composio  # type: ignore[import-not-found]
-        from composio.client.enums import Action  # type: ignore[import-not-found]
-    except Exception as exc:
-        logger.error("Composio SDK import failed: %s", exc)
-        return []
-
-    now = datetime.now(tz=timezone.utc)
-    time_min = now.isoformat().replace("+00:00", "Z")
-    time_max = (now + timedelta(days=days_ahead)).isoformat().replace("+00:00", "Z")
+    if not composio_ready():
+        return
 
+    settings = get_settings()
+    now = datetime.utcnow()
+    time_min = _format_time(now)
+    time_max = _format_time(now + timedelta(days=days_ahead or settings.CALENDAR_DAYS_AHEAD))
     logger.info(
         "fetching calendar events (calendarId=%s timeMin=%s timeMax=%s)",
         calendar_id,
@@ -55,37 +335,18 @@ async def fetch_upcoming_events(
         time_max,
     )
 
-    composio = Composio(api_key=settings.COMPOSIO_API_KEY)
-    entity = composio.get_entity(settings.COMPOSIO_USER_ID)
-
-    # Composio SDK is sync; run it off the event loop.
-    def _execute() -> dict[str, Any]:
-        return entity.execute(
-            action=Action.GOOGLECALENDAR_EVENTS_LIST,
-            params={
-                "calendarId": calendar_id,
-                "timeMin": time_min,
-                "timeMax": time_max,
-                "singleEvents": True,
-                "orderBy": "startTime",
-                "maxResults": max_results,
-            },
-        )
-
-    raw = await asyncio.to_thread(_execute)
-
-    if not raw.get("successful"):
-        logger.warning("calendar list failed: %s", raw.get("error") or raw)
-        return []
-
-    data = raw.get("data") or {}
-    items = data.get("items") or []
-    if not isinstance(items, list):
-        logger.warning("unexpected calendar list response shape: %s", type(items))
-        return []
-
-    logger.info("calendar list returned %s items", len(items))
-    return items
+    listing = CalendarListing()
+    params = {
+        "calendarId": calendar_id,
+        "timeMin": time_min,
+        "timeMax": time_max,
+        "singleEvents": True,
+        "orderBy": "startTime",
+        "maxResults": page_size or settings.CALENDAR_PAGE_SIZE,
+    }
+    async for page in _iter_pages(params, listing):
+        yield page
+    logger.info("calendar list returned %s items", listing.events)
 
 
 def parse_event(raw: dict[str, Any]) -> dict[str, Any]:
@@ -108,6 +369,8 @@ def parse_event(raw: dict[str, Any]) -> dict[str, Any]:
         "attendees": parsed_attendees,
         "organizer_email": (raw.get("organizer") or {}).get("email"),
         "status": raw.get("status"),
+        "etag": raw.get("etag"),
+        "updated": raw.get("updated"),
     }
 
 
@@ -127,14 +390,18 @@ def _parse_datetime(value: str | None) -> datetime | None:
 
 
 def _infer_company_from_attendees(attendees: list[dict[str, Any]]) -> str:
-    """Best-effort company inference from attendee email domain."""
+    """Best-effort company inference from attendee email domain.
+
+    Personal mailboxes (gmail.com etc.) are skipped, so the first business
+    domain wins.
+    """
     for a in attendees:
         if not isinstance(a, dict):
             continue
         email = a.get("email")
         if not email or "@" not in str(email):
             continue
-        domain = str(email).split("@", 1)[1].lower().strip()
+        domain = company_domain(str(email))
         if domain:
             return domain
     return "Unknown"
@@ -142,53 +409,101 @@ def _infer_company_from_attendees(attendees: list[dict[str, Any]]) -> str:
 
 async def poll_and_log(
     *,
-    days_ahead: int = 7,
+    days_ahead: int | None = None,
     calendar_id: str = "primary",
 ) -> int:
     """Poll calendar and log parsed event summaries. Returns count of events."""
-    events = await fetch_upcoming_events(days_ahead=days_ahead, calendar_id=calendar_id)
-    for e in events[:10]:
-        parsed = parse_event(e)
-        logger.info(
-            "event: %s | %s | %s",
-            parsed.get("start_time"),
-            parsed.get("title"),
-            parsed.get("calendar_event_id"),
-        )
-    return len(events)
+    count = 0
+    async for page in fetch_upcoming_events(days_ahead=days_ahead, calendar_id=calendar_id):
+        for parsed in page[: max(0, 10 - count)]:
+            logger.info(
+                "event: %s | %s | %s",
+                parsed.get("start_time"),
+                parsed.get("title"),
+                parsed.get("calendar_event_id"),
+            )
+        count += len(page)
+    return count
+
+
+async def sync_calendar_events(
+    db: AsyncSession, *, days_ahead: int | None = None, calendar_id: str = "primary"
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Pages of parsed events changed since the calendar's last sync (the whole window on a full sync).
+
+    Incremental polls send the stored sync token, so their cost follows the
+    number of changes rather than the size of the calendar. A full sync lists
+    `days_ahead` (default CALENDAR_DAYS_AHEAD) days plus CALENDAR_FULL_SYNC_HOURS
+    and runs on the first poll, when Google rejects the token (410), and once
+    that window stops covering `days_ahead`. After the last page the calendar's
+    `CalendarSyncState` is updated in `db` but not committed: the caller commits
+    it once it has handled the events, so a failed poll is fetched again.
+    """
+    if not composio_ready():
+        return
+
+    settings = get_settings()
+    now = datetime.utcnow()
+    horizon = now + timedelta(days=days_ahead or settings.CALENDAR_DAYS_AHEAD)
+    state = await db.get(CalendarSyncState, calendar_id)
+    if state is None:
+        state = CalendarSyncState(calendar_id=calendar_id)
+        db.add(state)
+
+    listing = CalendarListing()
+    if state.sync_token and state.window_end and state.window_end >= horizon:
+        params: dict[str, Any] = {
+            "calendarId": calendar_id,
+            "syncToken": state.sync_token,
+            "singleEvents": True,
+            "maxResults": settings.CALENDAR_PAGE_SIZE,
+        }
+        async for page in _iter_pages(params, listing):
+            yield page
+        if listing.failed:
+            return
+        if listing.token_expired:
+            logger.info("calendar %s: sync token expired, running a full sync", calendar_id)
+
+    full_sync = not listing.finished
+    if full_sync:
+        window_end = horizon + timedelta(hours=settings.CALENDAR_FULL_SYNC_HOURS)
+        listing = CalendarListing()
+        params = {
+            "calendarId": calendar_id,
+            "timeMin": _format_time(now),
+            "timeMax": _format_time(window_end),
+            "singleEvents": True,
+            "maxResults": settings.CALENDAR_PAGE_SIZE,
+        }
+        async for page in _iter_pages(params, listing):
+            yield page
+        if not listing.finished:
+            return
+        state.window_end = window_end
+        state.full_synced_at = now
+
+    state.sync_token = listing.next_sync_token
+    state.synced_at = now
+    logger.info(
+        "calendar %s: %s sync returned %s events",
+        calendar_id,
+        "full" if full_sync else "incremental",
+        listing.events,
+    )
 
 
 async def poll_and_upsert(
-    db: AsyncSession, *, days_ahead: int = 7, calendar_id: str = "primary"
+    db: AsyncSession, *, days_ahead: int | None = None, calendar_id: str = "primary"
 ) -> int:
-    events = await fetch_upcoming_events(days_ahead=days_ahead, calendar_id=calendar_id)
-    new_meetings = 0
-    for raw in events:
-        parsed = parse_event(raw)
-        calendar_event_id = parsed.get("calendar_event_id")
-        if not calendar_event_id:
-            continue
-
-        existing = await db.execute(
-            select(Meeting).where(Meeting.calendar_event_id == calendar_event_id)
-        )
-        if existing.scalar_one_or_none():
-            continue
+    """Upsert a `Meeting` for every new or changed calendar event; returns how many were new.
 
-        attendees = parsed.get("attendees") or []
-        meeting = Meeting(
-            calendar_event_id=calendar_event_id,
-            title=parsed.get("title") or "",
-            datetime_utc=_parse_datetime(parsed.get("start_time")),
-            attendees=attendees,
-            company=_infer_company_from_attendees(attendees),
-            role="Unknown",
-            status=MeetingStatus.New,
-        )
-        db.add(meeting)
-        new_meetings += 1
-
-    if new_meetings:
+    Each page is written in one transaction as it arrives, while the next one
+    is being fetched; the advanced sync token is committed last.
+    """
+    new_meetings = 0
+    async for page in sync_calendar_events(db, days_ahead=days_ahead, calendar_id=calendar_id):
+        new_meetings += await _upsert_meetings(db, page)
         await db.commit()
+    await db.commit()
     return new_meetings
-
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hmac
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import CalendarChannel
+from app.services.calendar_poller import poll_and_upsert
+from app.services.debounce import Debouncer
+from app.services.pipeline import run_pipeline_for_new_meetings
+from app.services.providers import composio_ready, execute_composio
+
+logger = logging.getLogger(__name__)
+
+_WATCH_ACTION = "GOOGLECALENDAR_EVENTS_WATCH"
+_STOP_ACTION = "GOOGLECALENDAR_CHANNELS_STOP"
+
+_debouncer: Debouncer | None = None
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _expires_at(data: dict, now: datetime, ttl_seconds: int) -> datetime:
+    """Google reports `expiration` in epoch milliseconds (as a string)."""
+    try:
+        return datetime.utcfromtimestamp(int(data["expiration"]) / 1000)
+    except (KeyError, TypeError, ValueError):
+        return now + timedelta(seconds=ttl_seconds)
+
+
+async def _stop_channel(channel: CalendarChannel) -> None:
+    raw = await execute_composio(
+        _STOP_ACTION, {"id": channel.id, "resourceId": channel.resource_id}
+    )
+    if not raw.get("successful"):
+        # It lapses on its own; notifications on it are rejected meanwhile.
+        logger.warning("could not stop channel %s: %s", channel.id, raw.get("error"))
+
+
+async def _sync_calendar(calendar_id: str) -> None:
+    """One incremental sync, then the pipeline for whatever it made NEW."""
+    async with SessionLocal() as db:
+        new_meetings = await poll_and_upsert(db, calendar_id=calendar_id)
+        processed = await run_pipeline_for_new_meetings(db, poll=False)
+    logger.info(
+        "push sync (calendar=%s): new_meetings=%s processed=%s",
+        calendar_id,
+        new_meetings,
+        processed,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def push_enabled() -> bool:
+    return bool(get_settings().CALENDAR_WEBHOOK_URL)
+
+
+async def ensure_channel(db: AsyncSession, calendar_id: str = "primary") -> CalendarChannel | None:
+    """Keep a watch channel open on `calendar_id`; returns it, or None without push.
+
+    A new channel is opened when there is none, or when the current one expires
+    within CALENDAR_CHANNEL_RENEW_BEFORE_SECONDS; the old one is then stopped.
+    Cheap when nothing is due (one SELECT), so every poll calls it.
+    """
+    settings = get_settings()
+    if not push_enabled() or not composio_ready():
+        return None
+
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(CalendarChannel)
+        .where(CalendarChannel.calendar_id == calendar_id)
+        .order_by(CalendarChannel.expires_at.desc())
+        .limit(1)
+    )
+    current = result.scalar_one_or_none()
+    renew_at = now + timedelta(seconds=settings.CALENDAR_CHANNEL_RENEW_BEFORE_SECONDS)
+    if current is not None and current.expires_at > renew_at:
+        return current
+
+    channel_id = uuid.uuid4().hex
+    token = secrets.token_urlsafe(32)
+    ttl = settings.CALENDAR_CHANNEL_TTL_SECONDS
+    raw = await execute_composio(
+        _WATCH_ACTION,
+        {
+            "calendarId": calendar_id,
+            "id": channel_id,
+            "type": "web_hook",
+            "address": settings.CALENDAR_WEBHOOK_URL,
+            "token": token,
+            "params": {"ttl": str(ttl)},
+        },
+    )
+    if not raw.get("successful"):
+        logger.warning("calendar watch failed (calendar=%s): %s", calendar_id, raw.get("error"))
+        return current
+
+    data = raw.get("data") or {}
+    channel = CalendarChannel(
+        id=channel_id,
+        calendar_id=calendar_id,
+        token=token,
+        resource_id=data.get("resourceId"),
+        expires_at=_expires_at(data, now, ttl),
+        created_at=now,
+    )
+    db.add(channel)
+    if current is not None:
+        await db.execute(delete(CalendarChannel).where(CalendarChannel.id == current.id))
+    await db.commit()
+    logger.info(
+        "calendar %s: watch channel %s open until %s", calendar_id, channel_id, channel.expires_at
+    )
+    if current is not None:
+        await _stop_channel(current)
+    return channel
+
+
+async def verify_notification(
+    db: AsyncSession, channel_id: str, token: str | None
+) -> CalendarChannel | None:
+    """The channel a notification belongs to, if its token matches and it has not expired."""
+    channel = await db.get(CalendarChannel, channel_id)
+    if channel is None or token is None:
+        return None
+    if not hmac.compare_digest(channel.token.encode(), token.encode()):
+        return None
+    if channel.expires_at <= datetime.utcnow():
+        return None
+    return channel
+
+
+def get_sync_debouncer() -> Debouncer:
+    """Process-wide debouncer turning notification bursts into one sync per calendar."""
+    global _debouncer
+    if _debouncer is None:
+        _debouncer = Debouncer(
+            _sync_calendar, delay=get_settings().CALENDAR_WEBHOOK_DEBOUNCE_SECONDS
+        )
+    return _debouncer
+
+
+def reset_sync_debouncer() -> None:
+    global _debouncer
+    if _debouncer is not None:
+        _debouncer.reset()
+    _debouncer = None
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import PipelineCheckpoint, PipelineStage
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def stable_hash(data: Any) -> str:
+    """SHA-256 over canonical JSON (sorted keys, no whitespace)."""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+async def load_checkpoint(
+    db: AsyncSession, meeting_id: int, stage: PipelineStage, input_hash: str
+) -> Any | None:
+    """Return the stage output if it was produced from the same inputs."""
+    result = await db.execute(
+        select(PipelineCheckpoint.input_hash, PipelineCheckpoint.output).where(
+            PipelineCheckpoint.meeting_id == meeting_id,
+            PipelineCheckpoint.stage == stage,
+        )
+    )
+    row = result.first()
+    if row is None or row.input_hash != input_hash:
+        return None
+    logger.info("checkpoint hit (meeting=%s stage=%s)", meeting_id, stage.value)
+    return row.output
+
+
+async def save_checkpoint(
+    db: AsyncSession,
+    meeting_id: int,
+    stage: PipelineStage,
+    input_hash: str,
+    output: Any,
+) -> None:
+    """Upsert the stage output. The caller commits, together with the meeting row."""
+    now = datetime.utcnow()
+    stmt = sqlite_insert(PipelineCheckpoint).values(
+        meeting_id=meeting_id,
+        stage=stage,
+        input_hash=input_hash,
+        output=output,
+        created_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PipelineCheckpoint.meeting_id, PipelineCheckpoint.stage],
+        set_={"input_hash": input_hash, "output": output, "created_at": now},
+    )
+    await db.execute(stmt)
+
+
+async def clear_checkpoints(
+    db: AsyncSession, meeting_id: int | list[int], stages: list[PipelineStage] | None = None
+) -> None:
+    meeting_ids = meeting_id if isinstance(meeting_id, list) else [meeting_id]
+    stmt = delete(PipelineCheckpoint).where(PipelineCheckpoint.meeting_id.in_(meeting_ids))
+    if stages is not None:
+        stmt = stmt.where(PipelineCheckpoint.stage.in_(stages))
+    await db.execute(stmt)
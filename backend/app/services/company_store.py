@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import Company
+from app.services.checkpoints import stable_hash
+
+logger = logging.getLogger(__name__)
+
+# Consumer mailbox providers: an attendee on one of these tells us nothing
+# about the account, so it is never researched as a company.
+PERSONAL_EMAIL_DOMAINS = frozenset(
+    {
+        "aol.com",
+        "gmail.com",
+        "googlemail.com",
+        "gmx.com",
+        "gmx.de",
+        "hey.com",
+        "hotmail.com",
+        "icloud.com",
+        "live.com",
+        "mac.com",
+        "me.com",
+        "msn.com",
+        "outlook.com",
+        "pm.me",
+        "proton.me",
+        "protonmail.com",
+        "qq.com",
+        "yahoo.com",
+        "yandex.com",
+        "zoho.com",
+    }
+)
+
+# The searches that depend on the account alone; the role search is run per
+# meeting, so only these are shared through the store.
+COMPANY_SECTIONS = ("company_news", "competitor_landscape")
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def normalize_domain(value: str | None) -> str | None:
+    """Lower-case bare domain from a domain or email address ("www." dropped)."""
+    if not value:
+        return None
+    domain = str(value).rsplit("@", 1)[-1].strip().lower().rstrip(".")
+    if domain.startswith("www."):
+        domain = domain[4:]
+    if not domain or "." not in domain:
+        return None
+    return domain
+
+
+def is_personal_domain(domain: str | None) -> bool:
+    return normalize_domain(domain) in PERSONAL_EMAIL_DOMAINS
+
+
+def company_domain(company: str | None) -> str | None:
+    """The store key for a meeting's company, or None if it has no usable domain."""
+    domain = normalize_domain(company)
+    if domain is None or domain in PERSONAL_EMAIL_DOMAINS:
+        return None
+    return domain
+
+
+async def load_company_bundle(
+    db: AsyncSession, domain: str, query_hash: str
+) -> dict[str, Any] | None:
+    """Return the stored sections if they answer the same queries and are still fresh."""
+    result = await db.execute(
+        select(Company.query_hash, Company.bundle, Company.fetched_at).where(
+            Company.domain == domain
+        )
+    )
+    row = result.first()
+    if row is None or row.query_hash != query_hash:
+        return None
+    max_age = timedelta(hours=get_settings().COMPANY_FRESHNESS_HOURS)
+    if datetime.utcnow() - row.fetched_at > max_age:
+        return None
+    logger.info("company store hit (domain=%s)", domain)
+    return row.bundle
+
+
+async def save_company_bundle(
+    db: AsyncSession, domain: str, query_hash: str, bundle: dict[str, Any]
+) -> None:
+    """Upsert the latest `COMPANY_SECTIONS` for `domain`. The caller commits."""
+    now = datetime.utcnow()
+    content_hash = stable_hash(bundle)
+    stmt = sqlite_insert(Company).values(
+        domain=domain,
+        query_hash=query_hash,
+        bundle=bundle,
+        content_hash=content_hash,
+        fetched_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Company.domain],
+        set_={
+            "query_hash": query_hash,
+            "bundle": bundle,
+            "content_hash": content_hash,
+            "fetched_at": now,
+        },
+    )
+    await db.execute(stmt)
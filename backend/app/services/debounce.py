@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class Debouncer:
+    """Collapse bursts of triggers for a key into one call of `fn(key)`.
+
+    The first trigger schedules the call `delay` seconds later; triggers that
+    arrive before it starts are absorbed by it. A trigger arriving while the
+    call runs schedules exactly one more call afterwards, so nothing that
+    happened during a run is missed.
+    """
+
+    def __init__(self, fn: Callable[[Any], Awaitable[object]], *, delay: float) -> None:
+        self._fn = fn
+        self._delay = delay
+        self._tasks: dict[Hashable, asyncio.Task[None]] = {}
+        self._dirty: set[Hashable] = set()
+        self.stats: Counter[str] = Counter()
+
+    def trigger(self, key: Hashable) -> bool:
+        """Returns True if this trigger scheduled a new call."""
+        self.stats["triggers"] += 1
+        if key in self._tasks:
+            self._dirty.add(key)
+            self.stats["coalesced"] += 1
+            return False
+        self._tasks[key] = asyncio.create_task(self._run(key))
+        return True
+
+    async def drain(self) -> None:
+        """Wait for every scheduled call (and its follow-ups) to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def snapshot(self) -> dict[str, int]:
+        return {"scheduled": len(self._tasks), **self.stats}
+
+    def reset(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._dirty.clear()
+        self.stats.clear()
+
+    async def _run(self, key: Hashable) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self._delay)
+                # Everything triggered so far is covered by the call about to start.
+                self._dirty.discard(key)
+                self.stats["calls"] += 1
+                try:
+                    await self._fn(key)
+                except Exception:
+                    logger.exception("debounced call failed (key=%s)", key)
+                if key not in self._dirty:
+                    return
+        finally:
+            if self._tasks.get(key) is asyncio.current_task():
+                del self._tasks[key]
@@ -9,6 +9,16 @@ from pydantic import BaseModel
 
 from app.config import get_settings
 from app.schemas import SteeringProfileRead
+from app.services.enrichment_budget import QueryBudget, plan_query_budgets
+from app.services.http_clients import get_youcom_client
+from app.services.providers import is_fake, youcom_search_url
+from app.services.rate_limit import (
+    get_youcom_limiter,
+    get_youcom_retry_policy,
+    parse_retry_after,
+)
+from app.services.search_cache import get_search_cache
+from app.services.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +32,15 @@ class SearchResult(BaseModel):
     url: str
     snippet: str
     age: Optional[str] = None
+    score: Optional[float] = None
 
 
 class SearchQueryOutcome(BaseModel):
     query: str
     results: list[SearchResult] = []
     error: Optional[str] = None
+    # True when the steering weight was too low for this search to run.
+    skipped: bool = False
 
 
 class EnrichmentResult(BaseModel):
@@ -65,9 +78,6 @@ def _build_competitor_query(
 # Private helpers — You.com interaction
 # ---------------------------------------------------------------------------
 
-_YOUCOM_SEARCH_URL = "https://ydc-index.io/v1/search"
-
-
 def _parse_response(raw: dict, max_results: int) -> list[SearchResult]:
     """Merge web + news hits from a You.com response into SearchResult list."""
     items: list[SearchResult] = []
@@ -90,37 +100,76 @@ def _parse_response(raw: dict, max_results: int) -> list[SearchResult]:
     return items[:max_results]
 
 
-async def _search_youcom(
-    query: str, count: int = 5, freshness: str = "month"
-) -> SearchQueryOutcome:
-    """Execute a single You.com search. Never raises — errors go into .error."""
-    settings = get_settings()
+_DEADLINE_ERROR = "Enrichment deadline exceeded"
 
-    if not settings.YOUCOM_API_KEY:
-        logger.warning("YOUCOM_API_KEY not configured")
-        return SearchQueryOutcome(query=query, error="YOUCOM_API_KEY not configured")
+# In-flight upstream searches keyed on (query, count, freshness).
+_youcom_flights: SingleFlight[SearchQueryOutcome] = SingleFlight()
 
-    try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                _YOUCOM_SEARCH_URL,
-                params={"query": query, "count": count, "freshness": freshness},
-                headers={"X-API-Key": settings.YOUCOM_API_KEY},
-            )
 
-        if resp.status_code in (401, 403):
-            msg = f"Authentication error ({resp.status_code})"
-            logger.error(msg)
-            return SearchQueryOutcome(query=query, error=msg)
+async def _fetch_youcom(
+    query: str,
+    count: int,
+    freshness: str,
+    api_key: str,
+    *,
+    deadline: float | None = None,
+) -> SearchQueryOutcome:
+    """Upstream You.com request. Never raises — errors go into .error.
+
+    Every attempt takes a token from the process-wide limiter. 429s and 5xx
+    are retried with jittered exponential backoff (honouring `Retry-After`)
+    as long as the retry still fits before `deadline` (a `loop.time()` value).
+    """
+    policy = get_youcom_retry_policy()
+    limiter = get_youcom_limiter()
+    loop = asyncio.get_running_loop()
+    attempt = 0
 
-        if resp.status_code == 429:
-            logger.warning("Rate limited by You.com API")
-            return SearchQueryOutcome(query=query, error="Rate limited by You.com API")
+    try:
+        while True:
+            if not await limiter.acquire(deadline=deadline):
+                logger.warning("enrichment deadline hit while throttled: %s", query)
+                return SearchQueryOutcome(query=query, error=_DEADLINE_ERROR)
+
+            async with asyncio.timeout_at(deadline):
+                resp = await get_youcom_client().get(
+                    youcom_search_url(),
+                    params={"query": query, "count": count, "freshness": freshness},
+                    headers={"X-API-Key": api_key},
+                )
 
-        resp.raise_for_status()
-        results = _parse_response(resp.json(), max_results=count)
-        return SearchQueryOutcome(query=query, results=results)
+            if resp.status_code in (401, 403):
+                msg = f"Authentication error ({resp.status_code})"
+                logger.error(msg)
+                return SearchQueryOutcome(query=query, error=msg)
 
+            if resp.status_code == 429 or resp.status_code >= 500:
+                delay = policy.backoff(
+                    attempt, parse_retry_after(resp.headers.get("Retry-After"))
+                )
+                fits = deadline is None or loop.time() + delay < deadline
+                if attempt < policy.max_retries and fits:
+                    logger.info(
+                        "You.com returned %s; retry %s in %.2fs",
+                        resp.status_code,
+                        attempt + 1,
+                        delay,
+                    )
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+
+            if resp.status_code == 429:
+                logger.warning("Rate limited by You.com API")
+                return SearchQueryOutcome(query=query, error="Rate limited by You.com API")
+
+            resp.raise_for_status()
+            results = _parse_response(resp.json(), max_results=count)
+            return SearchQueryOutcome(query=query, results=results)
+
+    except TimeoutError:
+        logger.error("enrichment deadline exceeded for query: %s", query)
+        return SearchQueryOutcome(query=query, error=_DEADLINE_ERROR)
     except httpx.TimeoutException:
         logger.error("Search request timed out for query: %s", query)
         return SearchQueryOutcome(query=query, error="Search request timed out")
@@ -134,6 +183,71 @@ async def _search_youcom(
         return SearchQueryOutcome(query=query, error=msg)
 
 
+async def _search_youcom(
+    query: str,
+    count: int = 5,
+    freshness: str = "month",
+    *,
+    deadline: float | None = None,
+) -> SearchQueryOutcome:
+    """Execute a single You.com search. Never raises — errors go into .error.
+
+    Results are served from the search cache when possible; stale entries are
+    returned immediately while a background refresh runs. Cache misses are
+    coalesced with any identical search already in flight.
+    """
+    settings = get_settings()
+
+    if not settings.YOUCOM_API_KEY and not is_fake():
+        logger.warning("YOUCOM_API_KEY not configured")
+        return SearchQueryOutcome(query=query, error="YOUCOM_API_KEY not configured")
+    api_key = settings.YOUCOM_API_KEY or "fake"
+
+    cache = get_search_cache()
+    use_cache = cache.enabled
+    key = (query, count, freshness)
+
+    if use_cache:
+        cached = await cache.get(query, count, freshness)
+        if cached is not None:
+            if cached.stale:
+
+                async def _refresh() -> list[dict] | None:
+                    outcome = await _youcom_flights.do(
+                        key, lambda: _fetch_youcom(query, count, freshness, api_key)
+                    )
+                    if outcome.error:
+                        return None
+                    return [r.model_dump() for r in outcome.results]
+
+                cache.refresh_in_background(query, count, freshness, _refresh)
+            return SearchQueryOutcome(
+                query=query, results=[SearchResult(**r) for r in cached.results]
+            )
+
+    async def _upstream() -> SearchQueryOutcome:
+        outcome = await _fetch_youcom(query, count, freshness, api_key, deadline=deadline)
+        if use_cache and outcome.error is None:
+            await cache.put(query, count, freshness, [r.model_dump() for r in outcome.results])
+        return outcome
+
+    # Identical concurrent searches (same company, shared competitor query)
+    # await one upstream request; each caller gets its own copy of the result.
+    # The request runs under the deadline of the caller that started it, so a
+    # caller that joined it waits no longer than its own deadline, and searches
+    # again if the request ran out of the starter's time but not of its own.
+    try:
+        async with asyncio.timeout_at(deadline):
+            joined = _youcom_flights.running(key)
+            outcome = await _youcom_flights.do(key, _upstream)
+            if joined and outcome.error == _DEADLINE_ERROR:
+                outcome = await _youcom_flights.do(key, _upstream)
+    except TimeoutError:
+        logger.error("enrichment deadline exceeded for query: %s", query)
+        return SearchQueryOutcome(query=query, error=_DEADLINE_ERROR)
+    return outcome.model_copy(deep=True)
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -144,9 +258,16 @@ async def enrich_meeting(
     role: str,
     attendees: list[dict],
     steering: SteeringProfileRead,
+    known: dict[str, SearchQueryOutcome] | None = None,
 ) -> EnrichmentResult:
     """Run three parallel You.com searches and return enrichment data.
 
+    Each search's result count and deadline come from `plan_query_budgets`, so
+    the steering weights decide how much is fetched per section; a search
+    whose weight is below the threshold is skipped (``skipped=True``).
+    Sections in ``known`` (e.g. from the company store) are used as given
+    instead of being searched again.
+
     ``attendees`` is accepted for forward-compatibility but not consumed yet.
     """
     company_q = _build_company_query(company, steering.product_focus)
@@ -157,10 +278,27 @@ async def enrich_meeting(
         company, steering.product_focus, steering.competitor_list
     )
 
+    budgets = plan_query_budgets(steering)
+    known = known or {}
+    started = asyncio.get_running_loop().time()
+
+    async def _run(section: str, query: str, freshness: str) -> SearchQueryOutcome:
+        if section in known:
+            return known[section]
+        budget: QueryBudget = budgets[section]
+        if budget.skipped:
+            return SearchQueryOutcome(query=query, skipped=True)
+        return await _search_youcom(
+            query,
+            count=budget.count,
+            freshness=freshness,
+            deadline=started + budget.deadline_seconds,
+        )
+
     company_news, role_pains, competitor_landscape = await asyncio.gather(
-        _search_youcom(company_q, count=5, freshness="month"),
-        _search_youcom(role_q, count=5, freshness="year"),
-        _search_youcom(competitor_q, count=5, freshness="month"),
+        _run("company_news", company_q, "month"),
+        _run("role_pains", role_q, "year"),
+        _run("competitor_landscape", competitor_q, "month"),
     )
 
     return EnrichmentResult(
@@ -168,3 +306,8 @@ async def enrich_meeting(
         role_pains=role_pains,
         competitor_landscape=competitor_landscape,
     )
+
+
+def get_youcom_flights() -> SingleFlight[SearchQueryOutcome]:
+    """Single-flight group for upstream searches (its stats show coalesced calls)."""
+    return _youcom_flights
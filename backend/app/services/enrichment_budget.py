@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from app.config import get_settings
+from app.schemas import SteeringProfileRead
+
+SECTIONS = ("company_news", "role_pains", "competitor_landscape")
+
+# You.com caps `count` per request.
+_MAX_COUNT_PER_QUERY = 20
+
+# ---------------------------------------------------------------------------
+# Return types
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """How many results one search may ask for and how long it may take."""
+
+    count: int
+    deadline_seconds: float
+
+    @property
+    def skipped(self) -> bool:
+        return self.count == 0
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _shares(steering: SteeringProfileRead) -> dict[str, float]:
+    raw = [
+        max(0.0, steering.weight_news),
+        max(0.0, steering.weight_role_pains),
+        max(0.0, steering.weight_competitors),
+    ]
+    total = sum(raw)
+    if total <= 0:
+        return {section: 1 / len(SECTIONS) for section in SECTIONS}
+    return {section: w / total for section, w in zip(SECTIONS, raw)}
+
+
+def _apportion(total: int, shares: dict[str, float]) -> dict[str, int]:
+    """Largest-remainder split of `total` by share; every listed section gets >= 1.
+
+    The listed sections get their combined share of `total`, rounded down (the
+    epsilon absorbs float error when the shares sum to one).
+    """
+    exact = {section: total * share for section, share in shares.items()}
+    counts = {section: math.floor(value) for section, value in exact.items()}
+    leftover = math.floor(sum(exact.values()) + 1e-9) - sum(counts.values())
+    by_remainder = sorted(exact, key=lambda s: exact[s] - counts[s], reverse=True)
+    for section in by_remainder[: max(0, leftover)]:
+        counts[section] += 1
+    return {s: min(_MAX_COUNT_PER_QUERY, max(1, c)) for s, c in counts.items()}
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def plan_query_budgets(steering: SteeringProfileRead) -> dict[str, QueryBudget]:
+    """Split the enrichment result and latency budgets across the three searches.
+
+    Results (`ENRICHMENT_TOTAL_RESULTS`) are divided in proportion to the
+    steering weights. The searches run in parallel, so the latency budget
+    (`ENRICHMENT_DEADLINE_SECONDS`) is scaled rather than divided: the
+    heaviest search gets all of it, lighter ones proportionally less. A search
+    whose share is below `ENRICHMENT_MIN_QUERY_WEIGHT` is skipped, and its
+    share of the results is not handed to the others: the remaining searches
+    split only their own share of the total.
+    """
+    settings = get_settings()
+    shares = _shares(steering)
+    active = {
+        section: share
+        for section, share in shares.items()
+        if share >= settings.ENRICHMENT_MIN_QUERY_WEIGHT
+    }
+    counts = _apportion(settings.ENRICHMENT_TOTAL_RESULTS, active) if active else {}
+    heaviest = max(active.values(), default=1.0)
+
+    return {
+        section: QueryBudget(
+            count=counts.get(section, 0),
+            deadline_seconds=settings.ENRICHMENT_DEADLINE_SECONDS * share / heaviest
+            if section in active
+            else 0.0,
+        )
+        for section, share in shares.items()
+    }
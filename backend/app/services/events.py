@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+# Per-subscriber buffer; a slow client loses its oldest events, never blocks publishers.
+_SUBSCRIBER_BUFFER = 64
+
+# ---------------------------------------------------------------------------
+# Return types
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class MeetingEvent:
+    event: str
+    data: dict[str, Any]
+
+
+# ---------------------------------------------------------------------------
+# Broker
+# ---------------------------------------------------------------------------
+
+
+class MeetingEventBroker:
+    """In-process fan-out of pipeline progress to per-meeting subscribers.
+
+    Only subscribers in the same process see events, which is enough for the
+    single-process deployment; clients always get a DB snapshot first, so a
+    missed event only delays an update rather than losing it.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[int, set[asyncio.Queue[MeetingEvent]]] = defaultdict(set)
+
+    def subscribe(self, meeting_id: int) -> asyncio.Queue[MeetingEvent]:
+        queue: asyncio.Queue[MeetingEvent] = asyncio.Queue(maxsize=_SUBSCRIBER_BUFFER)
+        self._subscribers[meeting_id].add(queue)
+        return queue
+
+    def unsubscribe(self, meeting_id: int, queue: asyncio.Queue[MeetingEvent]) -> None:
+        subscribers = self._subscribers.get(meeting_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[meeting_id]
+
+    def publish(self, meeting_id: int, event: str, data: dict[str, Any]) -> int:
+        """Deliver to every current subscriber. Returns how many received it."""
+        subscribers = self._subscribers.get(meeting_id, ())
+        message = MeetingEvent(event, data)
+        for queue in subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+        return len(subscribers)
+
+    def subscriber_count(self, meeting_id: int) -> int:
+        return len(self._subscribers.get(meeting_id, ()))
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+_broker = MeetingEventBroker()
+
+
+def get_event_broker() -> MeetingEventBroker:
+    return _broker
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any
 
-from app.config import get_settings
+from app.services.providers import composio_ready, execute_composio
 
 logger = logging.getLogger(__name__)
 
@@ -12,33 +11,12 @@ logger = logging.getLogger(__name__)
 async def create_drafts(
     *, recipient_email: str, pre_meeting: dict[str, Any], follow_up: dict[str, Any]
 ) -> list[str]:
-    settings = get_settings()
-    if not settings.COMPOSIO_API_KEY:
-        logger.warning("COMPOSIO_API_KEY not configured")
+    if not composio_ready():
         return []
-    if not settings.COMPOSIO_USER_ID:
-        logger.warning("COMPOSIO_USER_ID not configured")
-        return []
-
-    try:
-        from composio import Composio  # type: ignore[import-not-found]
-        from composio.client.enums import Action  # type: ignore[import-not-found]
-    except Exception as exc:
-        logger.error("Composio SDK import failed: %s", exc)
-        return []
-
-    composio = Composio(api_key=settings.COMPOSIO_API_KEY)
-    entity = composio.get_entity(settings.COMPOSIO_USER_ID)
-
-    def _execute(payload: dict[str, Any]) -> dict[str, Any]:
-        return entity.execute(
-            action=Action.GMAIL_CREATE_EMAIL_DRAFT,
-            params=payload,
-        )
 
     async def _draft(subject: str, body: str) -> str | None:
-        raw = await asyncio.to_thread(
-            _execute,
+        raw = await execute_composio(
+            "GMAIL_CREATE_EMAIL_DRAFT",
             {
                 "to": recipient_email,
                 "subject": subject,
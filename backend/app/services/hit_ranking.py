@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.config import get_settings
+from app.schemas import SteeringProfileRead
+from app.services.enrichment import EnrichmentResult, SearchQueryOutcome, SearchResult
+
+_SECTIONS = ("company_news", "role_pains", "competitor_landscape")
+_SHINGLE_SIZE = 3
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# ---------------------------------------------------------------------------
+# Return types
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class RankingStats:
+    hits_in: int = 0
+    duplicates_collapsed: int = 0
+    trimmed_by_budget: int = 0
+    hits_out: int = 0
+
+
+@dataclass
+class _Candidate:
+    section: str
+    result: SearchResult
+    score: float
+    fingerprint: frozenset[int] = field(default_factory=frozenset)
+
+
+# ---------------------------------------------------------------------------
+# Private helpers — fingerprinting
+# ---------------------------------------------------------------------------
+
+
+def _fingerprint(text: str) -> frozenset[int]:
+    """Hashed word 3-shingles of the normalized text."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < _SHINGLE_SIZE:
+        shingles = [" ".join(tokens)] if tokens else []
+    else:
+        shingles = [
+            " ".join(tokens[i : i + _SHINGLE_SIZE])
+            for i in range(len(tokens) - _SHINGLE_SIZE + 1)
+        ]
+    return frozenset(
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles
+    )
+
+
+def _similarity(a: frozenset[int], b: frozenset[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# ---------------------------------------------------------------------------
+# Private helpers — scoring
+# ---------------------------------------------------------------------------
+
+
+def _parse_age(age: str | None) -> datetime | None:
+    if not age:
+        return None
+    try:
+        parsed = datetime.fromisoformat(age.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _recency(age: str | None, now: datetime, half_life_days: float) -> float:
+    """1.0 for brand-new hits, halving every `half_life_days`; 0.5 when unknown."""
+    published = _parse_age(age)
+    if published is None:
+        return 0.5
+    days = max(0.0, (now - published).total_seconds() / 86400)
+    return 0.5 ** (days / max(half_life_days, 1e-6))
+
+
+def _section_weights(steering: SteeringProfileRead) -> dict[str, float]:
+    raw = [
+        max(0.0, steering.weight_news),
+        max(0.0, steering.weight_role_pains),
+        max(0.0, steering.weight_competitors),
+    ]
+    total = sum(raw) or 1.0
+    return {section: w / total for section, w in zip(_SECTIONS, raw)}
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def rank_enrichment(
+    enrichment: EnrichmentResult,
+    steering: SteeringProfileRead,
+    *,
+    hit_budget: int | None = None,
+    now: datetime | None = None,
+) -> tuple[EnrichmentResult, RankingStats]:
+    """Collapse near-duplicate hits across all three searches and keep the best.
+
+    Each hit is scored by its section's steering weight x (recency + upstream
+    position). Hits are then taken best-first; one whose URL or shingle
+    fingerprint matches an already-kept hit (Jaccard >= threshold) is dropped,
+    so a syndicated press release survives once, in its highest-scoring slot.
+    At most `hit_budget` hits (default `ENRICHMENT_HIT_BUDGET`) are kept. Each
+    surviving hit carries its `score`, and sections stay sorted best-first.
+    """
+    settings = get_settings()
+    budget = settings.ENRICHMENT_HIT_BUDGET if hit_budget is None else hit_budget
+    threshold = settings.ENRICHMENT_DUPLICATE_SIMILARITY
+    half_life = settings.ENRICHMENT_RECENCY_HALF_LIFE_DAYS
+    now = now or datetime.now(tz=timezone.utc)
+    weights = _section_weights(steering)
+
+    candidates: list[_Candidate] = []
+    for section in _SECTIONS:
+        outcome: SearchQueryOutcome = getattr(enrichment, section)
+        for position, hit in enumerate(outcome.results):
+            relevance = 1.0 / (1 + position)
+            score = weights[section] * (
+                0.5 * _recency(hit.age, now, half_life) + 0.5 * relevance
+            )
+            candidates.append(
+                _Candidate(
+                    section=section,
+                    result=hit,
+                    score=score,
+                    fingerprint=_fingerprint(f"{hit.title} {hit.snippet}"),
+                )
+            )
+
+    stats = RankingStats(hits_in=len(candidates))
+    candidates.sort(key=lambda c: c.score, reverse=True)
+
+    kept: list[_Candidate] = []
+    seen_urls: set[str] = set()
+    for candidate in candidates:
+        url = candidate.result.url.strip().lower()
+        duplicate = (url and url in seen_urls) or any(
+            _similarity(candidate.fingerprint, k.fingerprint) >= threshold for k in kept
+        )
+        if duplicate:
+            stats.duplicates_collapsed += 1
+            continue
+        if len(kept) >= budget:
+            stats.trimmed_by_budget += 1
+            continue
+        kept.append(candidate)
+        if url:
+            seen_urls.add(url)
+
+    stats.hits_out = len(kept)
+    by_section: dict[str, list[SearchResult]] = {section: [] for section in _SECTIONS}
+    for candidate in kept:
+        by_section[candidate.section].append(
+            candidate.result.model_copy(update={"score": round(candidate.score, 4)})
+        )
+
+    ranked = enrichment.model_copy(
+        update={
+            section: getattr(enrichment, section).model_copy(
+                update={"results": by_section[section]}
+            )
+            for section in _SECTIONS
+        }
+    )
+    return ranked, stats
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+
+import httpx
+
+from app.config import get_settings
+from app.services.providers import close_provider_clients, fake_transport
+
+logger = logging.getLogger(__name__)
+
+# One long-lived client so searches reuse pooled keep-alive connections instead
+# of paying a TCP + TLS handshake per query. Opened by the FastAPI lifespan (or
+# the pipeline CLI) and created lazily if something searches before that.
+_youcom_client: httpx.AsyncClient | None = None
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # type: ignore[import-not-found]  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_youcom_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    http2 = settings.YOUCOM_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("YOUCOM_HTTP2 enabled but `h2` is not installed; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        # None (a real network transport) unless PROVIDER_MODE=fake.
+        transport=fake_transport(),
+        timeout=settings.YOUCOM_HTTP_TIMEOUT,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.YOUCOM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.YOUCOM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.YOUCOM_HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def get_youcom_client() -> httpx.AsyncClient:
+    global _youcom_client
+    if _youcom_client is None or _youcom_client.is_closed:
+        _youcom_client = _build_youcom_client()
+    return _youcom_client
+
+
+async def open_http_clients() -> None:
+    get_youcom_client()
+
+
+async def close_http_clients() -> None:
+    global _youcom_client
+    client, _youcom_client = _youcom_client, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+    await close_provider_clients()
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import JobStatus, Meeting, MeetingStatus, PipelineJob
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Return types
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    meeting_id: int
+    attempts: int
+    worker_id: str
+    force: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _claimable(now: datetime, max_attempts: int):
+    """Queued jobs, or running jobs whose lease lapsed (worker died or hung)."""
+    return and_(
+        PipelineJob.attempts < max_attempts,
+        or_(
+            PipelineJob.status == JobStatus.Queued,
+            and_(
+                PipelineJob.status == JobStatus.Running,
+                PipelineJob.lease_expires_at < now,
+            ),
+        ),
+    )
+
+
+async def _fail_exhausted_leases(db: AsyncSession, now: datetime, max_attempts: int) -> None:
+    await db.execute(
+        update(PipelineJob)
+        .where(
+            PipelineJob.status == JobStatus.Running,
+            PipelineJob.lease_expires_at < now,
+            PipelineJob.attempts >= max_attempts,
+        )
+        .values(
+            status=JobStatus.Failed,
+            lease_owner=None,
+            lease_expires_at=None,
+            last_error="Lease expired on final attempt",
+            updated_at=now,
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def enqueue_new_meetings(
+    db: AsyncSession, *, force_ids: set[int] | None = None
+) -> int:
+    """Make sure every NEW meeting has a queued job. Returns jobs (re)queued.
+
+    Jobs are unique per meeting: an existing Queued/Running job is left alone,
+    so overlapping triggers never double-enqueue. A Done/Failed job is reset to
+    Queued (e.g. after `POST /meetings/{id}/run`). Meetings in `force_ids` get
+    their job's `force` flag set, even if it was already queued.
+    """
+    force_ids = force_ids or set()
+    result = await db.execute(select(Meeting.id).where(Meeting.status == MeetingStatus.New))
+    meeting_ids = list(result.scalars().all())
+    if not meeting_ids:
+        return 0
+
+    now = datetime.utcnow()
+    stmt = sqlite_insert(PipelineJob).values(
+        [
+            {
+                "meeting_id": mid,
+                "status": JobStatus.Queued,
+                "attempts": 0,
+                "force": mid in force_ids,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for mid in meeting_ids
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PipelineJob.meeting_id],
+        set_={
+            "status": JobStatus.Queued,
+            "attempts": 0,
+            "force": stmt.excluded.force,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "last_error": None,
+            "updated_at": now,
+        },
+        where=PipelineJob.status.in_([JobStatus.Done, JobStatus.Failed]),
+    )
+    result = await db.execute(stmt)
+    if force_ids:
+        await db.execute(
+            update(PipelineJob)
+            .where(
+                PipelineJob.meeting_id.in_(force_ids),
+                PipelineJob.status == JobStatus.Queued,
+            )
+            .values(force=True, updated_at=now)
+        )
+    await db.commit()
+    return max(result.rowcount or 0, 0)
+
+
+async def claim_next_job(
+    db: AsyncSession, *, worker_id: str, lease_seconds: int | None = None
+) -> ClaimedJob | None:
+    """Atomically claim the oldest claimable job, or return None.
+
+    The claim is a compare-and-set `UPDATE ... WHERE <still claimable>`: if
+    another worker wins the race the update matches zero rows and we move on to
+    the next candidate.
+    """
+    settings = get_settings()
+    lease = lease_seconds or settings.JOB_LEASE_SECONDS
+    max_attempts = settings.JOB_MAX_ATTEMPTS
+
+    while True:
+        now = datetime.utcnow()
+        await _fail_exhausted_leases(db, now, max_attempts)
+
+        result = await db.execute(
+            select(
+                PipelineJob.id, PipelineJob.meeting_id, PipelineJob.attempts, PipelineJob.force
+            )
+            .where(_claimable(now, max_attempts))
+            .order_by(PipelineJob.id)
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            await db.commit()
+            return None
+
+        claimed = await db.execute(
+            update(PipelineJob)
+            .where(PipelineJob.id == row.id, _claimable(now, max_attempts))
+            .values(
+                status=JobStatus.Running,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease),
+                heartbeat_at=now,
+                attempts=PipelineJob.attempts + 1,
+                updated_at=now,
+            )
+        )
+        await db.commit()
+        if claimed.rowcount == 1:
+            return ClaimedJob(
+                id=row.id,
+                meeting_id=row.meeting_id,
+                attempts=row.attempts + 1,
+                worker_id=worker_id,
+                force=bool(row.force),
+            )
+        logger.debug("lost claim race for job %s; retrying", row.id)
+
+
+async def heartbeat(
+    db: AsyncSession, job: ClaimedJob, *, lease_seconds: int | None = None
+) -> bool:
+    """Extend the lease. Returns False if this worker no longer owns the job."""
+    lease = lease_seconds or get_settings().JOB_LEASE_SECONDS
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(PipelineJob)
+        .where(
+            PipelineJob.id == job.id,
+            PipelineJob.status == JobStatus.Running,
+            PipelineJob.lease_owner == job.worker_id,
+        )
+        .values(
+            lease_expires_at=now + timedelta(seconds=lease),
+            heartbeat_at=now,
+            updated_at=now,
+        )
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def complete_job(db: AsyncSession, job: ClaimedJob) -> bool:
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(PipelineJob)
+        .where(PipelineJob.id == job.id, PipelineJob.lease_owner == job.worker_id)
+        .values(
+            status=JobStatus.Done,
+            force=False,
+            lease_owner=None,
+            lease_expires_at=None,
+            updated_at=now,
+        )
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def fail_job(db: AsyncSession, job: ClaimedJob, error: str) -> bool:
+    """Release the job for another attempt, or mark it Failed when exhausted."""
+    max_attempts = get_settings().JOB_MAX_ATTEMPTS
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(PipelineJob)
+        .where(PipelineJob.id == job.id, PipelineJob.lease_owner == job.worker_id)
+        .values(
+            status=JobStatus.Failed if job.attempts >= max_attempts else JobStatus.Queued,
+            lease_owner=None,
+            lease_expires_at=None,
+            last_error=error,
+            updated_at=now,
+        )
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def cancel_queued_jobs(db: AsyncSession, meeting_ids: list[int], reason: str) -> int:
+    """Close the Queued jobs of these meetings so no worker claims them. Does not commit.
+
+    A job already Running is left to its worker; the pipeline stages stop on
+    their own once they see the meeting's new status.
+    """
+    if not meeting_ids:
+        return 0
+    result = await db.execute(
+        update(PipelineJob)
+        .where(PipelineJob.meeting_id.in_(meeting_ids), PipelineJob.status == JobStatus.Queued)
+        .values(status=JobStatus.Done, last_error=reason, updated_at=datetime.utcnow())
+    )
+    return result.rowcount or 0
+
+
+async def owns_job(db: AsyncSession, job: ClaimedJob) -> bool:
+    """Whether this worker still holds an unexpired lease on the job."""
+    result = await db.execute(
+        select(PipelineJob.id).where(
+            PipelineJob.id == job.id,
+            PipelineJob.status == JobStatus.Running,
+            PipelineJob.lease_owner == job.worker_id,
+            PipelineJob.lease_expires_at > datetime.utcnow(),
+        )
+    )
+    return result.first() is not None
+
+
+def start_heartbeat(job: ClaimedJob, *, lease_seconds: int | None = None) -> asyncio.Task[None]:
+    """Renew the job's lease every third of its length until cancelled or lost.
+
+    The task ends on its own only when the lease was lost (see `lease_lost`); a
+    failed renewal is retried on the next beat while the lease may still hold.
+    """
+    lease = lease_seconds or get_settings().JOB_LEASE_SECONDS
+
+    async def _keep_alive() -> None:
+        while True:
+            await asyncio.sleep(max(lease / 3, 0.05))
+            try:
+                async with SessionLocal() as session:
+                    owned = await heartbeat(session, job, lease_seconds=lease)
+            except Exception as exc:
+                logger.warning("heartbeat for job %s failed: %s", job.id, exc)
+                continue
+            if not owned:
+                logger.warning("lost lease on job %s (meeting %s)", job.id, job.meeting_id)
+                return
+
+    return asyncio.create_task(_keep_alive())
+
+
+def lease_lost(keep_alive: asyncio.Task[None]) -> bool:
+    """Whether a `start_heartbeat` task stopped because another worker owns the job."""
+    return keep_alive.done() and not keep_alive.cancelled()
+
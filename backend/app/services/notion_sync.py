@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any
 
 from app.config import get_settings
+from app.services.providers import composio_ready, execute_composio, is_fake
 
 logger = logging.getLogger(__name__)
 
@@ -14,24 +14,13 @@ async def upsert_notion_row(
     meeting_data: dict[str, Any],
     existing_page_id: str | None = None,
 ) -> str | None:
-    settings = get_settings()
-    if not settings.COMPOSIO_API_KEY:
-        logger.warning("COMPOSIO_API_KEY not configured")
+    if not composio_ready():
         return None
-    if not settings.COMPOSIO_USER_ID:
-        logger.warning("COMPOSIO_USER_ID not configured")
-        return None
-    if not settings.NOTION_DATABASE_ID:
+    database_id = get_settings().NOTION_DATABASE_ID or ("fake-database" if is_fake() else None)
+    if not database_id:
         logger.warning("NOTION_DATABASE_ID not configured")
         return None
 
-    try:
-        from composio import Composio  # type: ignore[import-not-found]
-        from composio.client.enums import Action  # type: ignore[import-not-found]
-    except Exception as exc:
-        logger.error("Composio SDK import failed: %s", exc)
-        return None
-
     properties = {
         "Title": {"title": [{"text": {"content": meeting_data.get("title") or ""}}]},
         "Company": {"rich_text": [{"text": {"content": meeting_data.get("company") or ""}}]},
@@ -39,28 +28,16 @@ async def upsert_notion_row(
         "Status": {"select": {"name": meeting_data.get("status") or "Drafted"}},
     }
 
-    composio = Composio(api_key=settings.COMPOSIO_API_KEY)
-    entity = composio.get_entity(settings.COMPOSIO_USER_ID)
-
-    def _execute() -> dict[str, Any]:
-        if existing_page_id:
-            return entity.execute(
-                action=Action.NOTION_UPDATE_ROW_DATABASE,
-                params={
-                    "database_id": settings.NOTION_DATABASE_ID,
-                    "page_id": existing_page_id,
-                    "properties": properties,
-                },
-            )
-        return entity.execute(
-            action=Action.NOTION_INSERT_ROW_DATABASE,
-            params={
-                "database_id": settings.NOTION_DATABASE_ID,
-                "properties": properties,
-            },
+    if existing_page_id:
+        raw = await execute_composio(
+            "NOTION_UPDATE_ROW_DATABASE",
+            {"database_id": database_id, "page_id": existing_page_id, "properties": properties},
+        )
+    else:
+        raw = await execute_composio(
+            "NOTION_INSERT_ROW_DATABASE",
+            {"database_id": database_id, "properties": properties},
         )
-
-    raw = await asyncio.to_thread(_execute)
     if not raw.get("successful"):
         logger.warning("notion upsert failed: %s", raw.get("error") or raw)
         return None
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class PartialJSONParser:
+    """Incrementally read a JSON document that is still being streamed.
+
+    `feed()` scans only the new text, tracking string/escape state and the
+    stack of open containers. Every time an object or array closes, the text
+    up to that point plus the closers still open is a valid document; `value()`
+    parses the latest such prefix. Values are therefore only ever seen whole:
+    a half-written insight is left out until its closing brace arrives.
+    """
+
+    def __init__(self) -> None:
+        self._text: list[str] = []
+        self._length = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._cut: tuple[int, str] | None = None
+        self._cached: Any = None
+        self._cached_cut: tuple[int, str] | None = None
+
+    def feed(self, chunk: str) -> bool:
+        """Add streamed text. Returns True if a new complete container closed."""
+        advanced = False
+        for offset, char in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in _CLOSERS:
+                self._stack.append(_CLOSERS[char])
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                closers = "".join(reversed(self._stack))
+                self._cut = (self._length + offset + 1, closers)
+                advanced = True
+        self._text.append(chunk)
+        self._length += len(chunk)
+        return advanced
+
+    def value(self) -> Any | None:
+        """The largest complete prefix, parsed; None before anything has closed."""
+        if self._cut is None:
+            return None
+        if self._cut != self._cached_cut:
+            end, closers = self._cut
+            text = "".join(self._text)[:end] + closers
+            try:
+                self._cached = json.loads(text)
+            except ValueError:
+                return self._cached
+            self._cached_cut = self._cut
+        return self._cached
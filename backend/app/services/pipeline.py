@@ -2,22 +2,95 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.config import get_settings
 from app.database import SessionLocal
-
-from app.models import Meeting, MeetingStatus
+from app.models import Meeting, MeetingStatus, PipelineStage
+from app.schemas import SteeringProfileRead
 from app.services.calendar_poller import poll_and_upsert
-from app.services.enrichment import enrich_meeting
+from app.services.checkpoints import (
+    clear_checkpoints,
+    load_checkpoint,
+    save_checkpoint,
+    stable_hash,
+)
+from app.services.company_store import (
+    COMPANY_SECTIONS,
+    company_domain,
+    is_personal_domain,
+    load_company_bundle,
+    save_company_bundle,
+)
+from app.services.enrichment import (
+    EnrichmentResult,
+    SearchQueryOutcome,
+    enrich_meeting,
+    get_youcom_flights,
+)
+from app.services.enrichment_budget import plan_query_budgets
+from app.services.events import get_event_broker
 from app.services.gmail_drafter import create_drafts
+from app.services.hit_ranking import rank_enrichment
+from app.services.http_clients import close_http_clients, open_http_clients
+from app.services.job_queue import (
+    ClaimedJob,
+    claim_next_job,
+    complete_job,
+    default_worker_id,
+    enqueue_new_meetings,
+    fail_job,
+    lease_lost,
+    owns_job,
+    start_heartbeat,
+)
 from app.services.notion_sync import upsert_notion_row
-from app.services.synthesis import synthesize_meeting_prep
+from app.services.stage_graph import Stage, StageGraph
+from app.services.synthesis import (
+    PartialSynthesis,
+    SynthesisResult,
+    build_batch_request,
+    get_synthesis_stats,
+    synthesize_meeting_prep,
+)
+from app.services.synthesis_batch import (
+    BatchRequest,
+    failed_in_batch,
+    pending_in_batch,
+    poll_synthesis_batches,
+    submit_synthesis_batch,
+)
 from app.steering import get_current_steering
 
 logger = logging.getLogger(__name__)
 
+# Stage counters of the running graph (or the last finished one), for /pipeline/stats.
+_current_graph: StageGraph[_MeetingWork] | None = None
+_last_stage_stats: list[dict[str, Any]] = []
+
+
+@dataclass
+class _MeetingWork:
+    """A claimed meeting travelling through the stage graph."""
+
+    job: ClaimedJob
+    heartbeat: asyncio.Task[None]
+    steering: SteeringProfileRead
+    enrichment: EnrichmentResult | None = None
+    synthesis: SynthesisResult | None = None
+    ok: bool = False
+    # Set once the job is completed or released, so it is never finished twice.
+    finished: bool = False
+    # Shared per run: non-urgent syntheses collected for one offline batch.
+    batch: list[BatchRequest] | None = None
+
 
 # ---------------------------------------------------------------------------
 # Public API
@@ -25,24 +98,55 @@ logger = logging.getLogger(__name__)
 
 
 async def run_pipeline_for_new_meetings(
-    db: AsyncSession | None = None, *, poll: bool = True
+    db: AsyncSession | None = None,
+    *,
+    poll: bool = True,
+    concurrency: int | None = None,
+    force_ids: set[int] | None = None,
 ) -> int:
     """Orchestrate the end-to-end agent workflow for any NEW meetings.
 
-    In the full implementation (per `Backend.md`), this will:
     - Load NEW meetings from the DB (or insert them from calendar polling)
     - Enrich (You.com) in parallel
     - Synthesize (OpenAI GPT-4o structured output)
     - Persist artifacts + status updates
     - Sync to Notion + create Gmail drafts (via Composio)
 
-    For now, this is a stub so we can wire the trigger endpoint end-to-end.
+    With `SYNTHESIS_BATCH_ENABLED`, meetings further out than
+    `SYNTHESIS_BATCH_URGENT_HOURS` are not synthesized live: their requests are
+    submitted as one OpenAI batch at the end of the run, and a later run applies
+    the results and finishes the sync stage.
+
+    NEW meetings are enqueued as durable jobs (one per meeting) and claimed
+    under a lease, so overlapping triggers, uvicorn workers or CLI runs never
+    process the same meeting twice. Claimed meetings flow through an
+    enrich → synthesize → sync stage graph with a bounded queue and its own
+    worker pool per stage, so a slow provider only stalls its own stage. At
+    most `concurrency` meetings (defaults to `PIPELINE_CONCURRENCY`) are
+    claimed at once. Each stage uses its own session; `db` is only used for
+    polling and enqueueing. A meeting whose stage raises is released for
+    another attempt (up to `JOB_MAX_ATTEMPTS`) within the same run.
+
+    Meetings in `force_ids` are recomputed from scratch: their checkpoints are
+    cleared and the company store and synthesis cache are bypassed.
     """
     if db is None:
         async with SessionLocal() as session:
-            return await _run_pipeline_for_new_meetings(session, poll=poll)
+            return await _run_pipeline_for_new_meetings(
+                session, poll=poll, concurrency=concurrency, force_ids=force_ids
+            )
+
+    return await _run_pipeline_for_new_meetings(
+        db, poll=poll, concurrency=concurrency, force_ids=force_ids
+    )
 
-    return await _run_pipeline_for_new_meetings(db, poll=poll)
+
+def get_pipeline_stats() -> dict[str, Any]:
+    """Queue depth and throughput per stage for the running (or last) graph."""
+    graph = _current_graph
+    if graph is not None:
+        return {"running": True, "stages": graph.snapshot()}
+    return {"running": False, "stages": list(_last_stage_stats)}
 
 
 # ---------------------------------------------------------------------------
@@ -50,97 +154,569 @@ async def run_pipeline_for_new_meetings(
 # ---------------------------------------------------------------------------
 
 
-async def _run_pipeline_for_new_meetings(db: AsyncSession, *, poll: bool) -> int:
-    logger.info("run_pipeline_for_new_meetings: starting (stub)")
+async def _run_pipeline_for_new_meetings(
+    db: AsyncSession,
+    *,
+    poll: bool,
+    concurrency: int | None = None,
+    force_ids: set[int] | None = None,
+) -> int:
+    global _current_graph, _last_stage_stats
+    logger.info("run_pipeline_for_new_meetings: starting")
 
     if poll:
-        await poll_and_upsert(db, days_ahead=7, calendar_id="primary")
-
-    result = await db.execute(
-        select(Meeting).where(Meeting.status == MeetingStatus.New)
-    )
-    meetings = list(result.scalars().all())
+        await poll_and_upsert(db, calendar_id="primary")
 
+    # Finished batches put their meetings back to New, so poll before enqueueing.
+    await poll_synthesis_batches()
+    queued = await enqueue_new_meetings(db, force_ids=force_ids)
     steering = await get_current_steering(db)
 
+    settings = get_settings()
+    in_flight_limit = max(1, concurrency or settings.PIPELINE_CONCURRENCY)
+    slots = asyncio.Semaphore(in_flight_limit)
+    worker_id = f"{default_worker_id()}:{uuid.uuid4().hex[:8]}"
     processed_meetings = 0
-    for m in meetings:
-        logger.info(
-            "processing meeting (stub): %s",
-            m.title or m.calendar_event_id or m.id or "unknown",
+    # Meetings claimed and not yet finished; `released` fires as each finishes.
+    active = 0
+    released = asyncio.Event()
+    synthesis_before = get_synthesis_stats()
+    batch_requests: list[BatchRequest] = []
+
+    async def _finish(work: _MeetingWork, error: str | None = None) -> None:
+        nonlocal processed_meetings, active
+        if work.finished:
+            return
+        work.finished = True
+        work.heartbeat.cancel()
+        try:
+            async with SessionLocal() as session:
+                if error is None:
+                    await complete_job(session, work.job)
+                else:
+                    await fail_job(session, work.job, error)
+        finally:
+            active -= 1
+            slots.release()
+            released.set()
+        if work.ok:
+            processed_meetings += 1
+
+    def _terminal_aware(handler):
+        async def _run(work: _MeetingWork) -> _MeetingWork | None:
+            if lease_lost(work.heartbeat):
+                # Another worker reclaimed the job; it does the rest of the work.
+                logger.warning("dropping meeting %s: job lease lost", work.job.meeting_id)
+                await _finish(work)
+                return None
+            next_work = await handler(work)
+            if next_work is None:
+                await _finish(work)
+            return next_work
+
+        return _run
+
+    async def _on_error(work: _MeetingWork, stage: str, exc: BaseException) -> None:
+        if work.finished:
+            # Raised while finishing: the meeting's own work was already done.
+            logger.error("finishing job %s failed: %s", work.job.id, exc)
+            return
+        error = f"Unexpected error: {exc}"
+        # `fail_job` requeues the job until JOB_MAX_ATTEMPTS, and this run's
+        # claim loop picks it up again; checkpoints skip the stages that finished.
+        retrying = work.job.attempts < settings.JOB_MAX_ATTEMPTS
+        logger.warning(
+            "meeting %s failed in %s (attempt %s%s): %s",
+            work.job.meeting_id,
+            stage,
+            work.job.attempts,
+            ", retrying" if retrying else "",
+            exc,
         )
+        try:
+            await _mark_error(work.job.meeting_id, error)
+        finally:
+            await _finish(work, error)
+
+    queue_size = settings.PIPELINE_STAGE_QUEUE_SIZE
+    graph: StageGraph[_MeetingWork] = StageGraph(
+        [
+            Stage(
+                "enrich",
+                _terminal_aware(_enrich_stage),
+                workers=settings.PIPELINE_ENRICH_WORKERS,
+                queue_size=queue_size,
+            ),
+            Stage(
+                "synthesize",
+                _terminal_aware(_synthesize_stage),
+                workers=settings.PIPELINE_SYNTHESIZE_WORKERS,
+                queue_size=queue_size,
+            ),
+            Stage(
+                "sync",
+                _terminal_aware(_sync_stage),
+                workers=settings.PIPELINE_SYNC_WORKERS,
+                queue_size=queue_size,
+            ),
+        ],
+        on_error=_on_error,
+    )
 
-        m.status = MeetingStatus.Enriching
-        m.steering_version = steering.version
-        await db.commit()
+    _current_graph = graph
+    graph.start()
+    try:
+        while True:
+            await slots.acquire()
+            released.clear()
+            async with SessionLocal() as session:
+                job = await claim_next_job(session, worker_id=worker_id)
+            if job is None:
+                slots.release()
+                # A meeting that finished during the claim may have been requeued
+                # after the claim looked: claim once more before deciding.
+                if released.is_set():
+                    continue
+                if active == 0:
+                    break
+                # A meeting still in the graph may be requeued for another attempt.
+                await released.wait()
+                continue
+            active += 1
+            await graph.submit(
+                _MeetingWork(
+                    job=job,
+                    heartbeat=start_heartbeat(job),
+                    steering=steering,
+                    batch=batch_requests,
+                )
+            )
+        await graph.drain()
+    finally:
+        _last_stage_stats = graph.snapshot()
+        if _current_graph is graph:
+            _current_graph = None
+
+    logger.info(
+        "run_pipeline_for_new_meetings: done (queued=%s processed=%s in_flight_limit=%s)",
+        queued,
+        processed_meetings,
+        in_flight_limit,
+    )
+    if batch_requests:
+        await submit_synthesis_batch(batch_requests)
+    for stats in _last_stage_stats:
+        logger.info("stage stats: %s", stats)
+    logger.info("search single-flight: %s", get_youcom_flights().snapshot())
+    synthesis_after = get_synthesis_stats()
+    logger.info(
+        "synthesis this run: %s",
+        {
+            key: synthesis_after.get(key, 0) - synthesis_before.get(key, 0)
+            for key in ("runs", "input_tokens", "cached_input_tokens", "output_tokens")
+        },
+    )
+    return processed_meetings
 
-        enrichment = await enrich_meeting(
-            company=m.company or "Unknown",
-            role=m.role or "Unknown",
-            attendees=m.attendees or [],
-            steering=steering,
-        )
 
-        synthesis = await synthesize_meeting_prep(
+async def _mark_error(meeting_id: int, message: str) -> None:
+    async with SessionLocal() as session:
+        meeting = await session.get(Meeting, meeting_id)
+        if meeting is not None and await _set_status(session, meeting, MeetingStatus.Error):
+            meeting.error_message = message
+            await session.commit()
+            _publish_status(meeting)
+
+
+async def _set_status(db: AsyncSession, m: Meeting, status: MeetingStatus) -> bool:
+    """Move `m` to `status` unless it has been cancelled; the caller commits.
+
+    The calendar poller cancels meetings from its own session while a stage
+    runs, so the check is part of the UPDATE rather than a read of `m`.
+    """
+    result = await db.execute(
+        update(Meeting)
+        .where(Meeting.id == m.id, Meeting.status != MeetingStatus.Cancelled)
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    moved = result.rowcount > 0
+    set_committed_value(m, "status", status if moved else MeetingStatus.Cancelled)
+    return moved
+
+
+async def _cancelled(db: AsyncSession, m: Meeting) -> bool:
+    """Whether `m` was cancelled (or deleted) since this stage loaded it."""
+    status = await db.scalar(select(Meeting.status).where(Meeting.id == m.id))
+    return status is None or status == MeetingStatus.Cancelled
+
+
+def _publish_status(m: Meeting) -> None:
+    get_event_broker().publish(
+        m.id, "status", {"status": m.status.value, "error_message": m.error_message}
+    )
+
+
+def _search_company(m: Meeting) -> str | None:
+    """The company to research, if any; personal mail domains are not companies."""
+    if not m.company or is_personal_domain(m.company):
+        return None
+    return m.company
+
+
+def _companyless_sections(steering: SteeringProfileRead) -> dict[str, SearchQueryOutcome]:
+    """Searches that would only research "Unknown" when a meeting has no company.
+
+    The competitor search names the steering's competitors when there are any,
+    so only its company-only fallback query is skipped.
+    """
+    sections = {"company_news": SearchQueryOutcome(query="", skipped=True)}
+    if not steering.competitor_list:
+        sections["competitor_landscape"] = SearchQueryOutcome(query="", skipped=True)
+    return sections
+
+
+def _company_query_inputs(m: Meeting, steering: SteeringProfileRead) -> dict[str, Any]:
+    """What the news and competitor searches read (shared by meetings at one company)."""
+    budgets = plan_query_budgets(steering)
+    return {
+        "company": _search_company(m),
+        "product_focus": steering.product_focus,
+        "competitor_list": steering.competitor_list,
+        "counts": [budgets[section].count for section in COMPANY_SECTIONS],
+    }
+
+
+def _enrichment_inputs(m: Meeting, steering: SteeringProfileRead) -> dict[str, Any]:
+    """Everything `enrich_meeting` reads; a change here means re-enrich."""
+    return {
+        **_company_query_inputs(m, steering),
+        "role": m.role or "Unknown",
+        "icp": steering.icp,
+        "key_pains": steering.key_pains,
+        "weights": [steering.weight_news, steering.weight_role_pains, steering.weight_competitors],
+        "attendees": m.attendees or [],
+    }
+
+
+# Ranking scores decay with wall-clock recency, so they are left out of the
+# synthesis hash; which hits survived, and in what order, is kept.
+_UNSCORED = {"results": {"__all__": {"score"}}}
+
+
+def _synthesis_inputs(
+    m: Meeting, steering: SteeringProfileRead, enrichment: EnrichmentResult
+) -> dict[str, Any]:
+    unscored = enrichment.model_dump(
+        exclude={section: _UNSCORED for section in EnrichmentResult.model_fields}
+    )
+    return {
+        "enrichment": stable_hash(unscored),
+        "title": m.title or "",
+        "company": m.company or "Unknown",
+        "role": m.role or "Unknown",
+        "attendees": m.attendees or [],
+        "steering": steering.model_dump(exclude={"id", "version", "updated_at"}),
+    }
+
+
+def _is_urgent(m: Meeting, hours: float) -> bool:
+    """Meetings without a start time, or starting within `hours`, are urgent."""
+    if m.datetime_utc is None:
+        return True
+    start = m.datetime_utc
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return start <= datetime.now(tz=timezone.utc) + timedelta(hours=hours)
+
+
+async def _defer_to_batch(
+    db: AsyncSession,
+    m: Meeting,
+    work: _MeetingWork,
+    enrichment: EnrichmentResult,
+    synthesis_hash: str,
+) -> bool:
+    """Queue a non-urgent meeting's synthesis for this run's offline batch."""
+    settings = get_settings()
+    if (
+        work.batch is None
+        or work.job.force
+        or not settings.SYNTHESIS_BATCH_ENABLED
+        or not settings.OPENAI_API_KEY
+        or _enrichment_failed(enrichment)
+        or _is_urgent(m, settings.SYNTHESIS_BATCH_URGENT_HOURS)
+        or await failed_in_batch(db, m.id, synthesis_hash)
+    ):
+        return False
+
+    # Enriched, not yet synthesized: the meeting waits here until its batch lands.
+    if not await _set_status(db, m, MeetingStatus.Enriched):
+        # Cancelled meanwhile: there is nothing left to defer.
+        await db.rollback()
+        return True
+
+    # A rerun while its batch is still out keeps waiting on that batch rather
+    # than submitting the same request again.
+    if not await pending_in_batch(db, m.id, synthesis_hash):
+        body, cache_key = build_batch_request(
             enrichment=enrichment,
             meeting_title=m.title or "",
             company=m.company or "Unknown",
             role=m.role or "Unknown",
             attendees=m.attendees or [],
-            steering=steering,
+            steering=work.steering,
+        )
+        work.batch.append(
+            BatchRequest(
+                meeting_id=m.id, input_hash=synthesis_hash, cache_key=cache_key, body=body
+            )
+        )
+    await db.commit()
+    logger.info("synthesis deferred to batch (meeting=%s)", m.id)
+    return True
+
+
+def _enrichment_failed(enrichment: EnrichmentResult) -> bool:
+    return any(
+        outcome.error
+        for outcome in (
+            enrichment.company_news,
+            enrichment.role_pains,
+            enrichment.competitor_landscape,
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+# Stages
+#
+# Each stage opens its own session, reloads the meeting and checkpoints its
+# output under a hash of its inputs, so a rerun resumes at the first stage
+# whose inputs changed (or that never finished). Returning None ends the
+# meeting's trip through the graph; a meeting cancelled on the calendar ends
+# it at its next status change or external side effect, even mid-stage.
+# ---------------------------------------------------------------------------
+
+
+async def _enrich_stage(work: _MeetingWork) -> _MeetingWork | None:
+    steering = work.steering
+    async with SessionLocal() as db:
+        m = await db.get(Meeting, work.job.meeting_id)
+        if m is None or m.status == MeetingStatus.Cancelled:
+            return None
+        logger.info(
+            "processing meeting: %s",
+            m.title or m.calendar_event_id or m.id or "unknown",
         )
 
+        if not await _set_status(db, m, MeetingStatus.Enriching):
+            return None
+        m.steering_version = steering.version
+        if work.job.force:
+            await clear_checkpoints(db, m.id)
+        await db.commit()
+        _publish_status(m)
+
+        enrich_hash = stable_hash(_enrichment_inputs(m, steering))
+        cached = await load_checkpoint(db, m.id, PipelineStage.Enrich, enrich_hash)
+        domain = company_domain(m.company)
+        query_hash = stable_hash(_company_query_inputs(m, steering))
+        # The account's news and competitors come from the store; the role
+        # search is this meeting's own.
+        shared = None
+        if cached is None and domain is not None and not work.job.force:
+            shared = await load_company_bundle(db, domain, query_hash)
+
+        if cached is not None:
+            enrichment = EnrichmentResult.model_validate(cached)
+        else:
+            company = _search_company(m)
+            known = {
+                section: SearchQueryOutcome.model_validate(outcome)
+                for section, outcome in (shared or {}).items()
+            }
+            if company is None:
+                known.update(_companyless_sections(steering))
+            enrichment = await enrich_meeting(
+                company=company or "Unknown",
+                role=m.role or "Unknown",
+                attendees=m.attendees or [],
+                steering=steering,
+                known=known,
+            )
+            # Partial failures are not checkpointed so the next run retries them.
+            if not _enrichment_failed(enrichment):
+                bundle = enrichment.model_dump()
+                await save_checkpoint(db, m.id, PipelineStage.Enrich, enrich_hash, bundle)
+                if domain is not None and shared is None:
+                    sections = {section: bundle[section] for section in COMPANY_SECTIONS}
+                    await save_company_bundle(db, domain, query_hash, sections)
+                await db.commit()
+
+    # The checkpoint keeps the raw hits; ranking depends on the current weights.
+    work.enrichment, ranking = rank_enrichment(enrichment, steering)
+    logger.info(
+        "ranked hits (meeting=%s in=%s duplicates=%s trimmed=%s out=%s)",
+        work.job.meeting_id,
+        ranking.hits_in,
+        ranking.duplicates_collapsed,
+        ranking.trimmed_by_budget,
+        ranking.hits_out,
+    )
+    return work
+
+
+async def _synthesize_stage(work: _MeetingWork) -> _MeetingWork | None:
+    steering = work.steering
+    enrichment = work.enrichment
+    assert enrichment is not None
+    async with SessionLocal() as db:
+        m = await db.get(Meeting, work.job.meeting_id)
+        if m is None or m.status == MeetingStatus.Cancelled:
+            return None
+
+        synthesis_hash = stable_hash(_synthesis_inputs(m, steering, enrichment))
+        cached = await load_checkpoint(db, m.id, PipelineStage.Synthesize, synthesis_hash)
+        streamed = False
+        if cached is not None:
+            synthesis = SynthesisResult.model_validate(cached)
+        elif await _defer_to_batch(db, m, work, enrichment, synthesis_hash):
+            _publish_status(m)
+            return None
+        else:
+
+            async def _on_partial(partial: PartialSynthesis) -> None:
+                nonlocal streamed
+                streamed = True
+                # Persist first so a client connecting now gets it in its snapshot.
+                m.insights = [i.model_dump() for i in partial.insights]
+                m.hooks = [h.model_dump() for h in partial.hooks]
+                await db.commit()
+                get_event_broker().publish(
+                    m.id, "partial", {"insights": m.insights, "hooks": m.hooks}
+                )
+
+            synthesis = await synthesize_meeting_prep(
+                enrichment=enrichment,
+                meeting_title=m.title or "",
+                company=m.company or "Unknown",
+                role=m.role or "Unknown",
+                attendees=m.attendees or [],
+                steering=steering,
+                force=work.job.force,
+                on_partial=_on_partial,
+            )
+
         if synthesis.error:
             logger.warning("synthesis returned error: %s", synthesis.error)
-            m.status = MeetingStatus.Error
-            m.error_message = synthesis.error
+            if streamed:
+                # Partials of a failed run are not a result; don't leave them on show.
+                m.insights, m.hooks = [], []
+                get_event_broker().publish(m.id, "partial", {"insights": [], "hooks": []})
+            if await _set_status(db, m, MeetingStatus.Error):
+                m.error_message = synthesis.error
             await db.commit()
-            continue
+            _publish_status(m)
+            return None
 
         logger.info(
             "synthesis complete (insights=%s hooks=%s)",
             len(synthesis.insights),
             len(synthesis.hooks),
         )
+        if not await _set_status(db, m, MeetingStatus.Enriched):
+            # Cancelled on the calendar while the model ran.
+            await db.commit()
+            _publish_status(m)
+            return None
         m.insights = [i.model_dump() for i in synthesis.insights]
         m.hooks = [h.model_dump() for h in synthesis.hooks]
         m.competitors = [c.model_dump() for c in synthesis.competitors]
-        m.status = MeetingStatus.Enriched
+        m.error_message = None
+        await save_checkpoint(
+            db, m.id, PipelineStage.Synthesize, synthesis_hash, synthesis.model_dump()
+        )
         await db.commit()
-
-        notion_page_id = await upsert_notion_row(
-            meeting_data={
-                "title": m.title,
-                "company": m.company,
-                "role": m.role,
-                "status": m.status.value,
-            },
-            existing_page_id=m.notion_page_id,
+        get_event_broker().publish(
+            m.id,
+            "synthesis",
+            {"insights": m.insights, "hooks": m.hooks, "competitors": m.competitors},
         )
-        if notion_page_id:
-            m.notion_page_id = notion_page_id
+        _publish_status(m)
+        work.synthesis = synthesis
+        return work
+
+
+async def _sync_stage(work: _MeetingWork) -> _MeetingWork | None:
+    synthesis = work.synthesis
+    assert synthesis is not None
+    async with SessionLocal() as db:
+        m = await db.get(Meeting, work.job.meeting_id)
+        if m is None or m.status == MeetingStatus.Cancelled:
+            return None
+        # Notion and Gmail writes cannot be undone: make sure no other worker
+        # has reclaimed the job (a lapsed lease) before making them.
+        if not await owns_job(db, work.job):
+            logger.warning("skipping sync for meeting %s: job lease lost", m.id)
+            return None
+
+        meeting_data = {
+            "title": m.title,
+            "company": m.company,
+            "role": m.role,
+            "status": m.status.value,
+        }
+        notion_hash = stable_hash(meeting_data)
+        cached = await load_checkpoint(db, m.id, PipelineStage.Notion, notion_hash)
+        if cached is not None:
+            m.notion_page_id = cached
+        else:
+            # Re-checked before each side effect: the event may have been
+            # cancelled while the earlier stages (or the previous call) ran.
+            if await _cancelled(db, m):
+                return None
+            notion_page_id = await upsert_notion_row(
+                meeting_data=meeting_data,
+                existing_page_id=m.notion_page_id,
+            )
+            if notion_page_id:
+                m.notion_page_id = notion_page_id
+                await save_checkpoint(db, m.id, PipelineStage.Notion, notion_hash, notion_page_id)
+                await db.commit()
 
         recipient = ""
         if m.attendees:
             email = m.attendees[0].get("email")
             if email:
                 recipient = str(email)
-        draft_ids = []
-        if recipient:
-            draft_ids = await create_drafts(
-                recipient_email=recipient,
-                pre_meeting=synthesis.pre_meeting_draft.model_dump(),
-                follow_up=synthesis.follow_up_draft.model_dump(),
-            )
-        m.draft_ids = draft_ids
-
-        m.status = MeetingStatus.Drafted
+        pre_meeting = synthesis.pre_meeting_draft.model_dump()
+        follow_up = synthesis.follow_up_draft.model_dump()
+        gmail_hash = stable_hash(
+            {"recipient": recipient, "pre_meeting": pre_meeting, "follow_up": follow_up}
+        )
+        cached = await load_checkpoint(db, m.id, PipelineStage.Gmail, gmail_hash)
+        if cached is not None:
+            m.draft_ids = cached
+        else:
+            draft_ids = []
+            if recipient:
+                if await _cancelled(db, m):
+                    await db.commit()
+                    return None
+                draft_ids = await create_drafts(
+                    recipient_email=recipient,
+                    pre_meeting=pre_meeting,
+                    follow_up=follow_up,
+                )
+            m.draft_ids = draft_ids
+            if len(draft_ids) == 2:
+                await save_checkpoint(db, m.id, PipelineStage.Gmail, gmail_hash, draft_ids)
+
+        work.ok = await _set_status(db, m, MeetingStatus.Drafted)
         await db.commit()
-
-        processed_meetings += 1
-
-    logger.info("run_pipeline_for_new_meetings: done (processed=%s)", processed_meetings)
-    return processed_meetings
+        _publish_status(m)
+        return None
 
 
 def _main() -> None:
@@ -151,7 +727,15 @@ def _main() -> None:
       python -m app.services.pipeline
     """
     logging.basicConfig(level=logging.INFO)
-    processed = asyncio.run(run_pipeline_for_new_meetings())
+
+    async def _run() -> int:
+        await open_http_clients()
+        try:
+            return await run_pipeline_for_new_meetings()
+        finally:
+            await close_http_clients()
+
+    processed = asyncio.run(_run())
     logger.info("processed_meetings=%s", processed)
 
 
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any
+
+import httpx
+from agents import OpenAIChatCompletionsModel, set_tracing_disabled
+from agents.models.interface import Model
+from fastapi import FastAPI
+from openai import AsyncOpenAI
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_MODES = ("live", "fake", "fake-http")
+
+_LIVE_YOUCOM_SEARCH_URL = "https://ydc-index.io/v1/search"
+# Base URL the in-process fakes are addressed by (never resolved: requests go
+# through an ASGI transport).
+_IN_PROCESS_URL = "http://fake-providers"
+
+_fake_app: FastAPI | None = None
+# One client for every fake call (Composio actions, OpenAI chat + batch).
+_fake_client: httpx.AsyncClient | None = None
+_openai_client: AsyncOpenAI | None = None
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _fake_base_url() -> str:
+    if provider_mode() == "fake":
+        return _IN_PROCESS_URL
+    return get_settings().FAKE_PROVIDERS_URL.rstrip("/")
+
+
+def _fake_http_client() -> httpx.AsyncClient:
+    global _fake_client
+    if _fake_client is None or _fake_client.is_closed:
+        _fake_client = httpx.AsyncClient(transport=fake_transport(), timeout=120.0)
+    return _fake_client
+
+
+@lru_cache(maxsize=4)
+def _composio_entity(api_key: str, user_id: str) -> Any:
+    from composio import Composio  # type: ignore[import-not-found]
+
+    return Composio(api_key=api_key).get_entity(user_id)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def provider_mode() -> str:
+    mode = get_settings().PROVIDER_MODE
+    if mode not in PROVIDER_MODES:
+        logger.warning("unknown PROVIDER_MODE %r; using live providers", mode)
+        return "live"
+    return mode
+
+
+def is_fake() -> bool:
+    return provider_mode() != "live"
+
+
+def get_fake_providers_app() -> FastAPI:
+    """The in-process fakes (built once from the `FAKE_*` settings)."""
+    global _fake_app
+    if _fake_app is None:
+        from app.fakes.providers import create_app
+
+        _fake_app = create_app()
+    return _fake_app
+
+
+def fake_transport() -> httpx.AsyncBaseTransport | None:
+    """ASGI transport onto the in-process fakes in "fake" mode; None otherwise."""
+    if provider_mode() != "fake":
+        return None
+    return httpx.ASGITransport(app=get_fake_providers_app())
+
+
+def youcom_search_url() -> str:
+    if is_fake():
+        return f"{_fake_base_url()}/youcom/v1/search"
+    return _LIVE_YOUCOM_SEARCH_URL
+
+
+def openai_client() -> AsyncOpenAI:
+    """OpenAI client for direct API calls (the Batch API); fakes in the fake modes."""
+    global _openai_client
+    settings = get_settings()
+    if not is_fake():
+        return AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL or None
+        )
+    if _openai_client is None or _openai_client.is_closed():
+        _openai_client = AsyncOpenAI(
+            api_key="fake",
+            base_url=f"{_fake_base_url()}/openai/v1",
+            http_client=_fake_http_client(),
+        )
+    return _openai_client
+
+
+def synthesis_model(name: str) -> str | Model:
+    """What the synthesis Agent runs on: the model name live, a fake-backed model otherwise.
+
+    The fakes speak Chat Completions, so fake modes use the SDK's Chat
+    Completions model (streaming included) with tracing export switched off.
+    """
+    if not is_fake():
+        return name
+    set_tracing_disabled(True)
+    return OpenAIChatCompletionsModel(model=name, openai_client=openai_client())
+
+
+def composio_ready() -> bool:
+    """Whether Composio actions can run; logs what is missing when they cannot."""
+    if is_fake():
+        return True
+    settings = get_settings()
+    if not settings.COMPOSIO_API_KEY:
+        logger.warning("COMPOSIO_API_KEY not configured")
+        return False
+    if not settings.COMPOSIO_USER_ID:
+        logger.warning("COMPOSIO_USER_ID not configured")
+        return False
+    return True
+
+
+async def execute_composio(action: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Run one Composio action; returns the SDK's `{"successful", "data", "error"}` dict.
+
+    A missing SDK, and HTTP failures from the fakes, come back as unsuccessful results.
+    """
+    if is_fake():
+        try:
+            resp = await _fake_http_client().post(
+                f"{_fake_base_url()}/composio/actions/{action}/execute",
+                json={"params": params},
+            )
+        except httpx.HTTPError as exc:
+            return {"successful": False, "data": None, "error": f"Connection error: {exc}"}
+        if resp.status_code != 200:
+            return {"successful": False, "data": None, "error": f"HTTP {resp.status_code}"}
+        return resp.json()
+
+    settings = get_settings()
+
+    # Composio SDK is sync; run it off the event loop.
+    def _execute() -> dict[str, Any]:
+        from composio.client.enums import Action  # type: ignore[import-not-found]
+
+        entity = _composio_entity(settings.COMPOSIO_API_KEY or "", settings.COMPOSIO_USER_ID or "")
+        return entity.execute(action=getattr(Action, action), params=params)
+
+    try:
+        return await asyncio.to_thread(_execute)
+    except ImportError as exc:
+        logger.error("Composio SDK import failed: %s", exc)
+        return {"successful": False, "data": None, "error": f"Composio SDK unavailable: {exc}"}
+
+
+async def close_provider_clients() -> None:
+    global _fake_client, _openai_client
+    client, _fake_client, _openai_client = _fake_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def reset_fake_providers() -> None:
+    """Forget the in-process fakes so the next use rebuilds them from settings."""
+    global _fake_app
+    _fake_app = None
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from app.config import get_settings
+
+# ---------------------------------------------------------------------------
+# Token bucket
+# ---------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `burst` banked.
+
+    Waiters are served in arrival order (the lock is held while sleeping), so a
+    burst of concurrent meetings is smoothed into a steady request rate.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = max(rate, 1e-6)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waits = 0
+
+    async def acquire(self, *, deadline: float | None = None) -> bool:
+        """Take one token. Returns False (without waiting) if that would pass `deadline`.
+
+        `deadline` is a `loop.time()` timestamp.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                if deadline is not None and loop.time() + wait > deadline:
+                    return False
+                self.waits += 1
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+            return True
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+# ---------------------------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int
+    backoff_base: float
+    backoff_max: float
+    deadline_seconds: float
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Full-jitter exponential backoff; a server `Retry-After` takes precedence."""
+        if retry_after is not None:
+            return max(0.0, retry_after)
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def new_deadline(self) -> float:
+        return asyncio.get_running_loop().time() + self.deadline_seconds
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """`Retry-After` is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(tz=timezone.utc)).total_seconds())
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+_youcom_limiter: TokenBucket | None = None
+_synthesis_slots: asyncio.Semaphore | None = None
+
+
+def get_youcom_limiter() -> TokenBucket:
+    """Process-wide limiter every You.com request goes through."""
+    global _youcom_limiter
+    if _youcom_limiter is None:
+        settings = get_settings()
+        _youcom_limiter = TokenBucket(
+            settings.YOUCOM_RATE_LIMIT_PER_SEC, settings.YOUCOM_RATE_LIMIT_BURST
+        )
+    return _youcom_limiter
+
+
+def reset_youcom_limiter() -> None:
+    global _youcom_limiter
+    _youcom_limiter = None
+
+
+def get_youcom_retry_policy() -> RetryPolicy:
+    settings = get_settings()
+    return RetryPolicy(
+        max_retries=settings.YOUCOM_MAX_RETRIES,
+        backoff_base=settings.YOUCOM_BACKOFF_BASE_SECONDS,
+        backoff_max=settings.YOUCOM_BACKOFF_MAX_SECONDS,
+        deadline_seconds=settings.ENRICHMENT_DEADLINE_SECONDS,
+    )
+
+
+def get_synthesis_slots() -> asyncio.Semaphore:
+    """Process-wide cap on LLM calls in flight (hedges and retries included)."""
+    global _synthesis_slots
+    if _synthesis_slots is None:
+        _synthesis_slots = asyncio.Semaphore(max(1, get_settings().SYNTHESIS_MAX_CONCURRENCY))
+    return _synthesis_slots
+
+
+def reset_synthesis_slots() -> None:
+    global _synthesis_slots
+    _synthesis_slots = None
+
+
+def get_synthesis_retry_policy() -> RetryPolicy:
+    settings = get_settings()
+    return RetryPolicy(
+        max_retries=settings.SYNTHESIS_MAX_RETRIES,
+        backoff_base=settings.SYNTHESIS_BACKOFF_BASE_SECONDS,
+        backoff_max=settings.SYNTHESIS_BACKOFF_MAX_SECONDS,
+        deadline_seconds=settings.SYNTHESIS_DEADLINE_SECONDS,
+    )
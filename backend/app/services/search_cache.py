@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import SearchCacheEntry
+from app.services.checkpoints import stable_hash
+
+logger = logging.getLogger(__name__)
+
+# How long a result stays fresh, by the You.com `freshness` window it was asked for.
+_FRESHNESS_TTL = {
+    "day": timedelta(hours=1),
+    "week": timedelta(hours=6),
+    "month": timedelta(hours=24),
+    "year": timedelta(days=7),
+}
+_DEFAULT_TTL = timedelta(hours=1)
+
+Refresher = Callable[[], Awaitable["list[dict[str, Any]] | None"]]
+
+# ---------------------------------------------------------------------------
+# Return types
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CachedSearch:
+    results: list[dict[str, Any]]
+    fetched_at: datetime
+    stale: bool = False
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+async def _prune(session: AsyncSession, now: datetime) -> int:
+    """Delete rows too old to be served even stale (past SEARCH_CACHE_STALE_FACTOR x TTL)."""
+    factor = get_settings().SEARCH_CACHE_STALE_FACTOR
+    conditions = [
+        (SearchCacheEntry.freshness == freshness, ttl)
+        for freshness, ttl in _FRESHNESS_TTL.items()
+    ]
+    conditions.append((SearchCacheEntry.freshness.not_in(_FRESHNESS_TTL), _DEFAULT_TTL))
+    deleted = 0
+    for same_freshness, ttl in conditions:
+        result = await session.execute(
+            delete(SearchCacheEntry).where(
+                same_freshness, SearchCacheEntry.fetched_at < now - ttl * factor
+            )
+        )
+        deleted += result.rowcount or 0
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+
+def ttl_for(freshness: str) -> timedelta:
+    return _FRESHNESS_TTL.get(freshness, _DEFAULT_TTL)
+
+
+def cache_key(query: str, count: int, freshness: str) -> str:
+    return stable_hash({"query": query, "count": count, "freshness": freshness})
+
+
+class SearchCache:
+    """Two-tier (memory LRU → SQLite) cache of You.com search results.
+
+    Only successful results are stored. Reads never raise: a broken SQLite tier
+    is logged and treated as a miss.
+    """
+
+    def __init__(self) -> None:
+        self._memory: OrderedDict[str, CachedSearch] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+        self.stats: Counter[str] = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return get_settings().SEARCH_CACHE_ENABLED
+
+    async def get(self, query: str, count: int, freshness: str) -> CachedSearch | None:
+        """Return a fresh or stale-but-servable entry, or None on a miss."""
+        key = cache_key(query, count, freshness)
+        entry = self._memory.get(key)
+        tier = "memory"
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            tier = "sqlite"
+            entry = await self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        ttl = ttl_for(freshness)
+        age = datetime.utcnow() - entry.fetched_at
+        if age <= ttl:
+            self.stats[f"hits_{tier}"] += 1
+            return CachedSearch(entry.results, entry.fetched_at, stale=False)
+        if age <= ttl * get_settings().SEARCH_CACHE_STALE_FACTOR:
+            self.stats["stale"] += 1
+            return CachedSearch(entry.results, entry.fetched_at, stale=True)
+
+        self.stats["misses"] += 1
+        self.stats["expired"] += 1
+        return None
+
+    async def put(
+        self, query: str, count: int, freshness: str, results: list[dict[str, Any]]
+    ) -> None:
+        """Store a successful result; expired rows are pruned in the same write."""
+        key = cache_key(query, count, freshness)
+        now = datetime.utcnow()
+        self._remember(key, CachedSearch(results, now))
+        self.stats["stores"] += 1
+        try:
+            async with SessionLocal() as session:
+                stmt = sqlite_insert(SearchCacheEntry).values(
+                    key=key,
+                    query=query,
+                    count=count,
+                    freshness=freshness,
+                    results=results,
+                    fetched_at=now,
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[SearchCacheEntry.key],
+                    set_={"results": results, "fetched_at": now},
+                )
+                await session.execute(stmt)
+                pruned = await _prune(session, now)
+                await session.commit()
+        except Exception as exc:
+            logger.warning("search cache write failed: %s", exc)
+            return
+        if pruned:
+            self.stats["pruned"] += pruned
+
+    def refresh_in_background(
+        self, query: str, count: int, freshness: str, refresh: Refresher
+    ) -> None:
+        """Re-fetch a stale entry off the request path (at most one refresh per key)."""
+        key = cache_key(query, count, freshness)
+        if key in self._refreshing:
+            return
+
+        async def _run() -> None:
+            try:
+                results = await refresh()
+                if results is None:
+                    self.stats["refresh_errors"] += 1
+                    return
+                await self.put(query, count, freshness, results)
+                self.stats["refreshes"] += 1
+            except Exception as exc:
+                self.stats["refresh_errors"] += 1
+                logger.warning("search cache refresh failed: %s", exc)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(_run())
+
+    async def wait_for_refreshes(self) -> None:
+        tasks = list(self._refreshing.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def reset(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.wait_for_refreshes()
+        self._memory.clear()
+        self.stats.clear()
+
+    def snapshot(self) -> dict[str, int]:
+        return {"memory_entries": len(self._memory), **self.stats}
+
+    def _remember(self, key: str, entry: CachedSearch) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        limit = max(0, get_settings().SEARCH_CACHE_MEMORY_ENTRIES)
+        while len(self._memory) > limit:
+            self._memory.popitem(last=False)
+
+    async def _load(self, key: str) -> CachedSearch | None:
+        try:
+            async with SessionLocal() as session:
+                result = await session.execute(
+                    select(SearchCacheEntry.results, SearchCacheEntry.fetched_at).where(
+                        SearchCacheEntry.key == key
+                    )
+                )
+                row = result.first()
+        except Exception as exc:
+            logger.warning("search cache read failed: %s", exc)
+            return None
+        if row is None:
+            return None
+        return CachedSearch(list(row.results or []), row.fetched_at)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+_cache = SearchCache()
+
+
+def get_search_cache() -> SearchCache:
+    return _cache
+
+
+def get_search_cache_stats() -> dict[str, int]:
+    return _cache.snapshot()
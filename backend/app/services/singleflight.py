@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls that share a key into one in-flight call.
+
+    The first caller for a key starts `fn()` as a task; callers arriving while
+    it runs await the same task. The work is shielded, so one caller being
+    cancelled does not cancel it for the others. Nothing is cached: once the
+    task finishes, the next call for that key starts a fresh one.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task[T]] = {}
+        self.stats: Counter[str] = Counter()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done, k=key: self._forget(k, done))
+            self.stats["calls"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def running(self, key: Hashable) -> bool:
+        """Whether a call for `key` is in flight (a `do` now would join it)."""
+        return key in self._calls
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def snapshot(self) -> dict[str, int]:
+        return {"in_flight": len(self._calls), **self.stats}
+
+    def reset(self) -> None:
+        for task in self._calls.values():
+            task.cancel()
+        self._calls.clear()
+        self.stats.clear()
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
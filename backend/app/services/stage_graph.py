@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# A handler returns the item to hand to the next stage, or None to stop here.
+StageHandler = Callable[[Any], Awaitable[Any]]
+ErrorHandler = Callable[[Any, str, BaseException], Awaitable[None]]
+
+
+# ---------------------------------------------------------------------------
+# Stage
+# ---------------------------------------------------------------------------
+
+
+class Stage(Generic[T]):
+    """A bounded input queue drained by a fixed-size pool of async workers."""
+
+    def __init__(
+        self, name: str, handler: StageHandler, *, workers: int, queue_size: int
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue[T] = asyncio.Queue(maxsize=max(1, queue_size))
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at: float | None = None
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "throughput_per_sec": round(self.processed / elapsed, 3) if elapsed else 0.0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+
+class StageGraph(Generic[T]):
+    """A linear chain of stages connected by bounded queues.
+
+    `submit` blocks while the first queue is full, which gives producers
+    backpressure. Items that raise are passed to `on_error` and dropped; the
+    stage's workers keep going.
+    """
+
+    def __init__(self, stages: list[Stage[T]], *, on_error: ErrorHandler) -> None:
+        self.stages = stages
+        self.on_error = on_error
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        now = time.monotonic()
+        for index, stage in enumerate(self.stages):
+            stage.started_at = now
+            downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            for _ in range(stage.workers):
+                self._tasks.append(asyncio.create_task(self._work(stage, downstream)))
+
+    async def submit(self, item: T) -> None:
+        await self.stages[0].queue.put(item)
+
+    async def drain(self) -> None:
+        """Wait until every submitted item has left the graph, then stop workers."""
+        for stage in self.stages:
+            await stage.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [stage.snapshot() for stage in self.stages]
+
+    async def _work(self, stage: Stage[T], downstream: Stage[T] | None) -> None:
+        while True:
+            item = await stage.queue.get()
+            stage.in_flight += 1
+            started = time.monotonic()
+            try:
+                result = await stage.handler(item)
+            except Exception as exc:
+                stage.failed += 1
+                logger.exception("stage %s failed", stage.name)
+                try:
+                    await self.on_error(item, stage.name, exc)
+                except Exception:
+                    logger.exception("stage %s error handler failed", stage.name)
+            else:
+                stage.processed += 1
+                if result is not None and downstream is not None:
+                    await downstream.queue.put(result)
+            finally:
+                stage.busy_seconds += time.monotonic() - started
+                stage.in_flight -= 1
+                stage.queue.task_done()
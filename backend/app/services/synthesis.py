@@ -1,17 +1,52 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import math
+import time
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
 from typing import Any, Optional
 
-from agents import Agent, ModelSettings, Runner
+from agents import Agent, AgentOutputSchema, ModelSettings, Runner
+from agents.exceptions import ModelBehaviorError
+from openai import APIConnectionError, InternalServerError, RateLimitError
 from pydantic import BaseModel, Field
 
 from app.config import get_settings
 from app.schemas import SteeringProfileRead
-from app.services.enrichment import EnrichmentResult
+from app.services.enrichment import EnrichmentResult, SearchQueryOutcome, SearchResult
+from app.services.partial_json import PartialJSONParser
+from app.services.providers import is_fake, synthesis_model
+from app.services.rate_limit import (
+    get_synthesis_retry_policy,
+    get_synthesis_slots,
+    parse_retry_after,
+)
+from app.services.synthesis_cache import load_synthesis, store_synthesis, synthesis_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Built synthesis Agents by (steering version, model). The instruction block depends
+# on the steering profile only, so every meeting under one version shares it.
+_agent_cache: dict[tuple[int, str], Agent[Any]] = {}
+_stats: Counter[str] = Counter()
+# Per-model counters for the model ladder: runs, escalations, tokens, latency.
+_tier_stats: defaultdict[str, Counter[str]] = defaultdict(Counter)
+
+_PAYLOAD_PREAMBLE = (
+    "Use the following meeting context + enrichment to produce the structured output.\n\n"
+)
+_SECTIONS = ("company_news", "role_pains", "competitor_landscape")
+# Snippet length once a payload is over budget (hits are capped at 500 upstream).
+_TRIMMED_SNIPPET_CHARS = 240
+# Word range for the pre-meeting draft (the rule stated in the instructions).
+_DRAFT_WORDS = (80, 150)
+# Failures worth another attempt: our own per-call timeout, connection errors
+# (including the SDK's timeouts), 429s and 5xx.
+_TRANSIENT_ERRORS = (TimeoutError, APIConnectionError, RateLimitError, InternalServerError)
+
 # ---------------------------------------------------------------------------
 # Return types (structured output)
 # ---------------------------------------------------------------------------
@@ -47,13 +82,28 @@ class SynthesisResult(BaseModel):
     error: Optional[str] = Field(default=None, description="Set only when synthesis failed")
 
 
+class PartialSynthesis(BaseModel):
+    """Insights and hooks completed so far while the structured output streams in."""
+
+    insights: list[Insight] = Field(default_factory=list)
+    hooks: list[Hook] = Field(default_factory=list)
+
+
+PartialCallback = Callable[[PartialSynthesis], Awaitable[None]]
+
+
 # ---------------------------------------------------------------------------
 # Private helpers
 # ---------------------------------------------------------------------------
 
 
 def _build_system_instructions(steering: SteeringProfileRead) -> str:
-    """Build a steering-aware instruction block for synthesis."""
+    """Build a steering-aware instruction block for synthesis.
+
+    This is the prompt prefix. It must stay byte-identical for a steering
+    version (nothing per-meeting in here) so the provider's prompt cache can
+    reuse it; the task text comes first, the steering profile after.
+    """
     return "\n".join(
         [
             "You are an always-on meeting prep agent for founder-led sales.",
@@ -79,6 +129,54 @@ def _build_system_instructions(steering: SteeringProfileRead) -> str:
     ).strip()
 
 
+def _estimate_tokens(text: str) -> int:
+    """Cheap local estimate (~4 characters per token for English JSON)."""
+    return math.ceil(len(text) / 4)
+
+
+def _compact_attendee(attendee: dict[str, Any]) -> dict[str, Any]:
+    return {
+        key: attendee[key]
+        for key in ("name", "email")
+        if isinstance(attendee, dict) and attendee.get(key)
+    }
+
+
+def _compact_hit(hit: SearchResult, snippet_chars: int) -> dict[str, Any]:
+    compact = {"title": hit.title, "url": hit.url, "snippet": hit.snippet[:snippet_chars]}
+    if hit.age:
+        compact["age"] = hit.age
+    return compact
+
+
+def _compact_outcome(
+    outcome: SearchQueryOutcome, hits: list[SearchResult], snippet_chars: int
+) -> dict[str, Any]:
+    compact: dict[str, Any] = {"query": outcome.query}
+    if outcome.skipped:
+        compact["skipped"] = True
+    if outcome.error:
+        compact["error"] = outcome.error
+    compact["results"] = [_compact_hit(hit, snippet_chars) for hit in hits]
+    return compact
+
+
+def _render_payload(
+    meeting: dict[str, Any],
+    enrichment: EnrichmentResult,
+    kept: dict[str, list[SearchResult]],
+    snippet_chars: int,
+) -> str:
+    data = {
+        "meeting": meeting,
+        "enrichment": {
+            section: _compact_outcome(getattr(enrichment, section), kept[section], snippet_chars)
+            for section in _SECTIONS
+        },
+    }
+    return _PAYLOAD_PREAMBLE + json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
 def _build_input_payload(
     *,
     enrichment: EnrichmentResult,
@@ -86,24 +184,289 @@ def _build_input_payload(
     company: str,
     role: str,
     attendees: list[dict[str, Any]],
+    token_budget: int | None = None,
 ) -> str:
-    """Build a compact text payload the agent can reliably ground on."""
-    data = {
-        "meeting": {
-            "title": meeting_title,
-            "company": company,
-            "role": role,
-            "attendees": attendees,
-        },
-        "enrichment": enrichment.model_dump(),
+    """Build a compact JSON payload the agent can reliably ground on.
+
+    `None` fields and per-hit bookkeeping are left out. If the payload is over
+    `token_budget` (default `SYNTHESIS_PAYLOAD_TOKEN_BUDGET`), snippets are
+    shortened first, then hits are dropped lowest-ranked first (by `score`
+    when ranked, otherwise by position) until it fits.
+    """
+    budget = token_budget or get_settings().SYNTHESIS_PAYLOAD_TOKEN_BUDGET
+    meeting = {
+        "title": meeting_title,
+        "company": company,
+        "role": role,
+        "attendees": [a for a in map(_compact_attendee, attendees) if a],
+    }
+    kept = {section: list(getattr(enrichment, section).results) for section in _SECTIONS}
+
+    payload = _render_payload(meeting, enrichment, kept, snippet_chars=500)
+    before = _estimate_tokens(payload)
+    dropped = 0
+    if before > budget:
+        payload = _render_payload(meeting, enrichment, kept, _TRIMMED_SNIPPET_CHARS)
+        ranked = sorted(
+            (
+                (hit.score if hit.score is not None else 0.0, -position, section, hit)
+                for section in _SECTIONS
+                for position, hit in enumerate(kept[section])
+            ),
+            key=lambda entry: (entry[0], entry[1]),
+        )
+        for _score, _position, section, hit in ranked:
+            if _estimate_tokens(payload) <= budget:
+                break
+            kept[section].remove(hit)
+            dropped += 1
+            payload = _render_payload(meeting, enrichment, kept, _TRIMMED_SNIPPET_CHARS)
+
+    logger.info(
+        "synthesis payload (tokens %s -> %s, budget=%s, hits dropped=%s)",
+        before,
+        _estimate_tokens(payload),
+        budget,
+        dropped,
+    )
+    return payload
+
+
+def _get_agent(steering: SteeringProfileRead, model: str) -> Agent[Any]:
+    agent = _agent_cache.get((steering.version, model))
+    if agent is not None:
+        _stats["agent_cache_hits"] += 1
+        return agent
+
+    _stats["agent_builds"] += 1
+    agent = Agent(
+        name="Meeting Prep Synthesizer",
+        instructions=_build_system_instructions(steering),
+        model=synthesis_model(model),
+        model_settings=ModelSettings(
+            temperature=0.2,
+            # Routes requests sharing this prefix to the same prompt cache.
+            extra_args={"prompt_cache_key": f"meeting-prep-v{steering.version}"},
+        ),
+        output_type=SynthesisResult,
+    )
+    _agent_cache[(steering.version, model)] = agent
+    return agent
+
+
+def _model_name(agent: Agent[Any]) -> str:
+    """The model's name, whether the Agent holds a name or a provider `Model`."""
+    model = agent.model
+    return model if isinstance(model, str) else str(getattr(model, "model", model))
+
+
+def _record_usage(result: Any) -> tuple[int, int]:
+    """Count the run's tokens. Best-effort: bookkeeping never fails a good answer."""
+    _stats["runs"] += 1
+    try:
+        usage = result.context_wrapper.usage
+        input_tokens = usage.input_tokens or 0
+        output_tokens = usage.output_tokens or 0
+        details = getattr(usage, "input_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) or 0
+    except Exception as exc:
+        _stats["usage_errors"] += 1
+        logger.warning("synthesis usage unavailable: %s", exc)
+        return 0, 0
+    _stats["input_tokens"] += input_tokens
+    _stats["cached_input_tokens"] += cached
+    _stats["output_tokens"] += output_tokens
+    logger.info(
+        "synthesis usage (input=%s cached=%s output=%s)",
+        input_tokens,
+        cached,
+        output_tokens,
+    )
+    return input_tokens, output_tokens
+
+
+def _output_settings(agent: Agent[Any]) -> dict[str, Any]:
+    """Model settings that can change the answer. `prompt_cache_key` only routes the
+    request (and names the steering version), so a steering-neutral bump still hits.
+    """
+    settings = agent.model_settings.to_json_dict()
+    extra_args = {
+        k: v for k, v in (settings.get("extra_args") or {}).items() if k != "prompt_cache_key"
     }
-    # Keep it simple: the Agents SDK will handle structured output via output_type.
-    return (
-        "Use the following meeting context + enrichment to produce the structured output.\n\n"
-        f"{data}"
+    return {**settings, "extra_args": extra_args}
+
+
+def _result_cache_key(agent: Agent[Any], payload: str) -> str:
+    """Keyed on the whole ladder, not one model: the cached answer is whatever the
+    ladder settled on, and the live and batch paths share entries.
+    """
+    return synthesis_cache_key(
+        instructions=str(agent.instructions),
+        payload=payload,
+        model=",".join(get_settings().synthesis_model_ladder_list),
+        model_settings=_output_settings(agent),
     )
 
 
+def _partial_from(value: Any) -> PartialSynthesis:
+    partial = PartialSynthesis()
+    if not isinstance(value, dict):
+        return partial
+    for key, model, target in (
+        ("insights", Insight, partial.insights),
+        ("hooks", Hook, partial.hooks),
+    ):
+        for item in value.get(key) or []:
+            try:
+                target.append(model.model_validate(item))
+            except ValueError:
+                continue
+    return partial
+
+
+async def _run_streamed(agent: Agent[Any], payload: str, on_partial: PartialCallback) -> Any:
+    """Run the agent with streaming, reporting each newly completed insight or hook."""
+    result = Runner.run_streamed(agent, payload)
+    parser = PartialJSONParser()
+    seen = (0, 0)
+    async for event in result.stream_events():
+        if event.type != "raw_response_event":
+            continue
+        if getattr(event.data, "type", "") != "response.output_text.delta":
+            continue
+        if not parser.feed(event.data.delta):
+            continue
+        partial = _partial_from(parser.value())
+        counts = (len(partial.insights), len(partial.hooks))
+        if counts != seen:
+            seen = counts
+            await on_partial(partial)
+    return result
+
+
+async def _call_model(
+    agent: Agent[Any], payload: str, on_partial: PartialCallback | None
+) -> Any:
+    """One model call, holding a global concurrency slot, cut off at the per-call timeout."""
+    async with get_synthesis_slots():
+        async with asyncio.timeout(get_settings().SYNTHESIS_CALL_TIMEOUT_SECONDS):
+            if on_partial is not None:
+                return await _run_streamed(agent, payload, on_partial)
+            return await Runner.run(agent, payload)
+
+
+async def _call_hedged(
+    agent: Agent[Any], payload: str, on_partial: PartialCallback | None
+) -> Any:
+    """`_call_model`, raced by an identical call if it is slower than the hedge delay.
+
+    The first successful answer wins and the other call is cancelled. Streamed
+    runs are never hedged: two streams would interleave their partial results.
+    """
+    hedge_after = get_settings().SYNTHESIS_HEDGE_AFTER_SECONDS
+    if on_partial is not None or hedge_after <= 0:
+        return await _call_model(agent, payload, on_partial)
+
+    primary = asyncio.create_task(_call_model(agent, payload, None))
+    pending: set[asyncio.Task[Any]] = {primary}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return primary.result()
+        _stats["hedges"] += 1
+        hedge = asyncio.create_task(_call_model(agent, payload, None))
+        pending.add(hedge)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        _stats["hedge_wins"] += 1
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _call_with_retries(
+    agent: Agent[Any], payload: str, on_partial: PartialCallback | None, deadline: float
+) -> Any:
+    """`_call_hedged`, retrying transient failures with jittered exponential backoff.
+
+    Raises TimeoutError once `deadline` (a `loop.time()` value) passes; a retry
+    whose backoff alone would reach it is not attempted.
+    """
+    policy = get_synthesis_retry_policy()
+    loop = asyncio.get_running_loop()
+    attempt = 0
+    async with asyncio.timeout_at(deadline):
+        while True:
+            try:
+                return await _call_hedged(agent, payload, on_partial)
+            except _TRANSIENT_ERRORS as exc:
+                if isinstance(exc, TimeoutError):
+                    _stats["timeouts"] += 1
+                if attempt >= policy.max_retries:
+                    raise
+                response = getattr(exc, "response", None)
+                retry_after = (
+                    response.headers.get("Retry-After") if response is not None else None
+                )
+                delay = policy.backoff(attempt, parse_retry_after(retry_after))
+                if loop.time() + delay >= deadline:
+                    _stats["deadline_exceeded"] += 1
+                    raise
+                logger.warning(
+                    "synthesis call on %s failed (%s); retry %s in %.2fs",
+                    _model_name(agent),
+                    type(exc).__name__,
+                    attempt + 1,
+                    delay,
+                )
+                _stats["retries"] += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+
+
+async def _run_tier(
+    agent: Agent[Any], payload: str, on_partial: PartialCallback | None, deadline: float
+) -> SynthesisResult:
+    """One attempt on one rung of the ladder, with its latency and tokens recorded."""
+    tier = _tier_stats[_model_name(agent)]
+    tier["runs"] += 1
+    started = time.perf_counter()
+    result = await _call_with_retries(agent, payload, on_partial, deadline)
+    final = result.final_output_as(SynthesisResult)
+    tier["latency_ms"] += round((time.perf_counter() - started) * 1000)
+    input_tokens, output_tokens = _record_usage(result)
+    tier["input_tokens"] += input_tokens
+    tier["output_tokens"] += output_tokens
+    return final
+
+
+def _quality_issues(result: SynthesisResult, enrichment: EnrichmentResult) -> list[str]:
+    """Why `result` should go to the next model up; empty when it is good enough.
+
+    The grounding checks only apply when enrichment found something to ground
+    on, so a meeting without hits can be answered by the cheapest model.
+    """
+    issues: list[str] = []
+    if any(getattr(enrichment, section).results for section in _SECTIONS):
+        if not result.insights:
+            issues.append("no insights")
+        if not any(hook.source.strip() for hook in result.hooks):
+            issues.append("no hook cites a source")
+    words = len(result.pre_meeting_draft.body.split())
+    low, high = _DRAFT_WORDS
+    if not low <= words <= high:
+        issues.append(f"pre-meeting draft is {words} words")
+    return issues
+
+
 def _fallback_result(error: str) -> SynthesisResult:
     """Return a minimal, UI-safe object when synthesis cannot run."""
     return SynthesisResult(
@@ -135,18 +498,39 @@ async def synthesize_meeting_prep(
     role: str,
     attendees: list[dict[str, Any]],
     steering: SteeringProfileRead,
+    force: bool = False,
+    on_partial: PartialCallback | None = None,
 ) -> SynthesisResult:
     """Synthesize meeting prep artifacts using the OpenAI Agents SDK (single-agent).
 
     Returns a structured `SynthesisResult`. This function is "soft-fail": it returns
     a placeholder result with `.error` set if OpenAI isn't configured or if the run fails.
+
+    Successful results are cached under a hash of the instructions, payload, model
+    ladder and model settings (shared with `build_batch_request`), so an identical call is answered without the model;
+    `force=True` skips the lookup (the fresh result still replaces the entry).
+
+    Every model call holds one of `SYNTHESIS_MAX_CONCURRENCY` process-wide slots,
+    is cut off after `SYNTHESIS_CALL_TIMEOUT_SECONDS`, may be hedged (see
+    `_call_hedged`), and is retried on transient errors before giving up. The
+    whole synthesis, all models included, ends at `SYNTHESIS_DEADLINE_SECONDS`.
+
+    Models are tried in `SYNTHESIS_MODEL_LADDER` order, cheapest first; a result
+    that fails the quality checks (or is not valid structured output) escalates
+    to the next model, and the last model's result is kept either way.
+
+    With `on_partial`, the model output is streamed and the callback is awaited
+    each time another insight or hook has been generated in full, well before
+    the email drafts are done. On escalation it is called once with an empty
+    `PartialSynthesis`, since the next model starts over.
     """
     settings = get_settings()
-    if not settings.OPENAI_API_KEY:
+    if not settings.OPENAI_API_KEY and not is_fake():
         logger.warning("OPENAI_API_KEY not configured")
         return _fallback_result("OPENAI_API_KEY not configured")
 
-    instructions = _build_system_instructions(steering)
+    ladder = settings.synthesis_model_ladder_list
+    agent = _get_agent(steering, ladder[0])
     payload = _build_input_payload(
         enrichment=enrichment,
         meeting_title=meeting_title,
@@ -155,20 +539,127 @@ async def synthesize_meeting_prep(
         attendees=attendees,
     )
 
-    agent = Agent(
-        name="Meeting Prep Synthesizer",
-        instructions=instructions,
-        model="gpt-4o",
-        model_settings=ModelSettings(temperature=0.2),
-        output_type=SynthesisResult,
-    )
+    cache_key = _result_cache_key(agent, payload)
+    if not force:
+        cached = await load_synthesis(cache_key)
+        if cached is not None:
+            _stats["result_cache_hits"] += 1
+            return SynthesisResult.model_validate(cached)
+        _stats["result_cache_misses"] += 1
 
+    # One deadline for the whole ladder, so a meeting is never held longer than that.
+    deadline = get_synthesis_retry_policy().new_deadline()
     try:
-        result = await Runner.run(agent, payload)
-        final = result.final_output_as(SynthesisResult)
+        for index, model in enumerate(ladder):
+            last = index == len(ladder) - 1
+            if index:
+                agent = _get_agent(steering, model)
+            try:
+                final = await _run_tier(agent, payload, on_partial, deadline)
+            except ModelBehaviorError as exc:
+                if last:
+                    raise
+                issues = [f"invalid output: {exc}"]
+            else:
+                issues = _quality_issues(final, enrichment)
+                if not issues or last:
+                    break
+            _tier_stats[model]["escalations"] += 1
+            logger.info("synthesis escalating from %s (%s)", model, "; ".join(issues))
+            if on_partial is not None:
+                # The discarded answer's partials must not outlive it.
+                await on_partial(PartialSynthesis())
+        if issues:
+            logger.warning(
+                "synthesis on %s kept despite failed checks (%s)", model, "; ".join(issues)
+            )
+        _tier_stats[model]["accepted"] += 1
+        await store_synthesis(cache_key, model, final.model_dump())
         return final
     except Exception as exc:
         msg = f"Unexpected error: {exc}"
         logger.error(msg)
         return _fallback_result(msg)
 
+
+def build_batch_request(
+    *,
+    enrichment: EnrichmentResult,
+    meeting_title: str,
+    company: str,
+    role: str,
+    attendees: list[dict[str, Any]],
+    steering: SteeringProfileRead,
+) -> tuple[dict[str, Any], str]:
+    """Chat Completions body for one meeting in an offline batch, plus its cache key.
+
+    Same instructions, payload, model and structured-output schema as the
+    interactive path, so a batch result is interchangeable with a live one.
+    """
+    # No second chance offline, so the batch goes straight to the top of the ladder.
+    agent = _get_agent(steering, get_settings().synthesis_model_ladder_list[-1])
+    payload = _build_input_payload(
+        enrichment=enrichment,
+        meeting_title=meeting_title,
+        company=company,
+        role=role,
+        attendees=attendees,
+    )
+    schema = AgentOutputSchema(SynthesisResult)
+    body = {
+        "model": _model_name(agent),
+        "temperature": agent.model_settings.temperature,
+        "messages": [
+            {"role": "system", "content": str(agent.instructions)},
+            {"role": "user", "content": payload},
+        ],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": schema.name(),
+                "schema": schema.json_schema(),
+                "strict": schema.is_strict_json_schema(),
+            },
+        },
+    }
+    return body, _result_cache_key(agent, payload)
+
+
+def parse_batch_response(body: dict[str, Any]) -> SynthesisResult:
+    """Turn one Chat Completions response body from a batch into a `SynthesisResult`."""
+    usage = body.get("usage") or {}
+    cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+    _stats["batch_results"] += 1
+    _stats["input_tokens"] += usage.get("prompt_tokens") or 0
+    _stats["cached_input_tokens"] += cached
+    _stats["output_tokens"] += usage.get("completion_tokens") or 0
+    content = body["choices"][0]["message"]["content"]
+    return SynthesisResult.model_validate_json(content)
+
+
+def invalidate_agent_cache() -> None:
+    """Drop cached Agents; call whenever a new steering version is written."""
+    _agent_cache.clear()
+
+
+def get_synthesis_stats() -> dict[str, int]:
+    """Agent cache hits/builds and token usage (including cached prefix tokens)."""
+    return {"cached_agents": len(_agent_cache), **_stats}
+
+
+def get_synthesis_tier_stats() -> dict[str, dict[str, float]]:
+    """Per-model runs, escalation rate, mean latency and token usage for the ladder."""
+    snapshot: dict[str, dict[str, float]] = {}
+    for model, counts in _tier_stats.items():
+        runs = counts["runs"]
+        snapshot[model] = {
+            **counts,
+            "escalation_rate": counts["escalations"] / runs if runs else 0.0,
+            "mean_latency_ms": counts["latency_ms"] / runs if runs else 0.0,
+        }
+    return snapshot
+
+
+def reset_synthesis_stats() -> None:
+    _stats.clear()
+    _tier_stats.clear()
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from openai import AsyncOpenAI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal
+from app.models import (
+    Meeting,
+    MeetingStatus,
+    PipelineStage,
+    SynthesisBatch,
+    SynthesisBatchItem,
+)
+from app.services.checkpoints import save_checkpoint
+from app.services.events import get_event_broker
+from app.services.providers import openai_client
+from app.services.synthesis import SynthesisResult, parse_batch_response
+from app.services.synthesis_cache import store_synthesis
+
+logger = logging.getLogger(__name__)
+
+_ENDPOINT = "/v1/chat/completions"
+# Batch states after which the batch will not change any more.
+_TERMINAL = {"completed", "failed", "expired", "cancelled"}
+
+# ---------------------------------------------------------------------------
+# Return types
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class BatchRequest:
+    """One meeting's deferred synthesis, as queued by the pipeline."""
+
+    meeting_id: int
+    input_hash: str
+    cache_key: str
+    body: dict[str, Any]
+
+    @property
+    def custom_id(self) -> str:
+        return f"meeting-{self.meeting_id}-{self.input_hash[:16]}"
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+def _openai_client() -> AsyncOpenAI:
+    return openai_client()
+
+
+def _to_jsonl(requests: list[BatchRequest]) -> bytes:
+    lines = [
+        json.dumps(
+            {"custom_id": r.custom_id, "method": "POST", "url": _ENDPOINT, "body": r.body},
+            separators=(",", ":"),
+        )
+        for r in requests
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def _release(meeting_ids: list[int], error: str) -> None:
+    """Hand meetings whose batch failed back to the pipeline (sync path next time)."""
+    async with SessionLocal() as db:
+        for meeting_id in meeting_ids:
+            meeting = await db.get(Meeting, meeting_id)
+            if meeting is not None and meeting.status == MeetingStatus.Enriched:
+                meeting.status = MeetingStatus.New
+                meeting.error_message = error
+        await db.commit()
+
+
+async def _apply_result(item: Any, synthesis: SynthesisResult) -> None:
+    async with SessionLocal() as db:
+        meeting = await db.get(Meeting, item.meeting_id)
+        # A meeting cancelled on the calendar while its batch ran stays cancelled.
+        if meeting is None or meeting.status == MeetingStatus.Cancelled:
+            return
+        meeting.insights = [i.model_dump() for i in synthesis.insights]
+        meeting.hooks = [h.model_dump() for h in synthesis.hooks]
+        meeting.competitors = [c.model_dump() for c in synthesis.competitors]
+        meeting.error_message = None
+        # Back to New: the next pipeline run finds the enrich + synthesize
+        # checkpoints and only runs the sync stage.
+        meeting.status = MeetingStatus.New
+        await save_checkpoint(
+            db, meeting.id, PipelineStage.Synthesize, item.input_hash, synthesis.model_dump()
+        )
+        await db.commit()
+    get_event_broker().publish(
+        item.meeting_id,
+        "synthesis",
+        {"insights": meeting.insights, "hooks": meeting.hooks, "competitors": meeting.competitors},
+    )
+    await store_synthesis(item.cache_key, "batch", synthesis.model_dump())
+
+
+async def _collect_results(
+    client: AsyncOpenAI, output_file_id: str | None, items: dict[str, Any]
+) -> dict[str, tuple[str, str | None]]:
+    """Apply each successful line of the output file. Returns custom_id -> (status, error)."""
+    outcomes: dict[str, tuple[str, str | None]] = {}
+    if not output_file_id:
+        return outcomes
+    content = await client.files.content(output_file_id)
+    for line in content.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        item = items.get(record.get("custom_id", ""))
+        if item is None:
+            continue
+        response = record.get("response") or {}
+        try:
+            if response.get("status_code") != 200:
+                raise ValueError(
+                    record.get("error") or f"status {response.get('status_code')}"
+                )
+            synthesis = parse_batch_response(response["body"])
+        except Exception as exc:
+            outcomes[item.custom_id] = ("failed", str(exc))
+            continue
+        await _apply_result(item, synthesis)
+        outcomes[item.custom_id] = ("applied", None)
+    return outcomes
+
+
+async def _finish_batch(client: AsyncOpenAI, batch_id: str, remote: Any) -> int:
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(
+                SynthesisBatchItem.custom_id,
+                SynthesisBatchItem.meeting_id,
+                SynthesisBatchItem.input_hash,
+                SynthesisBatchItem.cache_key,
+            ).where(
+                SynthesisBatchItem.batch_id == batch_id,
+                SynthesisBatchItem.status == "pending",
+            )
+        )
+        items = {row.custom_id: row for row in result.all()}
+
+    outcomes = await _collect_results(client, remote.output_file_id, items)
+    # Anything without a usable result (error file, expiry, cancellation) goes
+    # back through the interactive path on the next run.
+    for custom_id in items:
+        outcomes.setdefault(custom_id, ("failed", f"Batch {remote.status}"))
+    failed = [
+        items[custom_id].meeting_id
+        for custom_id, (status, _error) in outcomes.items()
+        if status == "failed"
+    ]
+
+    async with SessionLocal() as db:
+        for custom_id, (status, error) in outcomes.items():
+            item = await db.get(SynthesisBatchItem, (batch_id, custom_id))
+            if item is not None:
+                item.status, item.error = status, error
+        batch = await db.get(SynthesisBatch, batch_id)
+        if batch is not None:
+            batch.status = remote.status
+            batch.output_file_id = remote.output_file_id
+            batch.error_file_id = remote.error_file_id
+            batch.completed_at = datetime.utcnow()
+        await db.commit()
+    if failed:
+        await _release(
+            failed, f"Batch synthesis failed ({remote.status}); retrying interactively"
+        )
+    logger.info(
+        "synthesis batch %s %s (applied=%s failed=%s)",
+        batch_id,
+        remote.status,
+        len(outcomes) - len(failed),
+        len(failed),
+    )
+    return len(outcomes) - len(failed)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+async def submit_synthesis_batch(
+    requests: list[BatchRequest], *, client: AsyncOpenAI | None = None
+) -> str | None:
+    """Upload `requests` as one Batch API job and record it. Returns the batch id.
+
+    Soft-fail: if the upload or batch creation fails, the meetings are handed
+    back to the pipeline and None is returned.
+    """
+    if not requests:
+        return None
+    client = client or _openai_client()
+    batch = None
+    try:
+        upload = await client.files.create(
+            file=("synthesis.jsonl", _to_jsonl(requests)), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=upload.id,
+            endpoint=_ENDPOINT,
+            completion_window="24h",
+            metadata={"kind": "meeting-prep-synthesis"},
+        )
+        async with SessionLocal() as db:
+            db.add(
+                SynthesisBatch(
+                    id=batch.id,
+                    status=batch.status,
+                    input_file_id=upload.id,
+                    request_count=len(requests),
+                )
+            )
+            db.add_all(
+                SynthesisBatchItem(
+                    custom_id=r.custom_id,
+                    batch_id=batch.id,
+                    meeting_id=r.meeting_id,
+                    input_hash=r.input_hash,
+                    cache_key=r.cache_key,
+                )
+                for r in requests
+            )
+            await db.commit()
+    except Exception as exc:
+        logger.error("batch submission failed: %s", exc)
+        if batch is not None:
+            # Unrecorded, its results could never be applied: don't pay for it.
+            try:
+                await client.batches.cancel(batch.id)
+            except Exception as cancel_exc:
+                logger.warning("could not cancel batch %s: %s", batch.id, cancel_exc)
+        await _release([r.meeting_id for r in requests], f"Batch submission failed: {exc}")
+        return None
+
+    logger.info("submitted synthesis batch %s (%s meetings)", batch.id, len(requests))
+    return batch.id
+
+
+async def poll_synthesis_batches(*, client: AsyncOpenAI | None = None) -> int:
+    """Refresh every open batch and apply finished results. Returns meetings applied."""
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(SynthesisBatch.id).where(SynthesisBatch.status.not_in(_TERMINAL))
+        )
+        batch_ids = list(result.scalars().all())
+    if not batch_ids:
+        return 0
+
+    client = client or _openai_client()
+    applied = 0
+    for batch_id in batch_ids:
+        try:
+            remote = await client.batches.retrieve(batch_id)
+            if remote.status in _TERMINAL:
+                applied += await _finish_batch(client, batch_id, remote)
+                continue
+        except Exception as exc:
+            logger.warning("batch %s poll failed: %s", batch_id, exc)
+            continue
+        async with SessionLocal() as db:
+            batch = await db.get(SynthesisBatch, batch_id)
+            if batch is not None:
+                batch.status = remote.status
+                await db.commit()
+    return applied
+
+
+async def pending_in_batch(db: AsyncSession, meeting_id: int, input_hash: str) -> bool:
+    """Whether these exact synthesis inputs are already waiting in an open batch."""
+    result = await db.execute(
+        select(SynthesisBatchItem.custom_id).where(
+            SynthesisBatchItem.meeting_id == meeting_id,
+            SynthesisBatchItem.input_hash == input_hash,
+            SynthesisBatchItem.status == "pending",
+        )
+    )
+    return result.first() is not None
+
+
+async def failed_in_batch(db: AsyncSession, meeting_id: int, input_hash: str) -> bool:
+    """Whether these exact synthesis inputs already failed in a batch."""
+    result = await db.execute(
+        select(SynthesisBatchItem.custom_id).where(
+            SynthesisBatchItem.meeting_id == meeting_id,
+            SynthesisBatchItem.input_hash == input_hash,
+            SynthesisBatchItem.status == "failed",
+        )
+    )
+    return result.first() is not None
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import SynthesisCacheEntry
+from app.services.checkpoints import stable_hash
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+
+async def _evict(session: AsyncSession, max_bytes: int) -> int:
+    """Delete least-recently-used entries until the table fits in `max_bytes`."""
+    result = await session.execute(
+        select(func.coalesce(func.sum(SynthesisCacheEntry.size_bytes), 0))
+    )
+    total = result.scalar_one()
+    if total <= max_bytes:
+        return 0
+
+    result = await session.execute(
+        select(SynthesisCacheEntry.key, SynthesisCacheEntry.size_bytes).order_by(
+            SynthesisCacheEntry.last_used_at
+        )
+    )
+    victims: list[str] = []
+    for key, size in result.all():
+        if total <= max_bytes:
+            break
+        victims.append(key)
+        total -= size
+    await session.execute(
+        delete(SynthesisCacheEntry).where(SynthesisCacheEntry.key.in_(victims))
+    )
+    return len(victims)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def synthesis_cache_key(
+    *, instructions: str, payload: str, model: str, model_settings: dict[str, Any]
+) -> str:
+    return stable_hash(
+        {
+            "instructions": instructions,
+            "payload": payload,
+            "model": model,
+            "model_settings": model_settings,
+        }
+    )
+
+
+async def load_synthesis(key: str) -> dict[str, Any] | None:
+    """Cached synthesis output for `key`, or None. Never raises."""
+    if not get_settings().SYNTHESIS_CACHE_ENABLED:
+        return None
+    try:
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(SynthesisCacheEntry.result).where(SynthesisCacheEntry.key == key)
+            )
+            cached = result.scalar_one_or_none()
+            if cached is not None:
+                await session.execute(
+                    update(SynthesisCacheEntry)
+                    .where(SynthesisCacheEntry.key == key)
+                    .values(last_used_at=datetime.utcnow())
+                )
+                await session.commit()
+    except Exception as exc:
+        logger.warning("synthesis cache read failed: %s", exc)
+        return None
+    return cached
+
+
+async def store_synthesis(key: str, model: str, result: dict[str, Any]) -> None:
+    """Store a successful synthesis, then evict down to `SYNTHESIS_CACHE_MAX_BYTES`."""
+    settings = get_settings()
+    if not settings.SYNTHESIS_CACHE_ENABLED:
+        return
+    now = datetime.utcnow()
+    size = len(json.dumps(result, separators=(",", ":")).encode("utf-8"))
+    try:
+        async with SessionLocal() as session:
+            stmt = sqlite_insert(SynthesisCacheEntry).values(
+                key=key,
+                model=model,
+                result=result,
+                size_bytes=size,
+                created_at=now,
+                last_used_at=now,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SynthesisCacheEntry.key],
+                set_={"result": result, "size_bytes": size, "last_used_at": now},
+            )
+            await session.execute(stmt)
+            evicted = await _evict(session, settings.SYNTHESIS_CACHE_MAX_BYTES)
+            await session.commit()
+    except Exception as exc:
+        logger.warning("synthesis cache write failed: %s", exc)
+        return
+    if evicted:
+        logger.info("synthesis cache evicted %s entries", evicted)
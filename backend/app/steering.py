@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import SteeringProfile
 from app.schemas import SteeringProfileRead, SteeringProfileUpdate
+from app.services.synthesis import invalidate_agent_cache
 
 
 def _model_to_schema(model: SteeringProfile) -> SteeringProfileRead:
@@ -68,6 +69,7 @@ async def create_updated_profile(
     db.add(new_profile)
     await db.commit()
     await db.refresh(new_profile)
+    invalidate_agent_cache()
     return _model_to_schema(new_profile)
 
 
@@ -139,4 +141,5 @@ async def apply_feedback(
     db.add(new_profile)
     await db.commit()
     await db.refresh(new_profile)
+    invalidate_agent_cache()
     return _model_to_schema(new_profile)
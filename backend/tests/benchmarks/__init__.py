@@ -0,0 +1 @@
+"""Opt-in benchmarks. Not collected by pytest; run them as modules from `backend/`."""
@@ -0,0 +1,119 @@
+"""Calendar upsert cost: the per-event SELECT loop vs. the set-based bulk upsert.
+
+Writes N parsed events in pages of CALENDAR_PAGE_SIZE (one commit per page)
+to a scratch SQLite database, first into an empty table (every event new) and
+then again (every event known, as on a re-poll).
+
+Usage (from `backend/`):
+    python -m tests.benchmarks.bench_calendar_upsert --events 1000 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+os.environ["DATABASE_URL"] = (
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.fakes.composio import FakeCalendar  # noqa: E402
+from app.models import Meeting, MeetingStatus  # noqa: E402
+from app.services.calendar_poller import (  # noqa: E402
+    _infer_company_from_attendees,
+    _parse_datetime,
+    _upsert_meetings,
+    parse_event,
+)
+
+Writer = Callable[[AsyncSession, list[dict[str, Any]]], Awaitable[int]]
+
+
+async def _legacy_insert(db: AsyncSession, events: list[dict[str, Any]]) -> int:
+    """The pre-bulk behaviour: one SELECT per event, inserts only."""
+    new_meetings = 0
+    for parsed in events:
+        calendar_event_id = parsed.get("calendar_event_id")
+        if not calendar_event_id:
+            continue
+        existing = await db.execute(
+            select(Meeting).where(Meeting.calendar_event_id == calendar_event_id)
+        )
+        if existing.scalar_one_or_none():
+            continue
+        attendees = parsed.get("attendees") or []
+        db.add(
+            Meeting(
+                calendar_event_id=calendar_event_id,
+                title=parsed.get("title") or "",
+                datetime_utc=_parse_datetime(parsed.get("start_time")),
+                attendees=attendees,
+                company=_infer_company_from_attendees(attendees),
+                role="Unknown",
+                status=MeetingStatus.New,
+            )
+        )
+        new_meetings += 1
+    return new_meetings
+
+
+def _events(count: int) -> list[dict[str, Any]]:
+    calendar = FakeCalendar(size=count)
+    items = calendar.list_events({"maxResults": count})["data"]["items"]
+    return [parse_event(item) for item in items]
+
+
+async def _write(writer: Writer, pages: list[list[dict[str, Any]]]) -> tuple[float, int]:
+    started = time.perf_counter()
+    written = 0
+    async with SessionLocal() as db:
+        for page in pages:
+            written += await writer(db, page)
+            await db.commit()
+    return time.perf_counter() - started, written
+
+
+async def _bench(count: int) -> None:
+    events = _events(count)
+    size = get_settings().CALENDAR_PAGE_SIZE
+    pages = [events[i : i + size] for i in range(0, len(events), size)]
+    print(f"\n{count} events, {len(pages)} pages of {size}")
+    for name, writer in (("per-event loop", _legacy_insert), ("bulk upsert", _upsert_meetings)):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        first, new = await _write(writer, pages)
+        again, _ = await _write(writer, pages)
+        print(
+            f"  {name:<15} first poll {first * 1000:9.1f}ms ({new} new)  "
+            f"re-poll {again * 1000:9.1f}ms  ({count / first:,.0f} events/s first)"
+        )
+
+
+async def _main(sizes: list[int]) -> None:
+    try:
+        for count in sizes:
+            await _bench(count)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+    asyncio.run(_main(args.events))
+
+
+if __name__ == "__main__":
+    main()
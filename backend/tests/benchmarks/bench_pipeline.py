@@ -0,0 +1,253 @@
+"""End-to-end pipeline benchmark against the fake providers, with per-stage latency.
+
+Each size runs in a fresh process with a scratch SQLite database: the fake
+calendar is polled for N meetings, then `run_pipeline_for_new_meetings`
+processes them. Reports throughput, p50/p95/p99 per stage (poll, enrich,
+synthesize, notion, gmail, db_commit) and peak RSS, and writes them as JSON.
+With `--baseline`, the run is compared to an earlier file and the exit code
+is 1 if throughput or any stage p95 regressed by more than `--tolerance`.
+A size where any meeting ended in Error (or was not processed) only times
+the failure path: it is marked invalid, never compared, and the exit code is 2.
+
+Usage (from `backend/`):
+    python -m tests.benchmarks.bench_pipeline --meetings 10 100 1000 --output bench.json
+    python -m tests.benchmarks.bench_pipeline --baseline bench.json --output bench-new.json
+
+Provider latency and faults come from the `FAKE_*` settings (e.g.
+`FAKE_OPENAI_LATENCY_MS=1500,6000`); `--mode fake-http` targets a running
+`uvicorn app.fakes.providers:app --port 8765` instead of the in-process fakes
+(start it with `FAKE_CALENDAR_EVENTS=N` to match the size).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+_STAGES = ("poll", "enrich", "synthesize", "notion", "gmail", "db_commit")
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(q * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def _summarize(samples: list[float]) -> dict[str, float]:
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "count": len(ms),
+        "total_ms": round(sum(ms), 2),
+        "p50_ms": round(_percentile(ms, 0.50), 2),
+        "p95_ms": round(_percentile(ms, 0.95), 2),
+        "p99_ms": round(_percentile(ms, 0.99), 2),
+        "max_ms": round(ms[-1], 2) if ms else 0.0,
+    }
+
+
+class _Timings:
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def wrap(
+        self, stage: str, fn: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(fn)
+        async def _timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                self.samples[stage].append(time.perf_counter() - started)
+
+        return _timed
+
+
+# ---------------------------------------------------------------------------
+# One size (runs in its own process)
+# ---------------------------------------------------------------------------
+
+
+async def _bench(meetings: int) -> dict[str, Any]:
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.database import SessionLocal, engine, init_db
+    from app.models import Meeting
+    from app.services import pipeline
+    from app.services.http_clients import close_http_clients, open_http_clients
+
+    timings = _Timings()
+    pipeline.poll_and_upsert = timings.wrap("poll", pipeline.poll_and_upsert)
+    pipeline.enrich_meeting = timings.wrap("enrich", pipeline.enrich_meeting)
+    pipeline.synthesize_meeting_prep = timings.wrap(
+        "synthesize", pipeline.synthesize_meeting_prep
+    )
+    pipeline.upsert_notion_row = timings.wrap("notion", pipeline.upsert_notion_row)
+    pipeline.create_drafts = timings.wrap("gmail", pipeline.create_drafts)
+    AsyncSession.commit = timings.wrap("db_commit", AsyncSession.commit)  # type: ignore[method-assign]
+
+    await init_db()
+    await open_http_clients()
+    try:
+        started = time.perf_counter()
+        processed = await pipeline.run_pipeline_for_new_meetings()
+        wall = time.perf_counter() - started
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(Meeting.status, func.count()).group_by(Meeting.status)
+            )
+            by_status = dict(result.all())
+    finally:
+        await close_http_clients()
+        await engine.dispose()
+
+    return {
+        "meetings": meetings,
+        "processed": processed,
+        "statuses": {status.value: count for status, count in by_status.items()},
+        "wall_seconds": round(wall, 3),
+        "throughput_per_second": round(processed / wall, 3) if wall else 0.0,
+        # Linux reports ru_maxrss in KiB.
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": {stage: _summarize(timings.samples.get(stage, [])) for stage in _STAGES},
+        "pipeline_stages": pipeline.get_pipeline_stats()["stages"],
+    }
+
+
+def _run_size(meetings: int, mode: str) -> dict[str, Any]:
+    """Process entry point: configure a scratch environment, then benchmark."""
+    scratch = tempfile.mkdtemp(prefix="bench-pipeline-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{scratch}/bench.db"
+    os.environ["PROVIDER_MODE"] = mode
+    # The first poll is a full sync of the fake calendar: it seeds the N meetings.
+    os.environ["FAKE_CALENDAR_EVENTS"] = str(meetings)
+    os.environ.setdefault("SYNTHESIS_BATCH_ENABLED", "false")
+    return asyncio.run(_bench(meetings))
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _invalid_reason(run: dict[str, Any]) -> str | None:
+    if run["statuses"].get("Error"):
+        return f"{run['statuses']['Error']} meetings ended in Error"
+    if run["processed"] < run["meetings"]:
+        return f"only {run['processed']} of {run['meetings']} meetings processed"
+    return None
+
+
+def _print_run(run: dict[str, Any]) -> None:
+    print(
+        f"\nN={run['meetings']}: processed={run['processed']} wall={run['wall_seconds']}s "
+        f"throughput={run['throughput_per_second']}/s peak_rss={run['peak_rss_mb']}MB "
+        f"statuses={run['statuses']}"
+    )
+    for stage, row in run["stages"].items():
+        print(
+            f"  {stage:<11} n={row['count']:<6} p50={row['p50_ms']:9.2f}ms "
+            f"p95={row['p95_ms']:9.2f}ms p99={row['p99_ms']:9.2f}ms"
+        )
+    if run["invalid_reason"]:
+        print(f"  INVALID: {run['invalid_reason']}")
+
+
+def _compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Regressions beyond `tolerance` (a fraction) for every size present in both."""
+    regressions: list[str] = []
+    for size, run in current["runs"].items():
+        before = baseline.get("runs", {}).get(size)
+        if before is None or run["invalid_reason"] or before.get("invalid_reason"):
+            continue
+        old, new = before["throughput_per_second"], run["throughput_per_second"]
+        if old and new < old * (1 - tolerance):
+            regressions.append(f"N={size} throughput {old}/s -> {new}/s")
+        for stage, row in run["stages"].items():
+            old_p95 = before["stages"].get(stage, {}).get("p95_ms", 0.0)
+            if old_p95 and row["p95_ms"] > old_p95 * (1 + tolerance):
+                regressions.append(f"N={size} {stage} p95 {old_p95}ms -> {row['p95_ms']}ms")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meetings", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--mode", choices=("fake", "fake-http"), default="fake")
+    parser.add_argument("--output", type=Path, default=Path("bench-pipeline.json"))
+    parser.add_argument("--baseline", type=Path, help="earlier output to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed regression (0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+
+    runs: dict[str, Any] = {}
+    for meetings in args.meetings:
+        # A fresh process per size: clean module state and a meaningful peak RSS.
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            run = pool.submit(_run_size, meetings, args.mode).result()
+        run["invalid_reason"] = _invalid_reason(run)
+        _print_run(run)
+        runs[str(meetings)] = run
+
+    report = {
+        "created_at": datetime.now(tz=timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "provider_mode": args.mode,
+        "fake_settings": {k: v for k, v in sorted(os.environ.items()) if k.startswith("FAKE_")},
+        "runs": runs,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nwrote {args.output}")
+
+    invalid = [size for size, run in runs.items() if run["invalid_reason"]]
+    if args.baseline:
+        regressions = _compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        if not invalid:
+            print(f"no regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    if invalid:
+        print(f"INVALID runs (not comparable): N={', '.join(invalid)}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Per-meeting You.com latency: client-per-query vs. the shared pooled client.
+
+Usage (from `backend/`):
+    python -m tests.benchmarks.bench_youcom_client --meetings 30 --connect-delay-ms 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+os.environ.setdefault("YOUCOM_API_KEY", "bench")
+# Only the HTTP client is measured: the process-wide rate limiter is opened up,
+# and nothing touches a database next to the repo.
+os.environ["YOUCOM_RATE_LIMIT_PER_SEC"] = "1000000"
+os.environ["YOUCOM_RATE_LIMIT_BURST"] = "1000000"
+os.environ["DATABASE_URL"] = (
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from app.services import enrichment  # noqa: E402
+from app.services.http_clients import close_http_clients  # noqa: E402
+from tests.benchmarks.youcom_stub import StubYoucomServer  # noqa: E402
+
+_QUERIES = ("company news", "role pains", "competitors")
+
+
+async def _legacy_search(query: str) -> None:
+    """The pre-pooling behaviour: a fresh AsyncClient (and connection) per query."""
+    async with httpx.AsyncClient(timeout=15.0) as client:
+        resp = await client.get(
+            enrichment.youcom_search_url(),
+            params={"query": query, "count": 5, "freshness": "month"},
+            headers={"X-API-Key": "bench"},
+        )
+        resp.raise_for_status()
+
+
+async def _shared_search(query: str) -> None:
+    # The upstream request itself, without the search cache or single-flight in front.
+    outcome = await enrichment._fetch_youcom(query, 5, "month", "bench")
+    if outcome.error:
+        raise RuntimeError(outcome.error)
+
+
+async def _run_meetings(
+    search: Callable[[str], Awaitable[None]], meetings: int
+) -> list[float]:
+    """Meetings run back to back; each fires its three searches in parallel."""
+    latencies: list[float] = []
+    for i in range(meetings):
+        started = time.perf_counter()
+        await asyncio.gather(*(search(f"{q} {i}") for q in _QUERIES))
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _summary(label: str, latencies: list[float], connections: int) -> dict[str, float]:
+    ms = sorted(x * 1000 for x in latencies)
+    row = {
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": ms[len(ms) // 2],
+        "p95_ms": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+        "connections": connections,
+    }
+    print(
+        f"{label:<8} mean={row['mean_ms']:7.2f}ms  p50={row['p50_ms']:7.2f}ms  "
+        f"p95={row['p95_ms']:7.2f}ms  connections={connections}"
+    )
+    return row
+
+
+async def _main(meetings: int, connect_delay: float, response_delay: float) -> None:
+    results = {}
+    for label, search in (("legacy", _legacy_search), ("shared", _shared_search)):
+        async with StubYoucomServer(
+            connect_delay=connect_delay, response_delay=response_delay
+        ) as server:
+            enrichment.youcom_search_url = lambda: server.url
+            latencies = await _run_meetings(search, meetings)
+            await close_http_clients()
+            results[label] = _summary(label, latencies, server.connections)
+
+    saved = results["legacy"]["mean_ms"] - results["shared"]["mean_ms"]
+    print(f"saved per meeting: {saved:.2f}ms (mean)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meetings", type=int, default=30)
+    parser.add_argument(
+        "--connect-delay-ms",
+        type=float,
+        default=30.0,
+        help="simulated TCP+TLS setup cost per new connection",
+    )
+    parser.add_argument("--response-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(
+        _main(args.meetings, args.connect_delay_ms / 1000, args.response_delay_ms / 1000)
+    )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from tests.conftest import youcom_success_response
+
+
+class StubYoucomServer:
+    """Minimal keep-alive HTTP/1.1 server that answers like the You.com search API.
+
+    `connect_delay` is charged once per new connection and stands in for the
+    TCP + TLS handshake round-trips to `ydc-index.io` (localhost has neither).
+    `response_delay` is charged per request.
+    """
+
+    def __init__(self, *, connect_delay: float = 0.03, response_delay: float = 0.005) -> None:
+        self.connect_delay = connect_delay
+        self.response_delay = response_delay
+        self.connections = 0
+        self.requests = 0
+        self.url = ""
+        self._server: asyncio.AbstractServer | None = None
+        self._body = json.dumps(youcom_success_response(web_hits=3, news_hits=2)).encode()
+
+    async def __aenter__(self) -> StubYoucomServer:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/v1/search"
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.connect_delay)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                self.requests += 1
+                await asyncio.sleep(self.response_delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(self._body)}\r\n".encode()
+                    + b"Connection: keep-alive\r\n\r\n"
+                    + self._body
+                )
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
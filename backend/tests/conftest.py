@@ -1,10 +1,31 @@
 from __future__ import annotations
 
+import os
+import tempfile
 from datetime import datetime
 
+# Point the app at a scratch SQLite file before anything imports `app.database`.
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}",
+)
+
+import httpx
 import pytest
+import pytest_asyncio
+from openai import AsyncOpenAI
 
+from app.database import Base, SessionLocal, engine, init_db
+from app.fakes.openai_batch import create_app as create_fake_openai_batch
 from app.schemas import SteeringProfileRead
+from app.services import synthesis_batch
+from app.services.calendar_push import reset_sync_debouncer
+from app.services.enrichment import get_youcom_flights
+from app.services.http_clients import close_http_clients
+from app.services.providers import reset_fake_providers
+from app.services.rate_limit import reset_synthesis_slots, reset_youcom_limiter
+from app.services.search_cache import get_search_cache
+from app.services.synthesis import invalidate_agent_cache, reset_synthesis_stats
 
 
 @pytest.fixture
@@ -25,6 +46,77 @@ def sample_steering() -> SteeringProfileRead:
     )
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def _reset_shared_state(monkeypatch):
+    """Process-wide clients and caches must not leak between tests.
+
+    The search and synthesis caches are off unless a test opts in, so tests
+    always reach the (mocked) upstream, and retry backoff is instant.
+    """
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+    monkeypatch.setenv("SYNTHESIS_CACHE_ENABLED", "false")
+    monkeypatch.setenv("YOUCOM_BACKOFF_BASE_SECONDS", "0")
+    monkeypatch.setenv("SYNTHESIS_BACKOFF_BASE_SECONDS", "0")
+    yield
+    reset_youcom_limiter()
+    reset_synthesis_slots()
+    reset_fake_providers()
+    reset_sync_debouncer()
+    get_youcom_flights().reset()
+    await get_search_cache().reset()
+    await close_http_clients()
+    invalidate_agent_cache()
+    reset_synthesis_stats()
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Fresh schema per test; yields a session on the scratch database."""
+    await init_db()
+    async with SessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def fake_mode(monkeypatch):
+    """Every provider served in-process, with no latency and no injected faults."""
+    monkeypatch.setenv("PROVIDER_MODE", "fake")
+    for provider in ("YOUCOM", "OPENAI", "COMPOSIO"):
+        monkeypatch.setenv(f"FAKE_{provider}_LATENCY_MS", "0,0")
+    for key in ("OPENAI_API_KEY", "YOUCOM_API_KEY", "COMPOSIO_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    reset_fake_providers()
+    yield
+    reset_fake_providers()
+
+
+@pytest_asyncio.fixture
+async def fake_openai_batch(monkeypatch):
+    """Batch mode on, with the OpenAI client served in-process by `app.fakes`."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("SYNTHESIS_BATCH_ENABLED", "true")
+    fake = create_fake_openai_batch()
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake))
+    client = AsyncOpenAI(
+        api_key="test-key", base_url="http://fake-openai/v1", http_client=http_client
+    )
+    monkeypatch.setattr(synthesis_batch, "_openai_client", lambda: client)
+    yield fake
+    await http_client.aclose()
+
+
+YOUCOM_SEARCH_URL = "https://ydc-index.io/v1/search"
+
+
+@pytest.fixture
+def youcom_key(monkeypatch):
+    """Configure a You.com key, for tests that mock `YOUCOM_SEARCH_URL` with respx."""
+    monkeypatch.setenv("YOUCOM_API_KEY", "test-key")
+
+
 def youcom_web_hit(
     title: str = "Test Article",
     url: str = "https://example.com/article",
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app.fakes.calendar_push import FakePushSender
+from app.models import CalendarChannel
+from app.routers import trigger
+from app.routers.calendar import router as calendar_router
+from app.services import calendar_push
+from app.services.calendar_push import ensure_channel
+from app.services.debounce import Debouncer
+from app.services.providers import get_fake_providers_app
+
+_WEBHOOK_URL = "http://backend/calendar/webhook"
+
+
+def _fake_calendar():
+    return get_fake_providers_app().state.fakes["composio"].state.calendar
+
+
+@pytest.fixture
+def push_on(fake_mode, monkeypatch):
+    monkeypatch.setenv("CALENDAR_WEBHOOK_URL", _WEBHOOK_URL)
+
+
+@pytest_asyncio.fixture
+async def synced(monkeypatch):
+    """Replace the debounced sync with a recorder; returns the calendar ids synced."""
+    calls: list[str] = []
+
+    async def _record(calendar_id: str) -> None:
+        calls.append(calendar_id)
+
+    monkeypatch.setattr(calendar_push, "_debouncer", Debouncer(_record, delay=0.05))
+    return calls
+
+
+class TestDebouncer:
+    @pytest.mark.asyncio
+    async def test_a_burst_runs_once_and_a_trigger_mid_run_runs_again(self):
+        calls: list[str] = []
+        gate = asyncio.Event()
+
+        async def _fn(key: str) -> None:
+            calls.append(key)
+            await gate.wait()
+
+        debouncer = Debouncer(_fn, delay=0.01)
+        started = [debouncer.trigger("primary") for _ in range(5)]
+        await asyncio.sleep(0.05)
+        debouncer.trigger("primary")  # arrives while the first call runs
+        gate.set()
+        await debouncer.drain()
+
+        assert started == [True, False, False, False, False]
+        assert calls == ["primary", "primary"]
+        assert debouncer.snapshot() == {"scheduled": 0, "triggers": 6, "coalesced": 5, "calls": 2}
+
+
+class TestChannels:
+    @pytest.mark.asyncio
+    async def test_channel_is_opened_once_and_renewed_before_expiry(self, push_on, db_session):
+        first = await ensure_channel(db_session)
+        again = await ensure_channel(db_session)
+        assert first is not None and again.id == first.id
+        assert set(_fake_calendar().channels) == {first.id}
+        assert _fake_calendar().channels[first.id]["address"] == _WEBHOOK_URL
+
+        first.expires_at = datetime.utcnow() + timedelta(hours=2)
+        await db_session.commit()
+        renewed = await ensure_channel(db_session)
+
+        assert renewed.id != first.id and renewed.token != first.token
+        assert set(_fake_calendar().channels) == {renewed.id}
+        assert await db_session.get(CalendarChannel, first.id) is None
+
+    @pytest.mark.asyncio
+    async def test_no_channel_without_a_webhook_url(self, fake_mode, db_session):
+        assert await ensure_channel(db_session) is None
+
+
+class TestWebhook:
+    @pytest.mark.asyncio
+    async def test_notification_burst_triggers_one_sync(self, push_on, synced, db_session):
+        await ensure_channel(db_session)
+        app = FastAPI()
+        app.include_router(calendar_router)
+        sender = FakePushSender(_fake_calendar(), transport=httpx.ASGITransport(app=app))
+
+        assert await sender.notify(state="sync") == [200]
+        assert await sender.notify(repeat=5) == [200] * 5
+        await calendar_push.get_sync_debouncer().drain()
+
+        assert synced == ["primary"]
+
+    @pytest.mark.asyncio
+    async def test_bad_tokens_and_unknown_channels_are_rejected(
+        self, push_on, synced, db_session
+    ):
+        channel = await ensure_channel(db_session)
+        app = FastAPI()
+        app.include_router(calendar_router)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://backend"
+        ) as client:
+            forged = await client.post(
+                "/calendar/webhook",
+                headers={
+                    "X-Goog-Channel-ID": channel.id,
+                    "X-Goog-Channel-Token": "guess",
+                    "X-Goog-Resource-State": "exists",
+                },
+            )
+            unknown = await client.post(
+                "/calendar/webhook",
+                headers={"X-Goog-Channel-ID": "nope", "X-Goog-Channel-Token": channel.token},
+            )
+
+        assert (forged.status_code, unknown.status_code) == (403, 403)
+        await calendar_push.get_sync_debouncer().drain()
+        assert synced == []
+
+
+class TestTriggerPoll:
+    @pytest.mark.asyncio
+    async def test_poll_still_runs_when_channel_renewal_raises(
+        self, push_on, db_session, monkeypatch
+    ):
+        async def _no_such_action(action, params):
+            raise AttributeError(action)
+
+        async def _no_pipeline(db, *, poll):
+            return 0
+
+        monkeypatch.setattr(calendar_push, "execute_composio", _no_such_action)
+        monkeypatch.setattr(trigger, "run_pipeline_for_new_meetings", _no_pipeline)
+        app = FastAPI()
+        app.include_router(trigger.router)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://backend"
+        ) as client:
+            response = await client.post("/trigger-poll")
+
+        assert response.status_code == 200
+        assert response.json()["new_meetings"] == 25
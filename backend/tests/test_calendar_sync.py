@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import (
+    CalendarSyncState,
+    JobStatus,
+    Meeting,
+    MeetingStatus,
+    PipelineCheckpoint,
+    PipelineJob,
+    PipelineStage,
+)
+from app.services.calendar_poller import fetch_upcoming_events, poll_and_upsert
+from app.services.checkpoints import save_checkpoint
+from app.services.job_queue import enqueue_new_meetings
+from app.services.providers import get_fake_providers_app
+
+
+def _composio():
+    return get_fake_providers_app().state.fakes["composio"]
+
+
+def _list_calls() -> list[dict]:
+    return [params for action, params in _composio().state.calls if action == "GOOGLECALENDAR_EVENTS_LIST"]
+
+
+async def _meeting_count(db) -> int:
+    return (await db.execute(select(func.count()).select_from(Meeting))).scalar_one()
+
+
+@pytest.fixture
+def calendar(fake_mode, monkeypatch):
+    monkeypatch.setenv("FAKE_CALENDAR_EVENTS", "6")
+    return _composio().state.calendar
+
+
+class TestIncrementalSync:
+    @pytest.mark.asyncio
+    async def test_later_polls_fetch_only_changes(self, calendar, db_session):
+        assert await poll_and_upsert(db_session) == 6
+        state = await db_session.get(CalendarSyncState, "primary")
+        assert state.sync_token and state.full_synced_at
+
+        assert await poll_and_upsert(db_session) == 0
+        calendar.add_event(start=datetime.now(tz=timezone.utc) + timedelta(days=2))
+        calendar.cancel_event("fake-evt-0-1")
+        assert await poll_and_upsert(db_session) == 1
+
+        full, *incremental = _list_calls()
+        assert "timeMin" in full and "syncToken" not in full
+        assert [c.get("syncToken") for c in incremental] == ["0:6", "0:6"]
+        assert await _meeting_count(db_session) == 7
+
+    @pytest.mark.asyncio
+    async def test_expired_token_falls_back_to_a_full_sync(self, calendar, db_session):
+        await poll_and_upsert(db_session)
+        calendar.invalidate_sync_tokens()
+        calendar.add_event(start=datetime.now(tz=timezone.utc) + timedelta(days=1))
+
+        assert await poll_and_upsert(db_session) == 1
+
+        state = await db_session.get(CalendarSyncState, "primary")
+        assert state.sync_token.startswith("1:")
+        assert "syncToken" in _list_calls()[1] and "timeMin" in _list_calls()[2]
+        assert await _meeting_count(db_session) == 7
+
+    @pytest.mark.asyncio
+    async def test_full_resync_once_the_window_no_longer_covers_the_poll(self, calendar, db_session):
+        await poll_and_upsert(db_session)
+        state = await db_session.get(CalendarSyncState, "primary")
+        state.window_end = datetime.utcnow() + timedelta(days=6)
+        await db_session.commit()
+
+        await poll_and_upsert(db_session)
+
+        assert "timeMin" in _list_calls()[-1]
+
+    @pytest.mark.asyncio
+    async def test_every_page_is_read_before_the_token_is_kept(
+        self, fake_mode, monkeypatch, db_session
+    ):
+        monkeypatch.setenv("FAKE_CALENDAR_EVENTS", "30")
+        monkeypatch.setenv("CALENDAR_PAGE_SIZE", "8")
+
+        assert await poll_and_upsert(db_session) == 30
+
+        assert [c.get("pageToken") for c in _list_calls()] == [None, "8", "16", "24"]
+        assert (await db_session.get(CalendarSyncState, "primary")).sync_token == "0:30"
+
+
+async def _drafted_with_checkpoints(db) -> dict[str, int]:
+    """Poll, then pretend every meeting went through the whole pipeline; event id -> meeting id."""
+    await poll_and_upsert(db)
+    meetings = {m.calendar_event_id: m for m in (await db.execute(select(Meeting))).scalars()}
+    for m in meetings.values():
+        m.status = MeetingStatus.Drafted
+        for stage in PipelineStage:
+            await save_checkpoint(db, m.id, stage, "hash", {})
+    await db.commit()
+    return {event_id: m.id for event_id, m in meetings.items()}
+
+
+async def _stages_left(db, meeting_id: int) -> set[PipelineStage]:
+    result = await db.execute(
+        select(PipelineCheckpoint.stage).where(PipelineCheckpoint.meeting_id == meeting_id)
+    )
+    return set(result.scalars())
+
+
+class TestChangeDetection:
+    @pytest.mark.asyncio
+    async def test_each_change_invalidates_only_what_depends_on_it(self, calendar, db_session):
+        ids = await _drafted_with_checkpoints(db_session)
+        moved = datetime.now(tz=timezone.utc) + timedelta(days=3, minutes=17)
+        calendar.update_event("fake-evt-0-1", summary="Renamed intro")
+        calendar.update_event("fake-evt-0-2", start={"dateTime": moved.isoformat()})
+        calendar.update_event(
+            "fake-evt-0-3",
+            attendees=[{"email": "cfo@initech.com"}, {"email": "founder@ourstartup.com"}],
+        )
+        calendar.cancel_event("fake-evt-0-4")
+        calendar.update_event("fake-evt-0-5")  # new etag, same content
+
+        assert await poll_and_upsert(db_session) == 0
+
+        db_session.expire_all()
+        status = {eid: (await db_session.get(Meeting, mid)).status for eid, mid in ids.items()}
+        assert status == {
+            "fake-evt-0-0": MeetingStatus.Drafted,
+            "fake-evt-0-1": MeetingStatus.New,
+            "fake-evt-0-2": MeetingStatus.Drafted,
+            "fake-evt-0-3": MeetingStatus.New,
+            "fake-evt-0-4": MeetingStatus.Cancelled,
+            "fake-evt-0-5": MeetingStatus.Drafted,
+        }
+        all_stages = set(PipelineStage)
+        # The title feeds the synthesis, the Notion row and the drafts, not the searches.
+        assert await _stages_left(db_session, ids["fake-evt-0-1"]) == {PipelineStage.Enrich}
+        # Nothing downstream reads the start time: a reschedule reruns nothing.
+        assert await _stages_left(db_session, ids["fake-evt-0-2"]) == all_stages
+        assert await _stages_left(db_session, ids["fake-evt-0-3"]) == set()
+        retitled = await db_session.get(Meeting, ids["fake-evt-0-1"])
+        moved_row = await db_session.get(Meeting, ids["fake-evt-0-2"])
+        reattended = await db_session.get(Meeting, ids["fake-evt-0-3"])
+        assert retitled.title == "Renamed intro"
+        assert moved_row.datetime_utc == moved.astimezone(timezone.utc).replace(tzinfo=None)
+        assert reattended.company == "initech.com"
+
+    @pytest.mark.asyncio
+    async def test_attendee_swap_at_the_same_company_redrafts_and_requeues(
+        self, calendar, db_session
+    ):
+        ids = await _drafted_with_checkpoints(db_session)
+        db_session.add(PipelineJob(meeting_id=ids["fake-evt-0-1"], status=JobStatus.Done))
+        await db_session.commit()
+        calendar.update_event(
+            "fake-evt-0-1",
+            attendees=[{"email": "cto@globex.com"}, {"email": "founder@ourstartup.com"}],
+        )
+
+        await poll_and_upsert(db_session)
+        await db_session.commit()
+
+        meeting = await db_session.get(Meeting, ids["fake-evt-0-1"])
+        await db_session.refresh(meeting)
+        assert meeting.status == MeetingStatus.New
+        assert meeting.company == "globex.com"
+        assert await _stages_left(db_session, meeting.id) == {PipelineStage.Enrich}
+        assert await enqueue_new_meetings(db_session) == 1
+        job = (
+            await db_session.execute(select(PipelineJob).where(PipelineJob.meeting_id == meeting.id))
+        ).scalar_one()
+        assert job.status == JobStatus.Queued
+
+    @pytest.mark.asyncio
+    async def test_cancelling_drops_the_queued_job_and_a_reinstated_event_requeues(
+        self, calendar, db_session
+    ):
+        await poll_and_upsert(db_session)
+        await enqueue_new_meetings(db_session)
+        calendar.cancel_event("fake-evt-0-0")
+        await poll_and_upsert(db_session)
+
+        meeting = (
+            await db_session.execute(
+                select(Meeting).where(Meeting.calendar_event_id == "fake-evt-0-0")
+            )
+        ).scalar_one()
+        job = (
+            await db_session.execute(select(PipelineJob).where(PipelineJob.meeting_id == meeting.id))
+        ).scalar_one()
+        await db_session.refresh(meeting)
+        await db_session.refresh(job)
+        assert meeting.status == MeetingStatus.Cancelled
+        assert job.status == JobStatus.Done
+
+        calendar.update_event("fake-evt-0-0", status="confirmed")
+        await poll_and_upsert(db_session)
+        await db_session.refresh(meeting)
+        assert meeting.status == MeetingStatus.New
+        assert meeting.title  # the cancellation stub did not blank the row
+
+
+class TestPagedFetch:
+    @pytest.mark.asyncio
+    async def test_pages_stream_past_the_old_cap_and_prefetch(self, fake_mode, monkeypatch):
+        monkeypatch.setenv("FAKE_CALENDAR_EVENTS", "40")
+        pages, calls_seen = [], []
+        async for page in fetch_upcoming_events(page_size=16):
+            await asyncio.sleep(0.01)
+            # The next page is already being fetched while this one is handled.
+            calls_seen.append(len(_list_calls()))
+            pages.append(page)
+
+        assert [len(p) for p in pages] == [16, 16, 8]
+        assert calls_seen == [2, 3, 3]
+        assert pages[0][0]["calendar_event_id"] == "fake-evt-0-0"
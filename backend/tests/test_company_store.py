@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.models import Company
+from app.services.calendar_poller import _infer_company_from_attendees
+from app.services.company_store import (
+    company_domain,
+    load_company_bundle,
+    normalize_domain,
+    save_company_bundle,
+)
+
+
+class TestDomains:
+    def test_normalize_domain(self):
+        assert normalize_domain("Jane@WWW.Acme.com.") == "acme.com"
+        assert normalize_domain("acme.com") == "acme.com"
+        assert normalize_domain("Unknown") is None
+        assert normalize_domain(None) is None
+
+    def test_personal_domains_have_no_company(self):
+        assert company_domain("gmail.com") is None
+        assert company_domain("someone@outlook.com") is None
+        assert company_domain("acme.com") == "acme.com"
+
+    def test_inference_skips_personal_mailboxes(self):
+        attendees = [{"email": "founder@gmail.com"}, {"email": "cto@Acme.io"}]
+        assert _infer_company_from_attendees(attendees) == "acme.io"
+        assert _infer_company_from_attendees([{"email": "a@yahoo.com"}]) == "Unknown"
+
+
+class TestCompanyBundle:
+    @pytest.mark.asyncio
+    async def test_fresh_bundle_is_reused(self, db_session):
+        await save_company_bundle(db_session, "acme.com", "q1", {"news": [1]})
+        await db_session.commit()
+
+        assert await load_company_bundle(db_session, "acme.com", "q1") == {"news": [1]}
+        assert await load_company_bundle(db_session, "acme.com", "q2") is None
+        assert await load_company_bundle(db_session, "globex.com", "q1") is None
+
+    @pytest.mark.asyncio
+    async def test_stale_bundle_is_ignored(self, db_session, monkeypatch):
+        monkeypatch.setenv("COMPANY_FRESHNESS_HOURS", "1")
+        await save_company_bundle(db_session, "acme.com", "q1", {"news": []})
+        await db_session.execute(
+            update(Company).values(fetched_at=datetime.utcnow() - timedelta(hours=2))
+        )
+        await db_session.commit()
+
+        assert await load_company_bundle(db_session, "acme.com", "q1") is None
+
+    @pytest.mark.asyncio
+    async def test_save_replaces_bundle_and_hash(self, db_session):
+        await save_company_bundle(db_session, "acme.com", "q1", {"v": 1})
+        await save_company_bundle(db_session, "acme.com", "q1", {"v": 2})
+        await db_session.commit()
+
+        company = await db_session.get(Company, "acme.com")
+        assert company.bundle == {"v": 2}
+        assert len(company.content_hash) == 64
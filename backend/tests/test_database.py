@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import Base, _add_missing_columns
+
+
+class TestAddMissingColumns:
+    @pytest.mark.asyncio
+    async def test_nullable_columns_are_added_to_an_existing_table(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "CREATE TABLE meetings (id INTEGER PRIMARY KEY, "
+                    "calendar_event_id VARCHAR(255) NOT NULL UNIQUE, title VARCHAR(255))"
+                )
+            )
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_add_missing_columns)
+            columns = await conn.run_sync(
+                lambda sync: {c["name"] for c in inspect(sync).get_columns("meetings")}
+            )
+        await engine.dispose()
+
+        assert {"calendar_etag", "calendar_updated", "material_hash"} <= columns
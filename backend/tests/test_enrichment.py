@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import patch
 
 import httpx
@@ -267,3 +268,67 @@ class TestEnrichMeeting:
             "Salesforce", sample_steering.product_focus, sample_steering.competitor_list
         )
         assert competitor_q in captured_queries
+
+
+# ---------------------------------------------------------------------------
+# _search_youcom — retries, Retry-After and deadline
+# ---------------------------------------------------------------------------
+
+
+class TestSearchYoucomRetries:
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_retries_5xx_then_succeeds(self):
+        route = respx.get(_SEARCH_URL).mock(
+            side_effect=[
+                httpx.Response(503),
+                httpx.Response(502),
+                httpx.Response(200, json=youcom_success_response()),
+            ]
+        )
+        with patch("app.services.enrichment.get_settings", return_value=_fake_settings()):
+            outcome = await _search_youcom("test query")
+        assert outcome.error is None
+        assert route.call_count == 3
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_honours_retry_after(self):
+        respx.get(_SEARCH_URL).mock(
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "0.05"}),
+                httpx.Response(200, json=youcom_success_response()),
+            ]
+        )
+        with patch("app.services.enrichment.get_settings", return_value=_fake_settings()):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            outcome = await _search_youcom("test query")
+            elapsed = loop.time() - started
+        assert outcome.error is None
+        assert elapsed >= 0.05
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_retry_after_beyond_deadline_gives_up(self):
+        route = respx.get(_SEARCH_URL).mock(
+            return_value=httpx.Response(429, headers={"Retry-After": "30"})
+        )
+        with patch("app.services.enrichment.get_settings", return_value=_fake_settings()):
+            deadline = asyncio.get_running_loop().time() + 1.0
+            outcome = await _search_youcom("test query", deadline=deadline)
+        assert outcome.error == "Rate limited by You.com API"
+        assert route.call_count == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_slow_upstream_hits_deadline(self):
+        async def _slow(_request):
+            await asyncio.sleep(1.0)
+            return httpx.Response(200, json=youcom_success_response())
+
+        respx.get(_SEARCH_URL).mock(side_effect=_slow)
+        with patch("app.services.enrichment.get_settings", return_value=_fake_settings()):
+            deadline = asyncio.get_running_loop().time() + 0.05
+            outcome = await _search_youcom("test query", deadline=deadline)
+        assert outcome.error == "Enrichment deadline exceeded"
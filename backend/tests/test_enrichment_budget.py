@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import respx
+
+from app.services.enrichment import enrich_meeting
+from app.services.enrichment_budget import plan_query_budgets
+
+from tests.conftest import YOUCOM_SEARCH_URL, youcom_success_response
+
+
+def _weights(steering, news: float, pains: float, competitors: float):
+    return steering.model_copy(
+        update={
+            "weight_news": news,
+            "weight_role_pains": pains,
+            "weight_competitors": competitors,
+        }
+    )
+
+
+class TestPlanQueryBudgets:
+    def test_default_weights_split_evenly(self, sample_steering):
+        budgets = plan_query_budgets(sample_steering)
+
+        assert [b.count for b in budgets.values()] == [5, 5, 5]
+        assert budgets["company_news"].deadline_seconds == pytest.approx(45.0)
+        assert budgets["role_pains"].deadline_seconds < 45.0
+
+    def test_counts_follow_weights(self, sample_steering):
+        budgets = plan_query_budgets(_weights(sample_steering, 0.6, 0.2, 0.2))
+
+        assert budgets["company_news"].count == 9
+        assert budgets["role_pains"].count == 3
+        assert budgets["competitor_landscape"].count == 3
+        assert budgets["role_pains"].deadline_seconds == pytest.approx(15.0)
+
+    def test_low_weight_query_is_skipped(self, sample_steering, monkeypatch):
+        monkeypatch.setenv("ENRICHMENT_TOTAL_RESULTS", "10")
+        budgets = plan_query_budgets(_weights(sample_steering, 0.5, 0.45, 0.05))
+
+        assert budgets["competitor_landscape"].skipped
+        # The skipped share is not redistributed: 95% of 10, rounded down.
+        assert (budgets["company_news"].count, budgets["role_pains"].count) == (5, 4)
+        assert budgets["competitor_landscape"].deadline_seconds == 0.0
+
+    def test_all_zero_weights_fall_back_to_even_split(self, sample_steering):
+        budgets = plan_query_budgets(_weights(sample_steering, 0, 0, 0))
+
+        assert not any(b.skipped for b in budgets.values())
+
+
+class TestEnrichMeetingBudgets:
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_skipped_query_makes_no_request(self, sample_steering, youcom_key):
+        counts: list[str] = []
+
+        def _capture(request: httpx.Request) -> httpx.Response:
+            counts.append(request.url.params.get("count", ""))
+            return httpx.Response(200, json=youcom_success_response())
+
+        respx.get(YOUCOM_SEARCH_URL).mock(side_effect=_capture)
+        steering = _weights(sample_steering, 0.7, 0.25, 0.05)
+
+        result = await enrich_meeting(
+            company="Salesforce", role="VP of Sales", attendees=[], steering=steering
+        )
+
+        assert sorted(counts) == ["10", "4"]
+        assert result.competitor_landscape.skipped
+        assert result.competitor_landscape.results == []
+        assert result.competitor_landscape.error is None
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.services.enrichment import EnrichmentResult, SearchQueryOutcome, SearchResult
+from app.services.hit_ranking import rank_enrichment
+
+_NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+_PRESS_RELEASE = (
+    "Acme Corp today announced a $50 million Series C led by Sequoia to expand "
+    "its AI sales platform into Europe and double its go-to-market team."
+)
+_SYNDICATED = (
+    "Acme Corp today announced a $50 million Series C led by Sequoia to expand "
+    "its AI sales platform into Europe and double its go-to-market team. (Reuters)"
+)
+
+
+def _hit(title: str, url: str, snippet: str, age: str | None = None) -> SearchResult:
+    return SearchResult(title=title, url=url, snippet=snippet, age=age)
+
+
+def _enrichment(news=(), pains=(), competitors=()) -> EnrichmentResult:
+    def _outcome(query: str, hits) -> SearchQueryOutcome:
+        return SearchQueryOutcome(query=query, results=list(hits))
+
+    return EnrichmentResult(
+        company_news=_outcome("news", news),
+        role_pains=_outcome("pains", pains),
+        competitor_landscape=_outcome("competitors", competitors),
+    )
+
+
+def _urls(outcome: SearchQueryOutcome) -> list[str]:
+    return [r.url for r in outcome.results]
+
+
+class TestRankEnrichment:
+    def test_syndicated_copy_collapses_across_sections(self, sample_steering):
+        enrichment = _enrichment(
+            news=[_hit("Acme raises Series C", "https://a.com/1", _PRESS_RELEASE)],
+            competitors=[
+                _hit("Acme raises Series C", "https://b.com/2", _SYNDICATED),
+                _hit("Gong vs Clari", "https://c.com/3", "A comparison of pricing tiers."),
+            ],
+        )
+
+        ranked, stats = rank_enrichment(enrichment, sample_steering, now=_NOW)
+
+        assert stats.hits_in == 3
+        assert stats.duplicates_collapsed == 1
+        # News carries the higher weight, so its copy is the one kept.
+        assert _urls(ranked.company_news) == ["https://a.com/1"]
+        assert _urls(ranked.competitor_landscape) == ["https://c.com/3"]
+
+    def test_same_url_collapses_even_with_different_snippets(self, sample_steering):
+        enrichment = _enrichment(
+            news=[_hit("One", "https://a.com/x", "First take on the story.")],
+            pains=[_hit("Two", "https://A.com/x ", "Entirely different wording here.")],
+        )
+
+        ranked, stats = rank_enrichment(enrichment, sample_steering, now=_NOW)
+
+        assert stats.duplicates_collapsed == 1
+        assert ranked.role_pains.results == []
+
+    def test_distinct_short_snippets_are_kept(self, sample_steering):
+        enrichment = _enrichment(
+            news=[
+                _hit("Result 0", "https://example.com/0", "Web description 0"),
+                _hit("Result 1", "https://example.com/1", "Web description 1"),
+            ]
+        )
+
+        _, stats = rank_enrichment(enrichment, sample_steering, now=_NOW)
+
+        assert stats.duplicates_collapsed == 0
+        assert stats.hits_out == 2
+
+    def test_budget_keeps_highest_weighted_recent_hits(self, sample_steering):
+        steering = sample_steering.model_copy(
+            update={"weight_news": 0.8, "weight_role_pains": 0.1, "weight_competitors": 0.1}
+        )
+        enrichment = _enrichment(
+            news=[
+                _hit("Old news", "https://n.com/old", "Layoffs at the company last year", "2024-06-01T00:00:00"),
+                _hit("Fresh news", "https://n.com/new", "New CRO hired this week", "2025-05-30T00:00:00Z"),
+            ],
+            pains=[_hit("Pain", "https://p.com/1", "Forecasting accuracy remains poor")],
+        )
+
+        ranked, stats = rank_enrichment(enrichment, steering, hit_budget=1, now=_NOW)
+
+        assert stats.trimmed_by_budget == 2
+        assert _urls(ranked.company_news) == ["https://n.com/new"]
+        assert ranked.role_pains.results == []
+        assert ranked.company_news.results[0].score is not None
+
+    def test_does_not_mutate_input(self, sample_steering):
+        enrichment = _enrichment(
+            news=[_hit("A", "https://a.com/1", _PRESS_RELEASE)],
+            pains=[_hit("B", "https://b.com/1", _SYNDICATED)],
+        )
+
+        rank_enrichment(enrichment, sample_steering, now=_NOW)
+
+        assert len(enrichment.role_pains.results) == 1
+        assert enrichment.company_news.results[0].score is None
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.database import SessionLocal
+from app.models import JobStatus, Meeting, MeetingStatus, PipelineJob
+from app.services.job_queue import (
+    claim_next_job,
+    complete_job,
+    enqueue_new_meetings,
+    fail_job,
+    heartbeat,
+    owns_job,
+)
+
+
+async def _seed(db, count: int) -> list[int]:
+    meetings = [
+        Meeting(calendar_event_id=f"evt-{i}", title=f"M{i}", status=MeetingStatus.New)
+        for i in range(count)
+    ]
+    db.add_all(meetings)
+    await db.commit()
+    return [m.id for m in meetings]
+
+
+async def _job_for(meeting_id: int) -> PipelineJob:
+    async with SessionLocal() as session:
+        result = await session.execute(
+            select(PipelineJob).where(PipelineJob.meeting_id == meeting_id)
+        )
+        return result.scalar_one()
+
+
+class TestEnqueue:
+    @pytest.mark.asyncio
+    async def test_enqueue_is_idempotent(self, db_session):
+        await _seed(db_session, 3)
+        assert await enqueue_new_meetings(db_session) == 3
+        assert await enqueue_new_meetings(db_session) == 0
+
+        result = await db_session.execute(select(PipelineJob))
+        assert len(result.scalars().all()) == 3
+
+    @pytest.mark.asyncio
+    async def test_finished_job_is_requeued(self, db_session):
+        (meeting_id,) = await _seed(db_session, 1)
+        await enqueue_new_meetings(db_session)
+        job = await claim_next_job(db_session, worker_id="w1")
+        await complete_job(db_session, job)
+
+        assert await enqueue_new_meetings(db_session) == 1
+        requeued = await _job_for(meeting_id)
+        assert requeued.status == JobStatus.Queued
+        assert requeued.attempts == 0
+
+    @pytest.mark.asyncio
+    async def test_force_flag_travels_with_the_claim(self, db_session):
+        (meeting_id,) = await _seed(db_session, 1)
+        await enqueue_new_meetings(db_session)
+        # Forcing an already-queued job still sets the flag.
+        await enqueue_new_meetings(db_session, force_ids={meeting_id})
+
+        job = await claim_next_job(db_session, worker_id="w1")
+        assert job.force is True
+
+        await complete_job(db_session, job)
+        assert (await _job_for(meeting_id)).force is False
+
+
+class TestClaim:
+    @pytest.mark.asyncio
+    async def test_concurrent_claims_never_share_a_job(self, db_session):
+        await _seed(db_session, 5)
+        await enqueue_new_meetings(db_session)
+
+        async def _claim(n: int):
+            async with SessionLocal() as session:
+                return await claim_next_job(session, worker_id=f"w{n}")
+
+        claims = await asyncio.gather(*(_claim(n) for n in range(8)))
+        claimed = [c for c in claims if c is not None]
+        assert len(claimed) == 5
+        assert len({c.id for c in claimed}) == 5
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, db_session):
+        (meeting_id,) = await _seed(db_session, 1)
+        await enqueue_new_meetings(db_session)
+        first = await claim_next_job(db_session, worker_id="dead-worker")
+        assert await claim_next_job(db_session, worker_id="w2") is None
+
+        await db_session.execute(
+            update(PipelineJob).values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+        await db_session.commit()
+
+        second = await claim_next_job(db_session, worker_id="w2")
+        assert second is not None
+        assert second.id == first.id
+        assert second.attempts == 2
+        # The original owner can no longer extend or complete the job.
+        assert await heartbeat(db_session, first) is False
+        assert await complete_job(db_session, first) is False
+        assert (await _job_for(meeting_id)).lease_owner == "w2"
+        assert await owns_job(db_session, first) is False
+        assert await owns_job(db_session, second) is True
+
+    @pytest.mark.asyncio
+    async def test_failed_job_retries_then_gives_up(self, db_session, monkeypatch):
+        monkeypatch.setenv("JOB_MAX_ATTEMPTS", "2")
+        (meeting_id,) = await _seed(db_session, 1)
+        await enqueue_new_meetings(db_session)
+
+        job = await claim_next_job(db_session, worker_id="w1")
+        await fail_job(db_session, job, "boom")
+        assert (await _job_for(meeting_id)).status == JobStatus.Queued
+
+        job = await claim_next_job(db_session, worker_id="w1")
+        await fail_job(db_session, job, "boom again")
+        final = await _job_for(meeting_id)
+        assert final.status == JobStatus.Failed
+        assert final.last_error == "boom again"
+        assert await claim_next_job(db_session, worker_id="w1") is None
+
@@ -0,0 +1,540 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.database import SessionLocal
+from app.models import JobStatus, Meeting, MeetingStatus, PipelineJob
+from app.services import pipeline
+from app.services.enrichment import EnrichmentResult, SearchQueryOutcome, SearchResult
+from app.services.synthesis import EmailDraft, Insight, PartialSynthesis, SynthesisResult
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _empty_enrichment() -> EnrichmentResult:
+    return EnrichmentResult(
+        company_news=SearchQueryOutcome(query="news"),
+        role_pains=SearchQueryOutcome(query="pains"),
+        competitor_landscape=SearchQueryOutcome(query="competitors"),
+    )
+
+
+def _synthesis() -> SynthesisResult:
+    return SynthesisResult(
+        insights=[Insight(text="Insight", why="Because", priority=1)],
+        pre_meeting_draft=EmailDraft(subject="Hi", body="Body"),
+        follow_up_draft=EmailDraft(subject="Thanks", body="Body"),
+    )
+
+
+async def _seed_meetings(db, companies: list[str]) -> None:
+    for i, company in enumerate(companies):
+        db.add(
+            Meeting(
+                calendar_event_id=f"evt-{i}",
+                title=f"Intro {company}",
+                attendees=[{"email": f"founder@{company}"}],
+                company=company,
+                role="Unknown",
+                status=MeetingStatus.New,
+            )
+        )
+    await db.commit()
+
+
+async def _only_meeting(db) -> Meeting:
+    result = await db.execute(select(Meeting).execution_options(populate_existing=True))
+    return result.scalar_one()
+
+
+@pytest.fixture
+def fake_services(monkeypatch):
+    """Replace the external integrations with fakes that track concurrency and calls."""
+    state = {
+        "in_flight": 0,
+        "max_in_flight": 0,
+        "calls": Counter(),
+        "notion_fails": False,
+        "companies": [],
+        "roles": [],
+        "searched": [],
+    }
+
+    async def _enrich(*, company, role, attendees, steering, known=None):
+        state["calls"]["enrich"] += 1
+        state["roles"].append(role)
+        known = known or {}
+        state["searched"].append(sorted(set(EnrichmentResult.model_fields) - set(known)))
+        if "company_news" not in known:
+            state["companies"].append(company)
+        if company == "boom.io":
+            raise RuntimeError("enrichment exploded")
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.02)
+        state["in_flight"] -= 1
+        return _empty_enrichment().model_copy(update=known)
+
+    async def _synthesize(**_kwargs):
+        state["calls"]["synthesize"] += 1
+        return _synthesis()
+
+    async def _notion(**_kwargs):
+        state["calls"]["notion"] += 1
+        if state["notion_fails"]:
+            raise RuntimeError("notion unavailable")
+        return "page-1"
+
+    async def _drafts(**_kwargs):
+        state["calls"]["gmail"] += 1
+        return ["draft-1", "draft-2"]
+
+    monkeypatch.setattr(pipeline, "enrich_meeting", _enrich)
+    monkeypatch.setattr(pipeline, "synthesize_meeting_prep", _synthesize)
+    monkeypatch.setattr(pipeline, "upsert_notion_row", _notion)
+    monkeypatch.setattr(pipeline, "create_drafts", _drafts)
+    return state
+
+
+# ---------------------------------------------------------------------------
+# run_pipeline_for_new_meetings
+# ---------------------------------------------------------------------------
+
+
+class TestRunPipelineConcurrency:
+    @pytest.mark.asyncio
+    async def test_processes_all_meetings_within_limit(self, db_session, fake_services):
+        await _seed_meetings(db_session, [f"acme{i}.com" for i in range(6)])
+
+        processed = await pipeline.run_pipeline_for_new_meetings(
+            db_session, poll=False, concurrency=2
+        )
+
+        assert processed == 6
+        assert fake_services["max_in_flight"] == 2
+        async with SessionLocal() as session:
+            result = await session.execute(select(Meeting))
+            meetings = result.scalars().all()
+        assert {m.status for m in meetings} == {MeetingStatus.Drafted}
+        assert all(m.draft_ids == ["draft-1", "draft-2"] for m in meetings)
+
+    @pytest.mark.asyncio
+    async def test_failure_is_isolated_per_meeting(self, db_session, fake_services):
+        await _seed_meetings(db_session, ["acme.com", "boom.io", "globex.com"])
+
+        processed = await pipeline.run_pipeline_for_new_meetings(
+            db_session, poll=False, concurrency=3
+        )
+
+        assert processed == 2
+        async with SessionLocal() as session:
+            result = await session.execute(select(Meeting).order_by(Meeting.id))
+            meetings = result.scalars().all()
+        statuses = {m.company: m.status for m in meetings}
+        assert statuses["acme.com"] == MeetingStatus.Drafted
+        assert statuses["globex.com"] == MeetingStatus.Drafted
+        assert statuses["boom.io"] == MeetingStatus.Error
+        failed = next(m for m in meetings if m.company == "boom.io")
+        assert "enrichment exploded" in (failed.error_message or "")
+
+    @pytest.mark.asyncio
+    async def test_failed_meeting_is_retried_from_its_checkpoints(
+        self, db_session, fake_services, monkeypatch
+    ):
+        await _seed_meetings(db_session, ["acme.com"])
+        flaky = {"left": 1}
+        real_notion = pipeline.upsert_notion_row
+
+        async def _notion_fails_once(**kwargs):
+            if flaky["left"]:
+                flaky["left"] -= 1
+                raise RuntimeError("notion unavailable")
+            return await real_notion(**kwargs)
+
+        monkeypatch.setattr(pipeline, "upsert_notion_row", _notion_fails_once)
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 1
+
+        assert (await _only_meeting(db_session)).status == MeetingStatus.Drafted
+        job = (await db_session.execute(select(PipelineJob))).scalar_one()
+        assert (job.status, job.attempts) == (JobStatus.Done, 2)
+        calls = fake_services["calls"]
+        assert (calls["enrich"], calls["synthesize"], calls["notion"]) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_job_requeued_during_an_empty_claim_is_retried(
+        self, db_session, fake_services, monkeypatch
+    ):
+        await _seed_meetings(db_session, ["acme.com"])
+        flaky = {"left": 1}
+        requeued = asyncio.Event()
+        real_enrich, real_fail, real_claim = (
+            pipeline.enrich_meeting,
+            pipeline.fail_job,
+            pipeline.claim_next_job,
+        )
+
+        async def _enrich_fails_once(**kwargs):
+            if flaky["left"]:
+                flaky["left"] -= 1
+                raise RuntimeError("search unavailable")
+            return await real_enrich(**kwargs)
+
+        async def _fail(session, job, error):
+            try:
+                return await real_fail(session, job, error)
+            finally:
+                requeued.set()
+
+        claims = {"n": 0}
+
+        async def _claim_straddling_the_requeue(session, **kwargs):
+            claims["n"] += 1
+            job = await real_claim(session, **kwargs)
+            if claims["n"] == 2:
+                # Finds nothing while the meeting runs, and returns only after its
+                # job was requeued and its slot released.
+                await requeued.wait()
+                await asyncio.sleep(0)
+            return job
+
+        monkeypatch.setattr(pipeline, "enrich_meeting", _enrich_fails_once)
+        monkeypatch.setattr(pipeline, "fail_job", _fail)
+        monkeypatch.setattr(pipeline, "claim_next_job", _claim_straddling_the_requeue)
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 1
+
+        job = (await db_session.execute(select(PipelineJob))).scalar_one()
+        assert (job.status, job.attempts) == (JobStatus.Done, 2)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_fail_the_job(self, db_session, fake_services, monkeypatch):
+        monkeypatch.setenv("JOB_MAX_ATTEMPTS", "2")
+        await _seed_meetings(db_session, ["boom.io"])
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 0
+
+        job = (await db_session.execute(select(PipelineJob))).scalar_one()
+        assert (job.status, job.attempts) == (JobStatus.Failed, 2)
+        assert fake_services["calls"]["enrich"] == 2
+
+    @pytest.mark.asyncio
+    async def test_a_failing_completion_releases_its_slot_once(
+        self, db_session, fake_services, monkeypatch
+    ):
+        await _seed_meetings(db_session, ["acme.com", "globex.com", "initech.com"])
+        real_complete = pipeline.complete_job
+        failures = {"left": 1}
+
+        async def _complete_fails_once(session, job):
+            if failures["left"]:
+                failures["left"] -= 1
+                raise RuntimeError("database is locked")
+            return await real_complete(session, job)
+
+        monkeypatch.setattr(pipeline, "complete_job", _complete_fails_once)
+
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False, concurrency=1)
+
+        assert fake_services["max_in_flight"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reclaimed_job_makes_no_side_effects(
+        self, db_session, fake_services, monkeypatch
+    ):
+        await _seed_meetings(db_session, ["acme.com"])
+        real_synthesize = pipeline.synthesize_meeting_prep
+
+        async def _lease_lapses_meanwhile(**kwargs):
+            async with SessionLocal() as session:
+                await session.execute(update(PipelineJob).values(lease_owner="other-host"))
+                await session.commit()
+            return await real_synthesize(**kwargs)
+
+        monkeypatch.setattr(pipeline, "synthesize_meeting_prep", _lease_lapses_meanwhile)
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 0
+
+        calls = fake_services["calls"]
+        assert (calls["notion"], calls["gmail"]) == (0, 0)
+        job = (await db_session.execute(select(PipelineJob))).scalar_one()
+        assert job.lease_owner == "other-host"
+
+    @pytest.mark.asyncio
+    async def test_cancellation_during_synthesis_stops_the_meeting(
+        self, db_session, fake_services, monkeypatch
+    ):
+        await _seed_meetings(db_session, ["acme.com"])
+        real_synthesize = pipeline.synthesize_meeting_prep
+
+        async def _cancelled_meanwhile(**kwargs):
+            async with SessionLocal() as session:
+                await session.execute(update(Meeting).values(status=MeetingStatus.Cancelled))
+                await session.commit()
+            return await real_synthesize(**kwargs)
+
+        monkeypatch.setattr(pipeline, "synthesize_meeting_prep", _cancelled_meanwhile)
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 0
+
+        assert (await _only_meeting(db_session)).status == MeetingStatus.Cancelled
+        calls = fake_services["calls"]
+        assert (calls["notion"], calls["gmail"]) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_cancellation_during_sync_skips_the_drafts(
+        self, db_session, fake_services, monkeypatch
+    ):
+        await _seed_meetings(db_session, ["acme.com"])
+        real_notion = pipeline.upsert_notion_row
+
+        async def _cancelled_meanwhile(**kwargs):
+            async with SessionLocal() as session:
+                await session.execute(update(Meeting).values(status=MeetingStatus.Cancelled))
+                await session.commit()
+            return await real_notion(**kwargs)
+
+        monkeypatch.setattr(pipeline, "upsert_notion_row", _cancelled_meanwhile)
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 0
+
+        assert (await _only_meeting(db_session)).status == MeetingStatus.Cancelled
+        assert (fake_services["calls"]["notion"], fake_services["calls"]["gmail"]) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_overlapping_runs_process_each_meeting_once(self, db_session, fake_services):
+        await _seed_meetings(db_session, [f"acme{i}.com" for i in range(6)])
+
+        results = await asyncio.gather(
+            pipeline.run_pipeline_for_new_meetings(poll=False, concurrency=2),
+            pipeline.run_pipeline_for_new_meetings(poll=False, concurrency=2),
+        )
+
+        assert sum(results) == 6
+        assert fake_services["calls"]["enrich"] == 6
+
+
+class TestRunPipelineCheckpoints:
+    @pytest.mark.asyncio
+    async def test_rerun_resumes_after_sync_failure(
+        self, db_session, fake_services, monkeypatch
+    ):
+        monkeypatch.setenv("JOB_MAX_ATTEMPTS", "1")
+        await _seed_meetings(db_session, ["acme.com"])
+        fake_services["notion_fails"] = True
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 0
+        meeting = await _only_meeting(db_session)
+        assert meeting.status == MeetingStatus.Error
+
+        fake_services["notion_fails"] = False
+        meeting.status = MeetingStatus.New
+        await db_session.commit()
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 1
+
+        calls = fake_services["calls"]
+        assert calls["enrich"] == 1
+        assert calls["synthesize"] == 1
+        assert calls["notion"] == 2
+        assert calls["gmail"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_inputs_recompute_downstream(self, db_session, fake_services):
+        await _seed_meetings(db_session, ["acme.com"])
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False)
+
+        meeting = await _only_meeting(db_session)
+        meeting.role = "VP of Sales"
+        meeting.status = MeetingStatus.New
+        await db_session.commit()
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False)
+
+        calls = fake_services["calls"]
+        assert calls["enrich"] == 2
+        assert calls["synthesize"] == 2
+        # Synthesis output is identical, so the Gmail drafts are reused.
+        assert calls["gmail"] == 1
+
+
+class TestRunPipelineStreaming:
+    @pytest.mark.asyncio
+    async def test_partials_of_a_failed_run_are_cleared(
+        self, db_session, fake_services, monkeypatch
+    ):
+        await _seed_meetings(db_session, ["acme.com"])
+
+        async def _streams_then_fails(*, on_partial, **_kwargs):
+            await on_partial(
+                PartialSynthesis(insights=[Insight(text="Half", why="Streamed", priority=1)])
+            )
+            return _synthesis().model_copy(update={"error": "Unexpected error: boom"})
+
+        monkeypatch.setattr(pipeline, "synthesize_meeting_prep", _streams_then_fails)
+
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False)
+
+        meeting = await _only_meeting(db_session)
+        assert meeting.status == MeetingStatus.Error
+        assert (meeting.insights, meeting.hooks) == ([], [])
+
+
+class TestRunPipelineCompanyStore:
+    @pytest.mark.asyncio
+    async def test_meetings_at_same_company_share_enrichment(self, db_session, fake_services):
+        await _seed_meetings(db_session, ["acme.com", "acme.com", "globex.com"])
+
+        processed = await pipeline.run_pipeline_for_new_meetings(
+            db_session, poll=False, concurrency=1
+        )
+
+        assert processed == 3
+        assert sorted(fake_services["companies"]) == ["acme.com", "globex.com"]
+        # Each meeting is still synthesized on its own.
+        assert fake_services["calls"]["synthesize"] == 3
+
+    @pytest.mark.asyncio
+    async def test_role_search_is_not_shared_across_roles(self, db_session, fake_services):
+        await _seed_meetings(db_session, ["acme.com", "acme.com"])
+        result = await db_session.execute(select(Meeting).order_by(Meeting.calendar_event_id))
+        for meeting, role in zip(result.scalars(), ["CTO", "COO"]):
+            meeting.role = role
+        await db_session.commit()
+
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False, concurrency=1)
+
+        # The account's searches run once; each role still gets its own.
+        assert fake_services["companies"] == ["acme.com"]
+        assert sorted(fake_services["roles"]) == ["COO", "CTO"]
+
+    @pytest.mark.asyncio
+    async def test_personal_domain_is_not_researched(self, db_session, fake_services):
+        await _seed_meetings(db_session, ["gmail.com"])
+
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False)
+
+        # The competitor search names the steering's competitors, so it still runs.
+        assert fake_services["companies"] == []
+        assert fake_services["searched"] == [["competitor_landscape", "role_pains"]]
+        meeting = await _only_meeting(db_session)
+        assert meeting.status == MeetingStatus.Drafted
+
+    def test_no_competitors_skips_the_company_only_competitor_search(self, sample_steering):
+        steering = sample_steering.model_copy(update={"competitor_list": []})
+
+        sections = pipeline._companyless_sections(steering)
+
+        assert set(sections) == {"company_news", "competitor_landscape"}
+        assert all(outcome.skipped for outcome in sections.values())
+
+
+class TestRunPipelineForce:
+    @pytest.mark.asyncio
+    async def test_force_ignores_checkpoints(self, db_session, fake_services):
+        await _seed_meetings(db_session, ["acme.com"])
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False)
+
+        meeting = await _only_meeting(db_session)
+        meeting.status = MeetingStatus.New
+        await db_session.commit()
+        await pipeline.run_pipeline_for_new_meetings(
+            db_session, poll=False, force_ids={meeting.id}
+        )
+
+        calls = fake_services["calls"]
+        assert calls["enrich"] == 2
+        assert calls["synthesize"] == 2
+        assert calls["gmail"] == 2
+
+
+class TestRunPipelineBatchSynthesis:
+    @staticmethod
+    async def _seed_at(db, starts_in: timedelta) -> None:
+        db.add(
+            Meeting(
+                calendar_event_id="evt-later",
+                title="Intro",
+                datetime_utc=datetime.utcnow() + starts_in,
+                attendees=[{"email": "founder@acme.com"}],
+                company="acme.com",
+                role="CTO",
+                status=MeetingStatus.New,
+            )
+        )
+        await db.commit()
+
+    @pytest.mark.asyncio
+    async def test_non_urgent_meeting_goes_through_batch(
+        self, db_session, fake_services, fake_openai_batch
+    ):
+        await self._seed_at(db_session, timedelta(days=3))
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 0
+        assert (await _only_meeting(db_session)).status == MeetingStatus.Enriched
+        assert len(fake_openai_batch.state.batches) == 1
+
+        # The next run applies the finished batch and only has to sync.
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 1
+        meeting = await _only_meeting(db_session)
+        assert meeting.status == MeetingStatus.Drafted
+        assert meeting.insights[0]["text"] == "Batch insight"
+        calls = fake_services["calls"]
+        assert calls["synthesize"] == 0
+        assert calls["enrich"] == 1
+        assert calls["gmail"] == 1
+
+    @pytest.mark.asyncio
+    async def test_urgent_meeting_stays_synchronous(
+        self, db_session, fake_services, fake_openai_batch
+    ):
+        await self._seed_at(db_session, timedelta(hours=2))
+
+        assert await pipeline.run_pipeline_for_new_meetings(db_session, poll=False) == 1
+        assert fake_services["calls"]["synthesize"] == 1
+        assert fake_openai_batch.state.batches == {}
+
+    @pytest.mark.asyncio
+    async def test_rerun_while_batch_is_out_waits_on_it(
+        self, db_session, fake_services, fake_openai_batch, monkeypatch
+    ):
+        await self._seed_at(db_session, timedelta(days=3))
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False)
+
+        async def _still_out() -> int:
+            return 0
+
+        monkeypatch.setattr(pipeline, "poll_synthesis_batches", _still_out)
+        meeting = await _only_meeting(db_session)
+        meeting.status = MeetingStatus.New
+        await db_session.commit()
+        await pipeline.run_pipeline_for_new_meetings(db_session, poll=False)
+
+        assert len(fake_openai_batch.state.batches) == 1
+        assert (await _only_meeting(db_session)).status == MeetingStatus.Enriched
+
+
+class TestSynthesisInputs:
+    @staticmethod
+    def _ranked(score: float, title: str = "Acme raises") -> EnrichmentResult:
+        enrichment = _empty_enrichment()
+        enrichment.company_news.results = [
+            SearchResult(title=title, url="https://acme.com/news", snippet="...", score=score)
+        ]
+        return enrichment
+
+    def test_hash_ignores_recency_drift_in_scores(self, sample_steering):
+        meeting = Meeting(title="Intro", company="acme.com", role="CTO", attendees=[])
+        earlier = pipeline._synthesis_inputs(meeting, sample_steering, self._ranked(0.2656))
+        later = pipeline._synthesis_inputs(meeting, sample_steering, self._ranked(0.2654))
+        other_hit = pipeline._synthesis_inputs(
+            meeting, sample_steering, self._ranked(0.2656, title="Acme layoffs")
+        )
+
+        assert earlier == later
+        assert earlier != other_hit
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import random
+import statistics
+
+import pytest
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.fakes.faults import FakeProfile, FaultInjector
+from app.models import Meeting, MeetingStatus
+from app.services import pipeline
+from app.services.calendar_poller import fetch_upcoming_events
+from app.services.enrichment import _search_youcom
+from app.services.providers import (
+    execute_composio,
+    get_fake_providers_app,
+    openai_client,
+    reset_fake_providers,
+)
+from app.services.synthesis import SynthesisResult
+
+
+class TestFakeProfile:
+    def test_latency_matches_configured_percentiles(self):
+        profile = FakeProfile(latency_p50_ms=100, latency_p95_ms=400)
+        rng = random.Random(7)
+        draws = sorted(profile.sample_latency(rng) * 1000 for _ in range(5000))
+
+        assert statistics.median(draws) == pytest.approx(100, rel=0.1)
+        assert draws[int(len(draws) * 0.95)] == pytest.approx(400, rel=0.15)
+
+    def test_fault_rates(self):
+        profile = FakeProfile(error_rate=0.1, rate_limit_rate=0.2)
+        rng = random.Random(7)
+        faults = [profile.sample_fault(rng) for _ in range(5000)]
+
+        assert faults.count(429) / 5000 == pytest.approx(0.2, abs=0.03)
+        assert faults.count(500) / 5000 == pytest.approx(0.1, abs=0.03)
+
+    def test_decisions_do_not_depend_on_request_order(self):
+        profile = FakeProfile(latency_p50_ms=50, latency_p95_ms=200, error_rate=0.3)
+        keys = [f"q{i}" for i in range(20)]
+        forward, backward = FaultInjector(profile, seed=3), FaultInjector(profile, seed=3)
+
+        first = {key: forward.decide(key)[0] for key in keys}
+        second = {key: backward.decide(key)[0] for key in reversed(keys)}
+
+        assert first == second
+
+
+class TestFakeMode:
+    @pytest.mark.asyncio
+    async def test_injected_429s_are_retried_through(self, fake_mode, monkeypatch):
+        monkeypatch.setenv("FAKE_RATE_LIMIT_RATE", "0.5")
+        monkeypatch.setenv("FAKE_SEED", "1")
+        monkeypatch.setenv("FAKE_RETRY_AFTER_SECONDS", "0")
+        reset_fake_providers()
+
+        outcomes = [await _search_youcom(f"query {i}", count=3) for i in range(10)]
+
+        youcom = get_fake_providers_app().state.fakes["youcom"]
+        assert youcom.state.faults.faults[429] > 0
+        assert sum(o.error is None for o in outcomes) >= 8
+        assert all(len(o.results) == 3 for o in outcomes if o.error is None)
+
+    @pytest.mark.asyncio
+    async def test_chat_completions_fake_answers_plain_and_streamed(self, fake_mode):
+        client = openai_client()
+        messages = [{"role": "user", "content": '{"company":"acme.com"} https://a.example/1'}]
+
+        plain = await client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+        stream = await client.chat.completions.create(
+            model="gpt-4o-mini", messages=messages, stream=True
+        )
+        streamed = "".join([c.choices[0].delta.content or "" async for c in stream if c.choices])
+
+        result = SynthesisResult.model_validate_json(plain.choices[0].message.content)
+        assert streamed == plain.choices[0].message.content
+        assert result.hooks[0].source == "https://a.example/1"
+        assert 80 <= len(result.pre_meeting_draft.body.split()) <= 150
+
+    @pytest.mark.asyncio
+    async def test_composio_actions_are_served(self, fake_mode):
+        pages = [page async for page in fetch_upcoming_events(page_size=4)]
+        draft = await execute_composio("GMAIL_CREATE_EMAIL_DRAFT", {"to": "a@acme.com"})
+        unknown = await execute_composio("SLACK_SEND_MESSAGE", {})
+
+        assert [len(page) for page in pages] == [4] * 6 + [1]
+        assert draft["successful"] and draft["data"]["id"].startswith("draft-")
+        assert not unknown["successful"]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_runs_end_to_end_offline(self, fake_mode, db_session):
+        processed = await pipeline.run_pipeline_for_new_meetings(db_session)
+
+        async with SessionLocal() as session:
+            meetings = (await session.execute(select(Meeting))).scalars().all()
+        assert processed == len(meetings) > 0
+        assert {m.status for m in meetings} == {MeetingStatus.Drafted}
+        assert all(m.hooks and m.hooks[0]["source"].startswith("https://") for m in meetings)
+        composio = get_fake_providers_app().state.fakes["composio"]
+        actions = [action for action, _params in composio.state.calls]
+        assert actions.count("GMAIL_CREATE_EMAIL_DRAFT") == 2 * len(meetings)
+        assert actions.count("NOTION_INSERT_ROW_DATABASE") == len(meetings)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import respx
+from sqlalchemy import select, update
+
+from app.models import SearchCacheEntry
+from app.services.enrichment import _search_youcom
+from app.services.search_cache import get_search_cache, ttl_for
+
+from tests.conftest import YOUCOM_SEARCH_URL, youcom_success_response
+
+
+@pytest.fixture
+def cache_enabled(monkeypatch, db_session, youcom_key):
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "true")
+    return get_search_cache()
+
+
+def _age_entries(cache, by: timedelta) -> None:
+    for entry in cache._memory.values():
+        entry.fetched_at -= by
+
+
+class TestSearchCache:
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_repeat_query_hits_memory(self, cache_enabled):
+        route = respx.get(YOUCOM_SEARCH_URL).mock(
+            return_value=httpx.Response(200, json=youcom_success_response())
+        )
+        first = await _search_youcom("acme news", count=5, freshness="month")
+        second = await _search_youcom("acme news", count=5, freshness="month")
+
+        assert route.call_count == 1
+        assert second.results == first.results
+        assert cache_enabled.stats["hits_memory"] == 1
+        assert cache_enabled.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_key_includes_count_and_freshness(self, cache_enabled):
+        route = respx.get(YOUCOM_SEARCH_URL).mock(
+            return_value=httpx.Response(200, json=youcom_success_response())
+        )
+        await _search_youcom("acme news", count=5, freshness="month")
+        await _search_youcom("acme news", count=3, freshness="month")
+        await _search_youcom("acme news", count=5, freshness="year")
+        assert route.call_count == 3
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_sqlite_tier_survives_memory_loss(self, cache_enabled):
+        route = respx.get(YOUCOM_SEARCH_URL).mock(
+            return_value=httpx.Response(200, json=youcom_success_response())
+        )
+        await _search_youcom("acme news")
+        cache_enabled._memory.clear()  # simulate a restart
+        outcome = await _search_youcom("acme news")
+
+        assert route.call_count == 1
+        assert len(outcome.results) == 3
+        assert cache_enabled.stats["hits_sqlite"] == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_stale_entry_served_while_refreshing(self, cache_enabled):
+        route = respx.get(YOUCOM_SEARCH_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=youcom_success_response(web_hits=1, news_hits=0)),
+                httpx.Response(200, json=youcom_success_response(web_hits=2, news_hits=0)),
+            ]
+        )
+        await _search_youcom("acme news", freshness="day")
+        _age_entries(cache_enabled, ttl_for("day") + timedelta(minutes=1))
+
+        stale = await _search_youcom("acme news", freshness="day")
+        assert len(stale.results) == 1
+        assert cache_enabled.stats["stale"] == 1
+
+        await cache_enabled.wait_for_refreshes()
+        refreshed = await _search_youcom("acme news", freshness="day")
+        assert route.call_count == 2
+        assert len(refreshed.results) == 2
+        assert cache_enabled.stats["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_expired_entry_is_a_miss(self, cache_enabled):
+        route = respx.get(YOUCOM_SEARCH_URL).mock(
+            return_value=httpx.Response(200, json=youcom_success_response())
+        )
+        await _search_youcom("acme news", freshness="day")
+        _age_entries(cache_enabled, ttl_for("day") * 10)
+        await _search_youcom("acme news", freshness="day")
+        assert route.call_count == 2
+        assert cache_enabled.stats["expired"] == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_errors_are_not_cached(self, cache_enabled):
+        route = respx.get(YOUCOM_SEARCH_URL).mock(
+            side_effect=[
+                httpx.Response(401),
+                httpx.Response(200, json=youcom_success_response()),
+            ]
+        )
+        failed = await _search_youcom("acme news")
+        recovered = await _search_youcom("acme news")
+        assert failed.error is not None
+        assert recovered.error is None
+        assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_write_prunes_rows_past_the_stale_window(self, cache_enabled, db_session):
+        respx.get(YOUCOM_SEARCH_URL).mock(
+            return_value=httpx.Response(200, json=youcom_success_response())
+        )
+        await _search_youcom("old news", freshness="day")
+        await _search_youcom("old pains", freshness="year")
+        await db_session.execute(
+            update(SearchCacheEntry).values(
+                fetched_at=datetime.utcnow() - ttl_for("day") * 10
+            )
+        )
+        await db_session.commit()
+
+        await _search_youcom("acme news", freshness="day")
+
+        result = await db_session.execute(select(SearchCacheEntry.query))
+        # The day-fresh row is past 4 x 1h; the year-fresh one is still servable.
+        assert sorted(result.scalars()) == ["acme news", "old pains"]
+        assert cache_enabled.stats["pruned"] == 1
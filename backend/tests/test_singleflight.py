@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from app.services.enrichment import _search_youcom, enrich_meeting, get_youcom_flights
+from app.services.singleflight import SingleFlight
+
+from tests.conftest import YOUCOM_SEARCH_URL, youcom_success_response
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flights: SingleFlight[int] = SingleFlight()
+        calls = 0
+
+        async def _work() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flights.do("k", _work) for _ in range(5)))
+
+        assert results == [42] * 5
+        assert calls == 1
+        assert flights.stats["coalesced"] == 4
+        assert flights.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_cached(self):
+        flights: SingleFlight[int] = SingleFlight()
+        calls = 0
+
+        async def _work() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.do("k", _work) == 1
+        assert await flights.do("k", _work) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flights: SingleFlight[str] = SingleFlight()
+
+        async def _work() -> str:
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.create_task(flights.do("k", _work))
+        second = asyncio.create_task(flights.do("k", _work))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+
+
+class TestEnrichmentCoalescing:
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_identical_queries_across_meetings_hit_upstream_once(
+        self, sample_steering, youcom_key
+    ):
+        async def _slow(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json=youcom_success_response())
+
+        route = respx.get(YOUCOM_SEARCH_URL).mock(side_effect=_slow)
+        results = await asyncio.gather(
+            *(
+                enrich_meeting(
+                    company="acme.com", role=role, attendees=[], steering=sample_steering
+                )
+                for role in ("CTO", "VP Sales", "CFO")
+            )
+        )
+
+        # Company-news and competitor queries are shared; role queries differ.
+        assert route.call_count == 2 + 3
+        assert get_youcom_flights().stats["coalesced"] == 4
+        assert all(r.competitor_landscape.results for r in results)
+        assert results[0].company_news is not results[1].company_news
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_joined_caller_is_not_cut_short_by_the_starters_deadline(self, youcom_key):
+        requests = 0
+
+        async def _slow(request: httpx.Request) -> httpx.Response:
+            nonlocal requests
+            requests += 1
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=youcom_success_response())
+
+        respx.get(YOUCOM_SEARCH_URL).mock(side_effect=_slow)
+        now = asyncio.get_running_loop().time()
+        hurried, patient = await asyncio.gather(
+            _search_youcom("acme news", deadline=now + 0.01),
+            _search_youcom("acme news", deadline=now + 5),
+        )
+
+        assert hurried.error == "Enrichment deadline exceeded"
+        # The shared request timed out with the hurried caller; the patient one reran it.
+        assert patient.error is None and len(patient.results) == 3
+        assert requests == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_joined_caller_stops_at_its_own_deadline(self, youcom_key):
+        async def _slow(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=youcom_success_response())
+
+        route = respx.get(YOUCOM_SEARCH_URL).mock(side_effect=_slow)
+        now = asyncio.get_running_loop().time()
+        patient, hurried = await asyncio.gather(
+            _search_youcom("acme news", deadline=now + 5),
+            _search_youcom("acme news", deadline=now + 0.01),
+        )
+
+        assert hurried.error == "Enrichment deadline exceeded"
+        assert patient.error is None
+        assert route.call_count == 1
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.stage_graph import Stage, StageGraph
+
+
+class TestStageGraph:
+    @pytest.mark.asyncio
+    async def test_stages_overlap_and_count(self):
+        timeline: list[tuple[str, int]] = []
+
+        async def _first(item: int) -> int:
+            timeline.append(("first", item))
+            await asyncio.sleep(0.01)
+            return item
+
+        async def _second(item: int) -> None:
+            timeline.append(("second", item))
+            await asyncio.sleep(0.03)
+            return None
+
+        async def _on_error(item, stage, exc):
+            raise AssertionError("unexpected error")
+
+        graph = StageGraph(
+            [
+                Stage("first", _first, workers=1, queue_size=2),
+                Stage("second", _second, workers=1, queue_size=2),
+            ],
+            on_error=_on_error,
+        )
+        graph.start()
+        for i in range(4):
+            await graph.submit(i)
+        await graph.drain()
+
+        # The fast first stage keeps going while the slow second stage is busy.
+        assert timeline.index(("first", 2)) < timeline.index(("second", 1))
+        first, second = graph.snapshot()
+        assert first["processed"] == 4
+        assert second["processed"] == 4
+        assert first["queue_depth"] == 0
+        assert second["throughput_per_sec"] > 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_isolated_per_item(self):
+        failures: list[tuple[int, str]] = []
+        finished: list[int] = []
+
+        async def _flaky(item: int) -> int:
+            if item == 2:
+                raise RuntimeError("bad item")
+            return item
+
+        async def _sink(item: int) -> None:
+            finished.append(item)
+
+        async def _on_error(item, stage, exc):
+            failures.append((item, stage))
+
+        graph = StageGraph(
+            [
+                Stage("flaky", _flaky, workers=2, queue_size=1),
+                Stage("sink", _sink, workers=1, queue_size=1),
+            ],
+            on_error=_on_error,
+        )
+        graph.start()
+        for i in range(5):
+            await graph.submit(i)
+        await graph.drain()
+
+        assert sorted(finished) == [0, 1, 3, 4]
+        assert failures == [(2, "flaky")]
+        assert graph.snapshot()[0]["failed"] == 1
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.models import Meeting, MeetingStatus
+from app.routers.meetings import router as meetings_router
+from app.services import synthesis
+from app.services.enrichment import EnrichmentResult, SearchQueryOutcome
+from app.services.events import MeetingEventBroker, get_event_broker
+from app.services.partial_json import PartialJSONParser
+from app.services.synthesis import EmailDraft, SynthesisResult, synthesize_meeting_prep
+
+_OUTPUT = SynthesisResult(
+    insights=[
+        {"text": "Raised a Series B", "why": "Budget for tooling", "priority": 1},
+        {"text": "Hiring platform engineers", "why": "Infra pain", "priority": 2},
+    ],
+    hooks=[{"hook": "Ask about the migration", "source": "https://a.example"}],
+    pre_meeting_draft=EmailDraft(subject="Hi", body=" ".join(["word"] * 100)),
+    follow_up_draft=EmailDraft(subject="Thanks", body="Body"),
+)
+
+
+def _chunks(text: str, size: int = 7) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestPartialJSONParser:
+    def test_only_complete_items_are_visible(self):
+        parser = PartialJSONParser()
+        parser.feed('{"insights": [{"text": "one"}, {"text": "tw')
+
+        assert parser.value() == {"insights": [{"text": "one"}]}
+
+    def test_brackets_inside_strings_are_ignored(self):
+        parser = PartialJSONParser()
+        assert parser.feed('{"a": "}]{"}') is True
+        assert parser.value() == {"a": "}]{"}
+
+    def test_nothing_before_the_first_close(self):
+        parser = PartialJSONParser()
+        assert parser.feed('{"insights": [') is False
+        assert parser.value() is None
+
+    def test_chunked_feed_matches_whole_document(self):
+        text = _OUTPUT.model_dump_json()
+        parser = PartialJSONParser()
+        for chunk in _chunks(text, 3):
+            parser.feed(chunk)
+
+        assert parser.value() == json.loads(text)
+
+
+class TestMeetingEventBroker:
+    @pytest.mark.asyncio
+    async def test_publish_reaches_only_that_meetings_subscribers(self):
+        broker = MeetingEventBroker()
+        mine, other = broker.subscribe(1), broker.subscribe(2)
+
+        assert broker.publish(1, "status", {"status": "Enriching"}) == 1
+        assert (await mine.get()).data == {"status": "Enriching"}
+        assert other.empty()
+
+    def test_full_subscriber_drops_oldest(self):
+        broker = MeetingEventBroker()
+        queue = broker.subscribe(1)
+        for i in range(queue.maxsize + 1):
+            broker.publish(1, "partial", {"i": i})
+
+        assert queue.qsize() == queue.maxsize
+        assert queue.get_nowait().data == {"i": 1}
+
+    def test_unsubscribe_forgets_the_meeting(self):
+        broker = MeetingEventBroker()
+        queue = broker.subscribe(1)
+        broker.unsubscribe(1, queue)
+
+        assert broker.subscriber_count(1) == 0
+        assert broker.publish(1, "status", {}) == 0
+
+
+def _streamed_runner(outputs: list[SynthesisResult]):
+    """`Runner.run_streamed` emitting the nth output as text deltas on the nth call."""
+    calls = iter(outputs)
+
+    def _run_streamed(agent, payload):
+        output = next(calls)
+
+        async def _events():
+            yield SimpleNamespace(type="agent_updated_stream_event")
+            for delta in _chunks(output.model_dump_json()):
+                yield SimpleNamespace(
+                    type="raw_response_event",
+                    data=SimpleNamespace(type="response.output_text.delta", delta=delta),
+                )
+
+        usage = SimpleNamespace(
+            input_tokens=100,
+            input_tokens_details=SimpleNamespace(cached_tokens=0),
+            output_tokens=50,
+        )
+        return SimpleNamespace(
+            stream_events=_events,
+            context_wrapper=SimpleNamespace(usage=usage),
+            final_output_as=lambda _type: output,
+        )
+
+    return _run_streamed
+
+
+async def _synthesize_streamed(steering, on_partial) -> SynthesisResult:
+    return await synthesize_meeting_prep(
+        enrichment=EnrichmentResult(
+            company_news=SearchQueryOutcome(query="news"),
+            role_pains=SearchQueryOutcome(query="pains"),
+            competitor_landscape=SearchQueryOutcome(query="competitors"),
+        ),
+        meeting_title="Intro",
+        company="acme.com",
+        role="CTO",
+        attendees=[],
+        steering=steering,
+        on_partial=on_partial,
+    )
+
+
+class TestStreamedSynthesis:
+    @pytest.mark.asyncio
+    async def test_partials_arrive_as_items_complete(self, monkeypatch, sample_steering):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(synthesis.Runner, "run_streamed", _streamed_runner([_OUTPUT]))
+        seen: list[tuple[int, int]] = []
+
+        async def _on_partial(partial):
+            seen.append((len(partial.insights), len(partial.hooks)))
+
+        result = await _synthesize_streamed(sample_steering, _on_partial)
+
+        assert result == _OUTPUT
+        assert seen == [(1, 0), (2, 0), (2, 1)]
+
+    @pytest.mark.asyncio
+    async def test_escalation_clears_the_discarded_partials(self, monkeypatch, sample_steering):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("SYNTHESIS_MODEL_LADDER", "cheap,strong")
+        too_short = _OUTPUT.model_copy(
+            update={"pre_meeting_draft": EmailDraft(subject="Hi", body="Too short")}
+        )
+        monkeypatch.setattr(
+            synthesis.Runner, "run_streamed", _streamed_runner([too_short, _OUTPUT])
+        )
+        seen: list[tuple[int, int]] = []
+
+        async def _on_partial(partial):
+            seen.append((len(partial.insights), len(partial.hooks)))
+
+        result = await _synthesize_streamed(sample_steering, _on_partial)
+
+        assert result == _OUTPUT
+        assert seen == [(1, 0), (2, 0), (2, 1), (0, 0), (1, 0), (2, 0), (2, 1)]
+
+
+class TestMeetingEventsEndpoint:
+    @staticmethod
+    def _events(body: str) -> list[tuple[str, dict]]:
+        events = []
+        for block in body.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines())
+            events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_live_events_until_drafted(self, db_session):
+        meeting = Meeting(
+            calendar_event_id="evt-sse",
+            title="Intro",
+            datetime_utc=datetime.utcnow() + timedelta(days=1),
+            status=MeetingStatus.Enriched,
+        )
+        db_session.add(meeting)
+        await db_session.commit()
+
+        app = FastAPI()
+        app.include_router(meetings_router)
+        broker = get_event_broker()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            request = asyncio.create_task(client.get(f"/meetings/{meeting.id}/events"))
+            while broker.subscriber_count(meeting.id) == 0:
+                await asyncio.sleep(0.01)
+            broker.publish(meeting.id, "partial", {"insights": [{"text": "x"}], "hooks": []})
+            broker.publish(meeting.id, "status", {"status": "Drafted", "error_message": None})
+            response = await request
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = self._events(response.text)
+        assert [name for name, _ in events] == ["snapshot", "partial", "status"]
+        assert events[0][1]["status"] == "Enriched"
+        assert broker.subscriber_count(meeting.id) == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_meeting_is_404(self, db_session):
+        app = FastAPI()
+        app.include_router(meetings_router)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/meetings/999/events")
+
+        assert response.status_code == 404
+        assert get_event_broker().subscriber_count(999) == 0
@@ -0,0 +1,550 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from agents.exceptions import ModelBehaviorError
+from openai import APIConnectionError
+
+from app.services import synthesis
+from app.services.enrichment import EnrichmentResult, SearchQueryOutcome, SearchResult
+from app.services.rate_limit import RetryPolicy
+from app.services.synthesis import (
+    EmailDraft,
+    Hook,
+    Insight,
+    SynthesisResult,
+    build_batch_request,
+    get_synthesis_stats,
+    get_synthesis_tier_stats,
+    invalidate_agent_cache,
+    synthesize_meeting_prep,
+)
+from app.services.synthesis_cache import load_synthesis, store_synthesis
+
+
+# Inside the 80–150 word rule, so a fake result passes the ladder's quality checks.
+_DRAFT_BODY = " ".join(["word"] * 100)
+
+
+def _enrichment() -> EnrichmentResult:
+    return EnrichmentResult(
+        company_news=SearchQueryOutcome(query="news"),
+        role_pains=SearchQueryOutcome(query="pains"),
+        competitor_landscape=SearchQueryOutcome(query="competitors"),
+    )
+
+
+@pytest.fixture
+def fake_runner(monkeypatch):
+    """Stand-in for `Runner.run` that records the agents it was given."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    agents: list = []
+
+    async def _run(agent, payload):
+        agents.append(agent)
+        output = SynthesisResult(
+            pre_meeting_draft=EmailDraft(subject="Hi", body=_DRAFT_BODY),
+            follow_up_draft=EmailDraft(subject="Thanks", body="Body"),
+        )
+        usage = SimpleNamespace(
+            input_tokens=1500,
+            input_tokens_details=SimpleNamespace(cached_tokens=1024),
+            output_tokens=300,
+        )
+        return SimpleNamespace(
+            context_wrapper=SimpleNamespace(usage=usage),
+            final_output_as=lambda _type: output,
+        )
+
+    monkeypatch.setattr(synthesis.Runner, "run", _run)
+    return agents
+
+
+async def _synthesize(steering):
+    return await synthesize_meeting_prep(
+        enrichment=_enrichment(),
+        meeting_title="Intro",
+        company="acme.com",
+        role="CTO",
+        attendees=[],
+        steering=steering,
+    )
+
+
+class TestAgentCache:
+    @pytest.mark.asyncio
+    async def test_agent_is_reused_within_a_steering_version(self, fake_runner, sample_steering):
+        await _synthesize(sample_steering)
+        await _synthesize(sample_steering)
+
+        assert fake_runner[0] is fake_runner[1]
+        stats = get_synthesis_stats()
+        assert stats["agent_builds"] == 1
+        assert stats["agent_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_version_builds_a_new_agent(self, fake_runner, sample_steering):
+        await _synthesize(sample_steering)
+        await _synthesize(sample_steering.model_copy(update={"version": 2}))
+
+        assert fake_runner[0] is not fake_runner[1]
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_cached_agents(self, fake_runner, sample_steering):
+        await _synthesize(sample_steering)
+        invalidate_agent_cache()
+        await _synthesize(sample_steering)
+
+        assert get_synthesis_stats()["agent_builds"] == 2
+
+    def test_instructions_are_byte_identical_per_version(self, sample_steering):
+        first = synthesis._build_system_instructions(sample_steering)
+        second = synthesis._build_system_instructions(sample_steering.model_copy())
+
+        assert first == second
+        assert first.startswith("You are an always-on meeting prep agent")
+
+
+class TestUsageStats:
+    @pytest.mark.asyncio
+    async def test_cached_prefix_tokens_are_reported(self, fake_runner, sample_steering):
+        await _synthesize(sample_steering)
+        await _synthesize(sample_steering)
+
+        stats = get_synthesis_stats()
+        assert stats["runs"] == 2
+        assert stats["input_tokens"] == 3000
+        assert stats["cached_input_tokens"] == 2048
+        assert stats["output_tokens"] == 600
+
+    @pytest.mark.asyncio
+    async def test_missing_usage_does_not_fail_the_answer(
+        self, monkeypatch, fake_runner, sample_steering
+    ):
+        real_run = synthesis.Runner.run
+
+        async def _without_usage(agent, payload):
+            result = await real_run(agent, payload)
+            result.context_wrapper = SimpleNamespace()
+            return result
+
+        monkeypatch.setattr(synthesis.Runner, "run", _without_usage)
+
+        result = await _synthesize(sample_steering)
+
+        assert result.error is None
+        assert get_synthesis_stats()["usage_errors"] == 1
+
+
+class TestInputPayload:
+    @staticmethod
+    def _hits(prefix: str, n: int) -> list[SearchResult]:
+        return [
+            SearchResult(
+                title=f"{prefix} {i}",
+                url=f"https://example.com/{prefix}/{i}",
+                snippet="x" * 500,
+                score=round(1.0 - i * 0.1, 2),
+            )
+            for i in range(n)
+        ]
+
+    def _payload(self, enrichment: EnrichmentResult, budget: int) -> dict:
+        text = synthesis._build_input_payload(
+            enrichment=enrichment,
+            meeting_title="Intro",
+            company="acme.com",
+            role="CTO",
+            attendees=[{"email": "cto@acme.com", "name": None, "responseStatus": None}],
+            token_budget=budget,
+        )
+        assert synthesis._estimate_tokens(text) <= budget
+        return json.loads(text.split("\n\n", 1)[1])
+
+    def test_compact_json_omits_empty_fields(self):
+        data = self._payload(_enrichment(), budget=3000)
+
+        assert data["meeting"]["attendees"] == [{"email": "cto@acme.com"}]
+        assert data["enrichment"]["company_news"] == {"query": "news", "results": []}
+
+    def test_small_payload_is_untouched(self):
+        enrichment = _enrichment()
+        enrichment.company_news.results = self._hits("news", 2)
+
+        data = self._payload(enrichment, budget=3000)
+
+        assert [len(h["snippet"]) for h in data["enrichment"]["company_news"]["results"]] == [500, 500]
+
+    def test_over_budget_drops_lowest_ranked_hits_first(self):
+        enrichment = _enrichment()
+        enrichment.company_news.results = self._hits("news", 5)
+        enrichment.role_pains.results = self._hits("pains", 5)
+
+        data = self._payload(enrichment, budget=400)
+
+        kept = [
+            h["title"]
+            for section in ("company_news", "role_pains")
+            for h in data["enrichment"][section]["results"]
+        ]
+        assert 0 < len(kept) < 10
+        assert "news 0" in kept and "pains 0" in kept
+        assert "news 4" not in kept and "pains 4" not in kept
+        assert all(
+            len(h["snippet"]) <= 240 for h in data["enrichment"]["company_news"]["results"]
+        )
+
+
+class TestResultCache:
+    @pytest.fixture
+    def cache_enabled(self, monkeypatch, db_session):
+        monkeypatch.setenv("SYNTHESIS_CACHE_ENABLED", "true")
+
+    @pytest.mark.asyncio
+    async def test_identical_call_is_served_from_cache(
+        self, cache_enabled, fake_runner, sample_steering
+    ):
+        first = await _synthesize(sample_steering)
+        second = await _synthesize(sample_steering)
+
+        assert len(fake_runner) == 1
+        assert second == first
+        assert get_synthesis_stats()["result_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_force_bypasses_cache(self, cache_enabled, fake_runner, sample_steering):
+        await _synthesize(sample_steering)
+        await synthesize_meeting_prep(
+            enrichment=_enrichment(),
+            meeting_title="Intro",
+            company="acme.com",
+            role="CTO",
+            attendees=[],
+            steering=sample_steering,
+            force=True,
+        )
+
+        assert len(fake_runner) == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_steering_misses(self, cache_enabled, fake_runner, sample_steering):
+        await _synthesize(sample_steering)
+        await _synthesize(sample_steering.model_copy(update={"version": 2, "icp": "SMB"}))
+
+        assert len(fake_runner) == 2
+
+    @pytest.mark.asyncio
+    async def test_steering_neutral_version_bump_hits(
+        self, cache_enabled, fake_runner, sample_steering
+    ):
+        await _synthesize(sample_steering)
+        await _synthesize(sample_steering.model_copy(update={"version": 2}))
+
+        assert len(fake_runner) == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_result_serves_the_live_path(
+        self, cache_enabled, fake_runner, sample_steering
+    ):
+        _body, cache_key = build_batch_request(
+            enrichment=_enrichment(),
+            meeting_title="Intro",
+            company="acme.com",
+            role="CTO",
+            attendees=[],
+            steering=sample_steering,
+        )
+        batch_result = SynthesisResult(
+            insights=[Insight(text="From the batch", why="Offline", priority=1)],
+            pre_meeting_draft=EmailDraft(subject="Hi", body=_DRAFT_BODY),
+            follow_up_draft=EmailDraft(subject="Thanks", body="Body"),
+        )
+        await store_synthesis(cache_key, "batch", batch_result.model_dump())
+
+        assert await _synthesize(sample_steering) == batch_result
+        assert fake_runner == []
+
+    @pytest.mark.asyncio
+    async def test_eviction_keeps_table_under_size_cap(self, cache_enabled, monkeypatch):
+        monkeypatch.setenv("SYNTHESIS_CACHE_MAX_BYTES", "60")
+        await store_synthesis("old", "gpt-4o", {"body": "x" * 40})
+        await store_synthesis("new", "gpt-4o", {"body": "y" * 40})
+
+        assert await load_synthesis("old") is None
+        assert await load_synthesis("new") == {"body": "y" * 40}
+
+
+class TestModelLadder:
+    @staticmethod
+    def _grounded() -> SynthesisResult:
+        return SynthesisResult(
+            insights=[Insight(text="Raised a Series B", why="Budget", priority=1)],
+            hooks=[Hook(hook="Congrats on the round", source="https://example.com/a")],
+            pre_meeting_draft=EmailDraft(subject="Hi", body=_DRAFT_BODY),
+            follow_up_draft=EmailDraft(subject="Thanks", body="Body"),
+        )
+
+    @staticmethod
+    def _with_hits() -> EnrichmentResult:
+        enrichment = _enrichment()
+        enrichment.company_news.results = [
+            SearchResult(title="Round", url="https://example.com/a", snippet="Series B")
+        ]
+        return enrichment
+
+    @pytest.fixture
+    def ladder_runner(self, monkeypatch):
+        """`Runner.run` answering from a per-model script; records the models called."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("SYNTHESIS_MODEL_LADDER", "cheap,strong")
+        script: dict = {}
+        calls: list[str] = []
+
+        async def _run(agent, payload):
+            calls.append(agent.model)
+            output = script[agent.model]
+            if isinstance(output, Exception):
+                raise output
+            usage = SimpleNamespace(
+                input_tokens=1000,
+                input_tokens_details=SimpleNamespace(cached_tokens=0),
+                output_tokens=200,
+            )
+            return SimpleNamespace(
+                context_wrapper=SimpleNamespace(usage=usage),
+                final_output_as=lambda _type: output,
+            )
+
+        monkeypatch.setattr(synthesis.Runner, "run", _run)
+        return script, calls
+
+    async def _synthesize(self, steering, enrichment):
+        return await synthesize_meeting_prep(
+            enrichment=enrichment,
+            meeting_title="Intro",
+            company="acme.com",
+            role="CTO",
+            attendees=[],
+            steering=steering,
+        )
+
+    @pytest.mark.asyncio
+    async def test_passing_result_stays_on_the_cheap_model(self, ladder_runner, sample_steering):
+        script, calls = ladder_runner
+        script["cheap"] = self._grounded()
+
+        result = await self._synthesize(sample_steering, self._with_hits())
+
+        assert calls == ["cheap"]
+        assert result == script["cheap"]
+        tiers = get_synthesis_tier_stats()
+        assert tiers["cheap"]["accepted"] == 1
+        assert tiers["cheap"]["escalation_rate"] == 0.0
+        assert tiers["cheap"]["input_tokens"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_unsourced_hooks_escalate(self, ladder_runner, sample_steering):
+        script, calls = ladder_runner
+        script["cheap"] = self._grounded().model_copy(
+            update={"hooks": [Hook(hook="Congrats", source=" ")]}
+        )
+        script["strong"] = self._grounded()
+
+        result = await self._synthesize(sample_steering, self._with_hits())
+
+        assert calls == ["cheap", "strong"]
+        assert result == script["strong"]
+        tiers = get_synthesis_tier_stats()
+        assert tiers["cheap"]["escalation_rate"] == 1.0
+        assert tiers["strong"]["accepted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_grounding_is_not_required_without_hits(self, ladder_runner, sample_steering):
+        script, calls = ladder_runner
+        script["cheap"] = self._grounded().model_copy(update={"insights": [], "hooks": []})
+
+        await self._synthesize(sample_steering, _enrichment())
+
+        assert calls == ["cheap"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_output_escalates_and_last_model_is_kept(
+        self, ladder_runner, sample_steering
+    ):
+        script, calls = ladder_runner
+        script["cheap"] = ModelBehaviorError("Invalid JSON")
+        script["strong"] = self._grounded().model_copy(
+            update={"pre_meeting_draft": EmailDraft(subject="Hi", body="Too short")}
+        )
+
+        result = await self._synthesize(sample_steering, self._with_hits())
+
+        assert calls == ["cheap", "strong"]
+        assert result.error is None
+        assert result.pre_meeting_draft.body == "Too short"
+
+
+class TestCallLimits:
+    @pytest.fixture
+    def scripted_runner(self, monkeypatch):
+        """`Runner.run` whose nth call runs `script[n]` (a coroutine function)."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("SYNTHESIS_MODEL_LADDER", "gpt-4o")
+        script: list = []
+        calls: list[int] = []
+
+        async def _run(agent, payload):
+            calls.append(len(calls))
+            return await script[min(len(calls) - 1, len(script) - 1)]()
+
+        monkeypatch.setattr(synthesis.Runner, "run", _run)
+        return script, calls
+
+    @staticmethod
+    async def _ok():
+        usage = SimpleNamespace(
+            input_tokens=10,
+            input_tokens_details=SimpleNamespace(cached_tokens=0),
+            output_tokens=5,
+        )
+        output = SynthesisResult(
+            pre_meeting_draft=EmailDraft(subject="Hi", body=_DRAFT_BODY),
+            follow_up_draft=EmailDraft(subject="Thanks", body="Body"),
+        )
+        return SimpleNamespace(
+            context_wrapper=SimpleNamespace(usage=usage),
+            final_output_as=lambda _type: output,
+        )
+
+    @staticmethod
+    async def _hang():
+        await asyncio.sleep(60)
+
+    @staticmethod
+    async def _disconnect():
+        raise APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+
+    @pytest.mark.asyncio
+    async def test_stuck_call_times_out_and_is_retried(
+        self, monkeypatch, scripted_runner, sample_steering
+    ):
+        monkeypatch.setenv("SYNTHESIS_CALL_TIMEOUT_SECONDS", "0.05")
+        script, calls = scripted_runner
+        script.extend([self._hang, self._ok])
+
+        result = await _synthesize(sample_steering)
+
+        assert result.error is None
+        assert len(calls) == 2
+        stats = get_synthesis_stats()
+        assert stats["timeouts"] == 1
+        assert stats["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_caps_retries_and_backoff(
+        self, monkeypatch, scripted_runner, sample_steering
+    ):
+        monkeypatch.setenv("SYNTHESIS_CALL_TIMEOUT_SECONDS", "0.05")
+        monkeypatch.setenv("SYNTHESIS_MAX_RETRIES", "10")
+        monkeypatch.setenv("SYNTHESIS_BACKOFF_BASE_SECONDS", "0.01")
+        monkeypatch.setenv("SYNTHESIS_BACKOFF_MAX_SECONDS", "0.01")
+        monkeypatch.setenv("SYNTHESIS_DEADLINE_SECONDS", "0.12")
+        script, calls = scripted_runner
+        script.append(self._hang)
+
+        started = asyncio.get_running_loop().time()
+        result = await _synthesize(sample_steering)
+
+        assert result.error is not None
+        assert len(calls) < 4
+        assert asyncio.get_running_loop().time() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_backoff_past_the_deadline_is_not_waited_out(
+        self, monkeypatch, scripted_runner, sample_steering
+    ):
+        monkeypatch.setenv("SYNTHESIS_DEADLINE_SECONDS", "1")
+        monkeypatch.setattr(RetryPolicy, "backoff", lambda self, attempt, retry_after=None: 30.0)
+        script, calls = scripted_runner
+        script.append(self._disconnect)
+
+        result = await _synthesize(sample_steering)
+
+        assert result.error is not None
+        assert calls == [0]
+        assert get_synthesis_stats()["deadline_exceeded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_fall_back(self, monkeypatch, scripted_runner, sample_steering):
+        monkeypatch.setenv("SYNTHESIS_MAX_RETRIES", "2")
+        script, calls = scripted_runner
+        script.append(self._disconnect)
+
+        result = await _synthesize(sample_steering)
+
+        assert result.error is not None
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_non_transient_errors_are_not_retried(self, scripted_runner, sample_steering):
+        script, calls = scripted_runner
+
+        async def _bad_request():
+            raise ValueError("bad request")
+
+        script.append(_bad_request)
+
+        result = await _synthesize(sample_steering)
+
+        assert result.error == "Unexpected error: bad request"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged_and_loser_cancelled(
+        self, monkeypatch, scripted_runner, sample_steering
+    ):
+        monkeypatch.setenv("SYNTHESIS_HEDGE_AFTER_SECONDS", "0.01")
+        script, calls = scripted_runner
+        cancelled = asyncio.Event()
+
+        async def _slow():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        script.extend([_slow, self._ok])
+
+        result = await _synthesize(sample_steering)
+
+        assert result.error is None
+        assert len(calls) == 2
+        await asyncio.wait_for(cancelled.wait(), 1)
+        stats = get_synthesis_stats()
+        assert stats["hedges"] == 1
+        assert stats["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, monkeypatch, scripted_runner, sample_steering):
+        monkeypatch.setenv("SYNTHESIS_MAX_CONCURRENCY", "2")
+        script, _calls = scripted_runner
+        in_flight = peak = 0
+
+        async def _tracked():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await self._ok()
+
+        script.append(_tracked)
+
+        await asyncio.gather(*(_synthesize(sample_steering) for _ in range(5)))
+
+        assert peak == 2
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import (
+    Meeting,
+    MeetingStatus,
+    PipelineStage,
+    SynthesisBatch,
+    SynthesisBatchItem,
+)
+from app.services import synthesis_batch
+from app.services.checkpoints import load_checkpoint
+from app.services.synthesis_batch import (
+    BatchRequest,
+    poll_synthesis_batches,
+    submit_synthesis_batch,
+)
+
+
+async def _seed_enriched(db) -> int:
+    meeting = Meeting(
+        calendar_event_id="evt-batch",
+        title="Intro",
+        datetime_utc=datetime.utcnow() + timedelta(days=3),
+        company="acme.com",
+        role="CTO",
+        status=MeetingStatus.Enriched,
+    )
+    db.add(meeting)
+    await db.commit()
+    return meeting.id
+
+
+def _request(meeting_id: int) -> BatchRequest:
+    return BatchRequest(
+        meeting_id=meeting_id,
+        input_hash="a" * 64,
+        cache_key="b" * 64,
+        body={"model": "gpt-4o", "messages": []},
+    )
+
+
+class TestSynthesisBatch:
+    @pytest.mark.asyncio
+    async def test_submit_records_batch_and_items(self, db_session, fake_openai_batch):
+        meeting_id = await _seed_enriched(db_session)
+
+        batch_id = await submit_synthesis_batch([_request(meeting_id)])
+
+        assert batch_id in fake_openai_batch.state.batches
+        batch = await db_session.get(SynthesisBatch, batch_id)
+        assert batch.request_count == 1
+        items = (await db_session.execute(select(SynthesisBatchItem))).scalars().all()
+        assert [(i.meeting_id, i.status) for i in items] == [(meeting_id, "pending")]
+
+    @pytest.mark.asyncio
+    async def test_poll_applies_results_and_checkpoints(self, db_session, fake_openai_batch):
+        meeting_id = await _seed_enriched(db_session)
+        batch_id = await submit_synthesis_batch([_request(meeting_id)])
+
+        assert await poll_synthesis_batches() == 1
+
+        async with SessionLocal() as session:
+            meeting = await session.get(Meeting, meeting_id)
+            assert meeting.status == MeetingStatus.New
+            assert meeting.insights[0]["text"] == "Batch insight"
+            assert await session.get(SynthesisBatch, batch_id) is not None
+            checkpoint = await load_checkpoint(
+                session, meeting_id, PipelineStage.Synthesize, "a" * 64
+            )
+            assert checkpoint["pre_meeting_draft"]["body"] == "Batch draft"
+        # Finished batches are not polled again.
+        assert await poll_synthesis_batches() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_lines_release_the_meeting(
+        self, db_session, fake_openai_batch, monkeypatch
+    ):
+        def _unparseable(_body):
+            raise ValueError("bad output")
+
+        monkeypatch.setattr(synthesis_batch, "parse_batch_response", _unparseable)
+        meeting_id = await _seed_enriched(db_session)
+        await submit_synthesis_batch([_request(meeting_id)])
+
+        assert await poll_synthesis_batches() == 0
+
+        async with SessionLocal() as session:
+            meeting = await session.get(Meeting, meeting_id)
+            item = (await session.execute(select(SynthesisBatchItem))).scalar_one()
+        assert meeting.status == MeetingStatus.New
+        assert "retrying interactively" in meeting.error_message
+        assert (item.status, item.error) == ("failed", "bad output")
+
+    @pytest.mark.asyncio
+    async def test_same_request_in_a_second_batch_is_recorded(self, db_session, fake_openai_batch):
+        meeting_id = await _seed_enriched(db_session)
+        first = await submit_synthesis_batch([_request(meeting_id)])
+        second = await submit_synthesis_batch([_request(meeting_id)])
+
+        items = (await db_session.execute(select(SynthesisBatchItem))).scalars().all()
+        assert first != second
+        assert sorted(i.batch_id for i in items) == sorted([first, second])
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_batch_is_cancelled_and_the_meeting_released(
+        self, db_session, fake_openai_batch, monkeypatch
+    ):
+        meeting_id = await _seed_enriched(db_session)
+
+        class _BrokenSession:
+            async def __aenter__(self):
+                raise RuntimeError("database is locked")
+
+            async def __aexit__(self, *exc):
+                return False
+
+        real_session = synthesis_batch.SessionLocal
+        calls = iter([_BrokenSession()])
+        monkeypatch.setattr(
+            synthesis_batch, "SessionLocal", lambda: next(calls, None) or real_session()
+        )
+
+        assert await submit_synthesis_batch([_request(meeting_id)]) is None
+
+        (remote,) = fake_openai_batch.state.batches.values()
+        assert remote["status"] == "cancelled"
+        async with SessionLocal() as session:
+            meeting = await session.get(Meeting, meeting_id)
+        assert meeting.status == MeetingStatus.New
+        assert "database is locked" in meeting.error_message
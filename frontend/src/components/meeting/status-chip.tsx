@@ -16,6 +16,8 @@ export function StatusChip({ status }: { status: MeetingStatus }) {
       return <Chip tone="feedback">Feedback Given</Chip>;
     case "Error":
       return <Chip tone="ink">Error</Chip>;
+    case "Cancelled":
+      return <Chip tone="ink">Cancelled</Chip>;
     default:
       return <Chip tone="ink">{status}</Chip>;
   }
@@ -4,7 +4,8 @@ export type MeetingStatus =
   | "Enriched"
   | "Drafted"
   | "FeedbackGiven"
-  | "Error";
+  | "Error"
+  | "Cancelled";
 
 export type MeetingListItem = {
   id: number;